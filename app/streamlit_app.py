@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import sys
 from pathlib import Path
+import networkx as nx
 import pandas as pd
 import time
 import streamlit as st
@@ -479,12 +480,8 @@ else:
 		visible_nodes = None
 		if view_mode == "Relevant only":
 			visible_nodes = set(steps)
-			# include immediate neighbors for context
-			for n in list(visible_nodes):
-				for succ in graph.successors(n):
-					visible_nodes.add(succ)
-				for pred in graph.predecessors(n):
-					visible_nodes.add(pred)
+			# include immediate neighbors (either edge direction) for context
+			visible_nodes |= nx.node_boundary(graph.to_undirected(as_view=True), visible_nodes)
 		# Robust Graphviz rendering with backward-compat for older signature
 		highlight = steps_display if role_filter else steps
 		try:
@@ -92,6 +92,97 @@ def init(
     )
 
 
+@app.command("convert-graph")
+def convert_graph(
+    source: Path = typer.Argument(..., help="Graph file to read (.json, .dgraph or .sqlite)"),
+    target: Path = typer.Argument(..., help="Graph file to write (.json, .dgraph or .sqlite)"),
+):
+    """Convert a graph file between JSON, the binary snapshot format and a graph database."""
+    from mcp_server.core.graph_engine import GraphEngine
+
+    if not source.exists():
+        typer.echo(f"Graph file not found: {source}", err=True)
+        raise typer.Exit(code=1)
+
+    graph = GraphEngine()
+    graph.load_from_file(source)
+    graph.save_to_file(target)
+
+    typer.echo(
+        f"Converted {source} -> {target} "
+        f"({graph.graph.number_of_nodes()} nodes, {graph.graph.number_of_edges()} edges)"
+    )
+
+
+@app.command("graph-diff")
+def graph_diff(
+    base: Path = typer.Argument(..., help="Graph file the delta applies to"),
+    target: Path = typer.Argument(..., help="Graph file the delta produces"),
+    output: Path = typer.Option(Path("graph.delta.json"), help="Delta file to write"),
+):
+    """Write the delta between two graph files."""
+    import json
+
+    from mcp_server.core.graph_diff import delta_size
+    from mcp_server.core.graph_engine import GraphEngine
+
+    for path in (base, target):
+        if not path.exists():
+            typer.echo(f"Graph file not found: {path}", err=True)
+            raise typer.Exit(code=1)
+
+    base_graph, target_graph = GraphEngine(), GraphEngine()
+    base_graph.load_from_file(base)
+    target_graph.load_from_file(target)
+    delta = base_graph.diff(target_graph)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(delta, f, ensure_ascii=False, separators=(",", ":"))
+
+    counts = delta_size(delta)
+    summary = ", ".join(f"{count} {section.replace('_', ' ')}" for section, count in counts.items())
+    typer.echo(f"Wrote delta {base} -> {target} to {output} ({summary})")
+
+
+@app.command("graph-apply")
+def graph_apply(
+    graph: Path = typer.Argument(..., help="Graph file to update"),
+    delta: Path = typer.Argument(..., help="Delta file written by graph-diff"),
+    output: Optional[Path] = typer.Option(
+        None, help="Graph file to write (default: update GRAPH in place)"
+    ),
+):
+    """Apply a delta written by graph-diff to a graph file."""
+    import json
+
+    from mcp_server.core.graph_engine import GraphEngine
+    from mcp_server.core.mutation_log import MutationLog
+
+    for path in (graph, delta):
+        if not path.exists():
+            typer.echo(f"File not found: {path}", err=True)
+            raise typer.Exit(code=1)
+
+    engine = GraphEngine()
+    engine.load_from_file(graph)
+    with open(delta, "r", encoding="utf-8") as f:
+        changes = json.load(f)
+    try:
+        counts = engine.apply_delta(changes)
+    except ValueError as e:
+        typer.echo(f"Cannot apply {delta} to {graph}: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    if output is None:
+        # Folds any pending mutation log into the new snapshot
+        MutationLog(graph).compact(engine)
+    else:
+        engine.save_to_file(output)
+
+    typer.echo(f"Applied {delta} to {graph} ({sum(counts.values())} changes) -> {output or graph}")
+
+
 @app.command()
 def info():
     """Show configuration and system information."""
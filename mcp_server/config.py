@@ -40,13 +40,18 @@ class Settings(BaseSettings):
         description="Sentence transformer model",
     )
 
-    # Graph Database
+    # Graph Database (the storage format of each graph file follows its suffix:
+    # .json, .dgraph binary snapshot or .sqlite graph database)
     graph_backend: str = Field(
         default="networkx", description="Graph backend: networkx, neo4j, json"
     )
     neo4j_uri: Optional[str] = Field(default=None, description="Neo4j URI")
     neo4j_user: Optional[str] = Field(default=None, description="Neo4j username")
     neo4j_password: Optional[str] = Field(default=None, description="Neo4j password")
+    graph_log_compaction_bytes: int = Field(
+        default=1024 * 1024,
+        description="Mutation log size that triggers folding it into a new graph snapshot",
+    )
 
     # NLP
     spacy_model: str = Field(default="en_core_web_sm", description="spaCy model")
@@ -0,0 +1,156 @@
+"""Compact attribute storage for large NetworkX knowledge graphs.
+
+NetworkX keeps one attribute dict per node and per edge, and graphs loaded from
+JSON carry a separate string object for every ``type`` and ``relation`` value.
+``CompactDiGraph`` swaps those dicts for ``__slots__`` records that intern
+vocabulary values as small integer codes and only allocate a dict for extra
+properties. The records are mutable mappings, so code reading
+``graph.nodes[n]["type"]`` or ``graph[u][v].get("relation")`` is unaffected.
+
+A record takes about a third of the memory of the dict it replaces (64 rather
+than 192 bytes on CPython 3.11). The adjacency dicts NetworkX keeps per node
+and per edge are unchanged, so a whole graph shrinks by roughly a quarter;
+read-only graphs that must be much smaller can be memory-mapped instead
+(``GraphEngine.open_mapped``).
+"""
+
+from abc import abstractmethod
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional
+
+import networkx as nx
+
+from mcp_server.core.graph_snapshot import (
+    NODE_TYPES,
+    RELATIONS,
+    UNKNOWN_CODE,
+    node_type_code,
+    relation_code,
+)
+
+# Sentinel label for "no label attribute" (None is a valid attribute value)
+_MISSING: Any = object()
+
+
+class _InternedAttributes(MutableMapping):
+    """Attribute mapping with one vocabulary-coded key and one plain slot.
+
+    Subclasses name the coded key, its vocabulary and the plain key, and
+    implement ``_encode``. Values outside the vocabulary, and any other keys,
+    go to a lazily created dict.
+    """
+
+    __slots__ = ("_code", "_plain", "_extra")
+
+    _CODED_KEY: str
+    _PLAIN_KEY: Optional[str] = None
+    _VOCABULARY: List[str]
+
+    def __init__(self) -> None:
+        """Create an empty attribute record."""
+        self._code = UNKNOWN_CODE
+        self._plain: Any = _MISSING
+        self._extra: Optional[Dict[str, Any]] = None
+
+    @staticmethod
+    @abstractmethod
+    def _encode(value: Any) -> int:
+        """Map a value of the coded key to its vocabulary code (-1 if unknown)."""
+
+    def __getitem__(self, key: str) -> Any:
+        """Get an attribute value, decoding interned values."""
+        if key == self._CODED_KEY and self._code != UNKNOWN_CODE:
+            return self._VOCABULARY[self._code]
+        if key == self._PLAIN_KEY and self._plain is not _MISSING:
+            return self._plain
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set an attribute value, interning vocabulary values."""
+        if key == self._CODED_KEY:
+            code = self._encode(value) if isinstance(value, str) else UNKNOWN_CODE
+            if code != UNKNOWN_CODE:
+                self._code = code
+                self._discard_extra(key)
+                return
+            self._code = UNKNOWN_CODE
+        elif key == self._PLAIN_KEY:
+            self._plain = value
+            return
+
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        """Delete an attribute."""
+        if key == self._CODED_KEY and self._code != UNKNOWN_CODE:
+            self._code = UNKNOWN_CODE
+        elif key == self._PLAIN_KEY and self._plain is not _MISSING:
+            self._plain = _MISSING
+        elif self._extra is not None and key in self._extra:
+            self._discard_extra(key)
+        else:
+            raise KeyError(key)
+
+    def _discard_extra(self, key: str) -> None:
+        """Drop a key from the extra dict, releasing the dict once empty."""
+        if self._extra is not None:
+            self._extra.pop(key, None)
+            if not self._extra:
+                self._extra = None
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate attribute names (plain key, coded key, then extras)."""
+        if self._PLAIN_KEY is not None and self._plain is not _MISSING:
+            yield self._PLAIN_KEY
+        if self._code != UNKNOWN_CODE:
+            yield self._CODED_KEY
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        """Number of attributes."""
+        return (
+            (self._PLAIN_KEY is not None and self._plain is not _MISSING)
+            + (self._code != UNKNOWN_CODE)
+            + (len(self._extra) if self._extra is not None else 0)
+        )
+
+    def __repr__(self) -> str:
+        """Represent the record like the dict it replaces."""
+        return repr(dict(self))
+
+    def copy(self) -> Dict[str, Any]:
+        """Get a plain dict copy (NetworkX calls this when copying graphs)."""
+        return dict(self)
+
+
+class NodeAttributes(_InternedAttributes):
+    """Node attributes with an interned ``type`` and a dedicated ``label`` slot."""
+
+    __slots__ = ()
+
+    _CODED_KEY = "type"
+    _PLAIN_KEY = "label"
+    _VOCABULARY = NODE_TYPES
+    _encode = staticmethod(node_type_code)
+
+
+class EdgeAttributes(_InternedAttributes):
+    """Edge attributes with an interned ``relation``."""
+
+    __slots__ = ()
+
+    _CODED_KEY = "relation"
+    _VOCABULARY = RELATIONS
+    _encode = staticmethod(relation_code)
+
+
+class CompactDiGraph(nx.DiGraph):
+    """Directed graph storing node and edge attributes as compact interned records."""
+
+    node_attr_dict_factory = NodeAttributes
+    edge_attr_dict_factory = EdgeAttributes
@@ -0,0 +1,68 @@
+"""Incremental weak-connectivity tracking with a union-find structure."""
+
+from typing import Dict, Hashable, Iterable, Tuple
+
+
+class UnionFind:
+    """Disjoint-set forest with union by size and path halving.
+
+    Handles node and edge insertions incrementally. Deletions cannot be undone
+    in a union-find, so callers rebuild it from scratch after removals.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty forest."""
+        self._parent: Dict[Hashable, Hashable] = {}
+        self._size: Dict[Hashable, int] = {}
+        self.num_components = 0
+
+    def __len__(self) -> int:
+        """Number of tracked elements."""
+        return len(self._parent)
+
+    def add(self, item: Hashable) -> None:
+        """Add an element as its own component (no-op if already tracked)."""
+        if item not in self._parent:
+            self._parent[item] = item
+            self._size[item] = 1
+            self.num_components += 1
+
+    def find(self, item: Hashable) -> Hashable:
+        """Find the representative of an element's component, adding it if new."""
+        self.add(item)
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> None:
+        """Merge the components containing two elements."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self._size[root_a] < self._size[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        self._size[root_a] += self._size.pop(root_b)
+        self.num_components -= 1
+
+    def copy(self) -> "UnionFind":
+        """Get an independent copy of the forest."""
+        forest = UnionFind()
+        forest._parent = dict(self._parent)
+        forest._size = dict(self._size)
+        forest.num_components = self.num_components
+        return forest
+
+    @classmethod
+    def build(
+        cls, nodes: Iterable[Hashable], edges: Iterable[Tuple[Hashable, Hashable]]
+    ) -> "UnionFind":
+        """Build a forest from scratch over the given nodes and edges."""
+        forest = cls()
+        for node in nodes:
+            forest.add(node)
+        for a, b in edges:
+            forest.union(a, b)
+        return forest
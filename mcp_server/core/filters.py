@@ -0,0 +1,45 @@
+"""Compiled filter predicates for context-aware graph traversal."""
+
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Tuple
+
+
+def filter_signature(filters: Optional[Dict[str, Any]]) -> Tuple[Hashable, ...]:
+    """Normalize a filters dict into a hashable signature.
+
+    Context matching only looks at truthy filter values (case-insensitively), so
+    filters that differ only in key names, value case or falsy entries share a
+    signature and always select the same nodes.
+    """
+    if not filters:
+        return ()
+    values = sorted({str(value).lower() for value in filters.values() if value})
+    return ("active", *values)
+
+
+class FilterPlan:
+    """Filter conditions compiled once and evaluated many times.
+
+    Filter values are lowercased up front. Single-word values also go into a
+    token set, so a label containing one of them as a whole word matches without
+    any substring scan.
+    """
+
+    __slots__ = ("signature", "active", "values", "tokens")
+
+    def __init__(self, filters: Optional[Dict[str, Any]] = None) -> None:
+        """Compile a filters dict.
+
+        Args:
+            filters: Filter conditions (e.g., {"location": "Texas", "property_type": "rural"})
+        """
+        self.signature = filter_signature(filters)
+        self.active: bool = bool(self.signature)
+        self.values: Tuple[str, ...] = tuple(self.signature[1:])  # type: ignore[arg-type]
+        self.tokens: FrozenSet[str] = frozenset(v for v in self.values if len(v.split()) == 1)
+
+    def matches(self, label: str) -> bool:
+        """Check whether any filter value occurs in the label (case-insensitive)."""
+        label = label.lower()
+        if self.tokens and not self.tokens.isdisjoint(label.split()):
+            return True
+        return any(value in label for value in self.values)
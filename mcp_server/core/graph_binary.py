@@ -0,0 +1,262 @@
+"""Compact binary snapshot format for knowledge graphs.
+
+File layout (all integers little-endian)::
+
+    magic "DACGRAPH" | format version (u32) | header length (u32) | JSON header
+    | padding | 64-byte aligned array blobs
+
+The JSON header holds counts, graph metadata, the node type and relation
+vocabularies, and the dtype, shape and offset of every array. Strings (node
+ids, labels and JSON-encoded properties) are stored as string tables: an
+``int64`` offsets array plus a ``uint8`` UTF-8 blob. Edges are columnar
+``int32`` source/target index arrays with an ``int8`` relation code array.
+
+Since format version 2 the file also holds CSR successor/predecessor arrays
+and a sorted-id permutation, so a memory-mapped snapshot can serve traversals
+and id lookups without building any in-memory structures.
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import networkx as nx
+import numpy as np
+
+from mcp_server.core.graph_snapshot import (
+    NODE_TYPES,
+    RELATIONS,
+    UNKNOWN_CODE,
+    build_csr,
+    node_type_code,
+    relation_code,
+)
+
+MAGIC = b"DACGRAPH"
+FORMAT_VERSION = 2
+BINARY_SUFFIX = ".dgraph"
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+NodeRecord = Tuple[str, Dict[str, Any]]
+EdgeRecord = Tuple[str, str, Dict[str, Any]]
+
+
+def is_binary_path(file_path: Path) -> bool:
+    """Check whether a path selects the binary snapshot format by extension."""
+    return file_path.suffix == BINARY_SUFFIX
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the array alignment."""
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def pack_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into a string table of (offsets, UTF-8 blob) arrays."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def unpack_strings(offsets: np.ndarray, blob: np.ndarray) -> List[str]:
+    """Decode every string of a string table."""
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[bounds[i] : bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+
+def write_arrays(file_path: Path, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    """Write named arrays and a JSON header into a binary container file."""
+    layout: Dict[str, Dict[str, Any]] = {}
+    offset = 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += array.nbytes
+
+    header_bytes = json.dumps({**header, "arrays": layout}, separators=(",", ":")).encode("utf-8")
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + layout[name]["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+
+
+def read_arrays(
+    file_path: Path, mmap: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Read the JSON header and all named arrays of a binary container file.
+
+    Args:
+        file_path: Container file to read
+        mmap: Memory-map the file read-only instead of reading it into memory;
+            the returned arrays are then views into the shared page cache
+
+    Raises:
+        ValueError: If the file is not a binary graph snapshot or its format
+            version is newer than this reader
+    """
+    if mmap:
+        raw = np.memmap(file_path, dtype=np.uint8, mode="r")
+    else:
+        raw = np.fromfile(file_path, dtype=np.uint8)
+    header = _parse_header(raw[: _PREAMBLE.size].tobytes(), raw, file_path)
+    data_start = _align(_PREAMBLE.size + header.pop("_header_length"))
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = data_start + spec["offset"]
+        arrays[name] = raw[start : start + count * dtype.itemsize].view(dtype).reshape(
+            spec["shape"]
+        )
+    return header, arrays
+
+
+def _parse_header(preamble: bytes, raw: np.ndarray, file_path: Path) -> Dict[str, Any]:
+    """Validate the preamble and decode the JSON header."""
+    if len(preamble) < _PREAMBLE.size:
+        raise ValueError(f"Not a binary graph snapshot: {file_path}")
+    magic, version, header_length = _PREAMBLE.unpack(preamble)
+    if magic != MAGIC:
+        raise ValueError(f"Not a binary graph snapshot: {file_path}")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported binary graph format version {version}: {file_path}")
+
+    start = _PREAMBLE.size
+    header = json.loads(raw[start : start + header_length].tobytes().decode("utf-8"))
+    header["_header_length"] = header_length
+    return header
+
+
+def _encode_properties(properties: Dict[str, Any]) -> str:
+    """Encode a properties dict compactly ("" when empty)."""
+    return json.dumps(properties, separators=(",", ":")) if properties else ""
+
+
+def _vocabulary_code(value: str, encode: Any, kind: str) -> int:
+    """Encode a vocabulary value, rejecting values outside the vocabulary."""
+    code = encode(value)
+    if code == UNKNOWN_CODE:
+        raise ValueError(f"Unknown {kind} cannot be stored in a binary snapshot: {value}")
+    return code
+
+
+def _decode_properties(encoded: str) -> Dict[str, Any]:
+    """Decode a properties dict written by ``_encode_properties``."""
+    return json.loads(encoded) if encoded else {}
+
+
+def write_binary_graph(graph: nx.DiGraph, file_path: Path, metadata: Dict[str, Any]) -> None:
+    """Write a graph as a binary snapshot.
+
+    Missing labels default to the node id, missing types to ``concept`` and
+    missing relations to ``related_to``, as in the JSON export.
+
+    Raises:
+        ValueError: If a node type or relation is not part of the vocabulary
+    """
+    ids = list(graph.nodes)
+    index = {node_id: i for i, node_id in enumerate(ids)}
+
+    labels, types, node_props = [], [], []
+    for node_id, data in graph.nodes(data=True):
+        labels.append(data.get("label", node_id))
+        types.append(_vocabulary_code(data.get("type", "concept"), node_type_code, "node type"))
+        node_props.append(
+            _encode_properties({k: v for k, v in data.items() if k not in ["label", "type"]})
+        )
+
+    sources, targets, relations, edge_props = [], [], [], []
+    for source, target, data in graph.edges(data=True):
+        sources.append(index[source])
+        targets.append(index[target])
+        relations.append(
+            _vocabulary_code(data.get("relation", "related_to"), relation_code, "relation")
+        )
+        edge_props.append(_encode_properties({k: v for k, v in data.items() if k != "relation"}))
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name, values in (
+        ("node_ids", ids),
+        ("node_labels", labels),
+        ("node_props", node_props),
+        ("edge_props", edge_props),
+    ):
+        arrays[f"{name}.offsets"], arrays[f"{name}.data"] = pack_strings(values)
+    arrays["node_types"] = np.asarray(types, dtype=np.int8)
+    arrays["edge_sources"] = np.asarray(sources, dtype=np.int32)
+    arrays["edge_targets"] = np.asarray(targets, dtype=np.int32)
+    arrays["edge_relations"] = np.asarray(relations, dtype=np.int8)
+
+    # CSR adjacency for memory-mapped traversal; edges are already grouped by source
+    arrays["succ_indptr"] = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(arrays["edge_sources"], minlength=len(ids)), out=arrays["succ_indptr"][1:]
+    )
+    pred_indptr, pred_indices, pred_relations = build_csr(graph.pred, ids, index)
+    pred_relations[pred_relations == UNKNOWN_CODE] = relation_code("related_to")
+    arrays["pred_indptr"] = pred_indptr
+    arrays["pred_indices"] = pred_indices
+    arrays["pred_relations"] = pred_relations
+
+    # Node indices ordered by UTF-8 id, for binary-search id lookup
+    encoded_ids = [node_id.encode("utf-8") for node_id in ids]
+    arrays["id_order"] = np.asarray(
+        sorted(range(len(ids)), key=encoded_ids.__getitem__), dtype=np.int32
+    )
+
+    header = {
+        "num_nodes": len(ids),
+        "num_edges": len(sources),
+        "node_types": NODE_TYPES,
+        "relations": RELATIONS,
+        "metadata": metadata,
+    }
+    write_arrays(file_path, header, arrays)
+
+
+def read_binary_graph(
+    file_path: Path,
+) -> Tuple[List[NodeRecord], List[EdgeRecord], Dict[str, Any]]:
+    """Read a binary snapshot into node and edge records plus graph metadata.
+
+    Returns:
+        ``(node_records, edge_records, metadata)`` where node records are
+        ``(node_id, attributes)`` and edge records ``(source, target, attributes)``
+    """
+    header, arrays = read_arrays(file_path)
+
+    def strings(name: str) -> List[str]:
+        return unpack_strings(arrays[f"{name}.offsets"], arrays[f"{name}.data"])
+
+    node_types: List[str] = header["node_types"]
+    relations: List[str] = header["relations"]
+
+    ids = strings("node_ids")
+    node_records: List[NodeRecord] = [
+        (node_id, {"label": label, "type": node_types[code], **_decode_properties(props)})
+        for node_id, label, code, props in zip(
+            ids, strings("node_labels"), arrays["node_types"].tolist(), strings("node_props")
+        )
+    ]
+    edge_records: List[EdgeRecord] = [
+        (ids[source], ids[target], {"relation": relations[code], **_decode_properties(props)})
+        for source, target, code, props in zip(
+            arrays["edge_sources"].tolist(),
+            arrays["edge_targets"].tolist(),
+            arrays["edge_relations"].tolist(),
+            strings("edge_props"),
+        )
+    ]
+    return node_records, edge_records, header.get("metadata", {})
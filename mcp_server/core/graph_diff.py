@@ -0,0 +1,192 @@
+"""Content hashes of graph elements, and compact deltas between two graphs.
+
+Every node and edge gets a 128-bit hash of its key and attributes. Two graphs
+are diffed by comparing the hashes of the elements they share a key for, so
+only added, removed and changed elements are written to the delta. A graph's
+digest (its fingerprint) is the sum of its element hashes modulo 2**128: it
+does not depend on insertion order, and a mutation updates it by subtracting
+the hashes of the elements it replaces and adding those of the new ones. A
+delta records the digests of the graph it applies to and of the graph it
+produces.
+"""
+
+import json
+from hashlib import blake2b
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Mapping, Tuple
+
+from mcp_server.core.mutation_log import SEQUENCE_KEY
+
+if TYPE_CHECKING:
+    from mcp_server.core.graph_engine import GraphEngine
+
+DELTA_FORMAT = "docascode-graph-delta"
+DELTA_VERSION = 1
+
+# Element hashes and digests are integers modulo 2**HASH_BITS
+HASH_BITS = 128
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# Graph file metadata entry holding the fingerprint of the saved graph
+FINGERPRINT_KEY = "fingerprint"
+
+# Attribute values hashed through their repr; anything else goes through JSON
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Element hashes: node id -> hash, and (source, target) -> hash
+ContentHashes = Tuple[Dict[Hashable, int], Dict[Tuple[Hashable, Hashable], int]]
+
+
+def _element_hash(key: Tuple[Any, ...], attrs: Mapping[str, Any]) -> int:
+    """Hash an element key and its attributes, independently of attribute order."""
+    items = sorted(attrs.items())
+    if all(isinstance(value, _SCALAR_TYPES) for _, value in items):
+        payload = repr((key, items))
+    else:
+        # Nested values are hashed as JSON, so tuples equal the lists they load as
+        payload = json.dumps([key, items], sort_keys=True, default=str)
+    digest = blake2b(payload.encode("utf-8"), digest_size=HASH_BITS // 8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def node_hash(node_id: Hashable, attrs: Mapping[str, Any]) -> int:
+    """Content hash of a node: its ID, label, type and properties."""
+    return _element_hash(("node", node_id), attrs)
+
+
+def edge_hash(source: Hashable, target: Hashable, attrs: Mapping[str, Any]) -> int:
+    """Content hash of an edge: its endpoints, relation and properties."""
+    return _element_hash(("edge", source, target), attrs)
+
+
+def content_hashes(engine: "GraphEngine") -> ContentHashes:
+    """Compute the hash of every node and edge of an engine's graph."""
+    graph = engine.graph
+    nodes = {node_id: node_hash(node_id, data) for node_id, data in graph.nodes(data=True)}
+    edges = {
+        (source, target): edge_hash(source, target, data)
+        for source, target, data in graph.edges(data=True)
+    }
+    return nodes, edges
+
+
+def graph_digest(hashes: ContentHashes) -> int:
+    """Order-independent digest of a graph's nodes and edges."""
+    nodes, edges = hashes
+    return (sum(nodes.values()) + sum(edges.values())) & HASH_MASK
+
+
+def stream_digest(engine: "GraphEngine") -> int:
+    """Digest of an engine's graph, computed without keeping the element hashes."""
+    graph = engine.graph
+    total = sum(node_hash(node_id, data) for node_id, data in graph.nodes(data=True))
+    total += sum(edge_hash(source, target, data) for source, target, data in graph.edges(data=True))
+    return total & HASH_MASK
+
+
+def format_digest(digest: int) -> str:
+    """Format a digest as 32 hex digits."""
+    return f"{digest:0{HASH_BITS // 4}x}"
+
+
+def _node_entry(node_id: Hashable, data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Node as a GraphNode-shaped dict."""
+    return {
+        "id": node_id,
+        "label": data.get("label", node_id),
+        "type": data.get("type", "concept"),
+        "properties": {k: v for k, v in data.items() if k not in ["label", "type"]},
+    }
+
+
+def _edge_entry(source: Hashable, target: Hashable, data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Edge as a GraphEdge-shaped dict."""
+    return {
+        "source": source,
+        "target": target,
+        "relation": data.get("relation", "related_to"),
+        "properties": {k: v for k, v in data.items() if k != "relation"},
+    }
+
+
+def _user_metadata(metadata: Mapping[str, Any]) -> Dict[str, Any]:
+    """Metadata without the entries that belong to a particular file."""
+    return {k: v for k, v in metadata.items() if k != SEQUENCE_KEY}
+
+
+def compute_delta(base: "GraphEngine", target: "GraphEngine") -> Dict[str, Any]:
+    """Compute the delta that turns ``base`` into ``target``.
+
+    Runs in O(N + E): every element key of both graphs is looked up once, and
+    element contents are compared through their cached hashes. The digests
+    are the graphs' fingerprints.
+
+    Args:
+        base: Graph the delta applies to
+        target: Graph the delta produces
+
+    Returns:
+        JSON-serializable delta: added and changed nodes and edges as
+        GraphNode/GraphEdge dicts, removed node IDs and ``[source, target]``
+        pairs, the target's metadata if it differs, and both digests
+    """
+    base_nodes, base_edges = base.content_hashes()
+    target_nodes, target_edges = target.content_hashes()
+    node_data, edge_data = target.graph.nodes, target.graph.edges
+
+    nodes_added, nodes_changed = [], []
+    for node_id, digest in target_nodes.items():
+        previous = base_nodes.get(node_id)
+        if previous is None:
+            nodes_added.append(_node_entry(node_id, node_data[node_id]))
+        elif previous != digest:
+            nodes_changed.append(_node_entry(node_id, node_data[node_id]))
+
+    edges_added, edges_changed = [], []
+    for pair, digest in target_edges.items():
+        previous = base_edges.get(pair)
+        if previous is None:
+            edges_added.append(_edge_entry(*pair, edge_data[pair]))
+        elif previous != digest:
+            edges_changed.append(_edge_entry(*pair, edge_data[pair]))
+
+    metadata = _user_metadata(target.metadata)
+    return {
+        "format": DELTA_FORMAT,
+        "version": DELTA_VERSION,
+        "base_digest": base.fingerprint,
+        "target_digest": target.fingerprint,
+        "nodes_added": nodes_added,
+        "nodes_changed": nodes_changed,
+        "nodes_removed": [node_id for node_id in base_nodes if node_id not in target_nodes],
+        "edges_added": edges_added,
+        "edges_changed": edges_changed,
+        "edges_removed": [list(pair) for pair in base_edges if pair not in target_edges],
+        "metadata": metadata if metadata != _user_metadata(base.metadata) else None,
+    }
+
+
+def delta_size(delta: Mapping[str, Any]) -> Dict[str, int]:
+    """Number of elements per section of a delta."""
+    return {
+        key: len(delta[key])
+        for key in (
+            "nodes_added",
+            "nodes_changed",
+            "nodes_removed",
+            "edges_added",
+            "edges_changed",
+            "edges_removed",
+        )
+    }
+
+
+def check_delta(delta: Mapping[str, Any]) -> None:
+    """Check that a dict is a delta this version can apply.
+
+    Raises:
+        ValueError: If the format or version is not supported
+    """
+    if delta.get("format") != DELTA_FORMAT:
+        raise ValueError(f"Not a graph delta: format {delta.get('format')!r}")
+    if delta.get("version") != DELTA_VERSION:
+        raise ValueError(f"Unsupported graph delta version: {delta.get('version')}")
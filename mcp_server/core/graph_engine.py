@@ -1,44 +1,651 @@
 """Generic knowledge graph engine with NetworkX backend."""
 
-import json
+import os
+import threading
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import networkx as nx
 from loguru import logger
 
+from mcp_server.core.compact_graph import CompactDiGraph
+from mcp_server.core.connectivity import UnionFind
+from mcp_server.core.filters import FilterPlan, filter_signature
+from mcp_server.core.graph_binary import (
+    EdgeRecord,
+    NodeRecord,
+    is_binary_path,
+    read_binary_graph,
+    write_binary_graph,
+)
+from mcp_server.core.graph_diff import (
+    FINGERPRINT_KEY,
+    HASH_MASK,
+    ContentHashes,
+    check_delta,
+    compute_delta,
+    content_hashes,
+    delta_size,
+    edge_hash,
+    format_digest,
+    graph_digest,
+    node_hash,
+    stream_digest,
+)
+from mcp_server.core.graph_json import iter_graph_json, write_graph_json
+from mcp_server.core.graph_mmap import MappedGraph
+from mcp_server.core.graph_snapshot import CompiledGraph
+from mcp_server.core.label_index import LabelIndex
+from mcp_server.core.mutation_log import SEQUENCE_KEY, MutationLog
+from mcp_server.core.partition import GraphPartition, ParallelTraverser, partition_graph
+from mcp_server.core.paths import (
+    FrontierAdjacency,
+    bidirectional_frontier_path,
+    bidirectional_shortest_path,
+    k_shortest_paths,
+)
+from mcp_server.core.pattern_query import PatternMatcher, parse_pattern_query
+from mcp_server.core.reachability import ReachabilityIndex
+from mcp_server.core.sqlite_graph import SQLiteDiGraph, is_sqlite_path, write_sqlite_graph
+from mcp_server.core.topological_order import DynamicTopologicalOrder
 from mcp_server.models.schemas import EdgeRelation, GraphEdge, GraphNode, KnowledgeGraph, NodeType
 
+_RELATIONS: Dict[Optional[str], EdgeRelation] = {
+    relation.value: relation for relation in EdgeRelation
+}
+_NODE_TYPES: Dict[str, NodeType] = {node_type.value: node_type for node_type in NodeType}
+
+# Instance attributes nx.freeze sets to disable a graph's mutating methods
+_FROZEN_GRAPH_ATTRIBUTES = (
+    "add_node",
+    "add_nodes_from",
+    "remove_node",
+    "remove_nodes_from",
+    "add_edge",
+    "add_edges_from",
+    "add_weighted_edges_from",
+    "remove_edge",
+    "remove_edges_from",
+    "clear",
+    "clear_edges",
+    "frozen",
+)
+
+# Maximum number of compiled filter plans kept per engine
+FILTER_PLAN_CACHE_SIZE = 128
+
+# Nodes or edges inserted per batch while streaming a JSON graph file
+LOAD_BATCH_SIZE = 10_000
+
+# Default maximum number of traversal results kept per engine
+TRAVERSAL_CACHE_SIZE = 256
+
+
+def _same_file(first: Path, second: Path) -> bool:
+    """Check whether two paths name the same file."""
+    return first.resolve() == second.resolve()
+
+
+def _node_record(node: Dict[str, Any]) -> NodeRecord:
+    """Validate a raw node dict through GraphNode and convert it to a record."""
+    model = GraphNode(**node)
+    return model.id, {"label": model.label, "type": model.type.value, **model.properties}
+
+
+def _edge_record(edge: Dict[str, Any]) -> EdgeRecord:
+    """Validate a raw edge dict through GraphEdge and convert it to a record."""
+    model = GraphEdge(**edge)
+    return model.source, model.target, {"relation": model.relation.value, **model.properties}
+
+
+def _trusted_node_record(node: Dict[str, Any]) -> NodeRecord:
+    """Convert a raw node dict to a record, checking only its type value.
+
+    The type string is replaced by the shared enum value, so equal types are
+    stored as one string object.
+    """
+    node_type = _NODE_TYPES.get(node["type"])
+    if node_type is None:
+        raise ValueError(f"Invalid node type for {node['id']}: {node['type']}")
+    return node["id"], {"label": node["label"], "type": node_type.value, **node["properties"]}
+
+
+def _trusted_edge_record(edge: Dict[str, Any]) -> EdgeRecord:
+    """Convert a raw edge dict to a record, checking only its (shared) relation value."""
+    relation = _RELATIONS.get(edge["relation"])
+    if relation is None:
+        raise ValueError(
+            f"Invalid relation for {edge['source']} --> {edge['target']}: {edge['relation']}"
+        )
+    return edge["source"], edge["target"], {"relation": relation.value, **edge["properties"]}
+
 
 class GraphEngine:
     """Generic knowledge graph operations using NetworkX."""
 
-    def __init__(self) -> None:
-        """Initialize empty directed graph."""
-        self.graph: nx.DiGraph = nx.DiGraph()
+    def __init__(
+        self,
+        compiled: bool = False,
+        cache_size: int = TRAVERSAL_CACHE_SIZE,
+        compact: bool = False,
+        database: Optional[Path] = None,
+    ) -> None:
+        """Initialize empty directed graph.
+
+        Args:
+            compiled: Run traversals on a compiled CSR snapshot of the graph. The
+                snapshot is rebuilt lazily after any mutation.
+            cache_size: Maximum number of cached traversal results (0 disables)
+            compact: Store node and edge attributes as interned slot records
+                (``CompactDiGraph``) instead of per-element dicts, which takes
+                roughly a quarter less memory
+            database: Store the graph in this SQLite database file
+                (``SQLiteDiGraph``), opening it if it exists, for graphs larger
+                than memory. Every mutation is written to the database at once.
+                Takes precedence over ``compact``.
+        """
+        self.compiled = compiled
+        self._snapshot: Optional[CompiledGraph] = None
+        self._filter_plans: "OrderedDict[Tuple[Any, ...], FilterPlan]" = OrderedDict()
+        self._frozen = False
+
+        # Guards the filter plan and traversal caches, which frozen engines
+        # share between concurrent readers
+        self._cache_lock = threading.Lock()
+
+        # Traversal results keyed by (version, start, filter signature, max_depth)
+        self._version = 0
+        self._cache_size = cache_size
+        self._traversal_cache: "OrderedDict[Tuple[Any, ...], List[str]]" = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+        # Reachability index, built on first use
+        self._reachability: Optional[ReachabilityIndex] = None
+
+        # Content hash of every node and edge, computed on first use
+        self._content_hashes: Optional[ContentHashes] = None
+
+        if database is not None:
+            self._attach_graph(SQLiteDiGraph(database))
+        else:
+            self._attach_graph(CompactDiGraph() if compact else nx.DiGraph())
+
+    def _attach_graph(self, graph: nx.DiGraph) -> None:
+        """Use ``graph`` as the engine's storage, resetting the structures derived from it.
+
+        A ``SQLiteDiGraph`` serves the node type index, the relation indexes
+        and the metadata from its tables; for other graphs they are dicts
+        maintained on mutation, starting empty.
+        """
+        self.graph = graph
+        self._in_database = isinstance(graph, SQLiteDiGraph)
+
+        # Node name index, built on first use, and the sum of the content
+        # hashes (the fingerprint), maintained on mutation once known
+        self._labels: Optional[LabelIndex] = None
+        self._fingerprint: Optional[int] = None
+
+        # Topological order of the precedes edges, which must stay acyclic
+        self._precedes_order = DynamicTopologicalOrder()
+
+        # Node ids per type, relation-partitioned adjacency (relation -> node ->
+        # ordered neighbor set), and weak connectivity
+        self._nodes_by_type: Mapping[str, Mapping[str, None]]
+        self._out_index: Dict[EdgeRelation, Mapping[str, Mapping[str, None]]]
+        self._in_index: Dict[EdgeRelation, Mapping[str, Mapping[str, None]]]
+        self._components = UnionFind()
+        if isinstance(graph, SQLiteDiGraph):
+            self._metadata: MutableMapping[str, Any] = graph.metadata
+            self._nodes_by_type = graph.type_index()
+            self._out_index = {r: graph.relation_index(r.value) for r in EdgeRelation}
+            self._in_index = {
+                r: graph.relation_index(r.value, outgoing=False) for r in EdgeRelation
+            }
+            # Built on first use rather than holding every node in memory
+            self._components_stale = True
+            if graph.fingerprint is not None:
+                self._fingerprint = int(graph.fingerprint, 16)
+            for source, target in graph.relation_edges(EdgeRelation.PRECEDES.value):
+                self._precedes_order.add_edge(source, target)
+        else:
+            self._metadata = {}
+            self._nodes_by_type = {}
+            self._out_index = {relation: {} for relation in EdgeRelation}
+            self._in_index = {relation: {} for relation in EdgeRelation}
+            self._components_stale = False
+
+    @property
+    def metadata(self) -> MutableMapping[str, Any]:
+        """Graph metadata (stored in the database for database-backed graphs)."""
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: MutableMapping[str, Any]) -> None:
+        """Replace the graph metadata."""
+        if self._in_database:
+            entries = dict(value)
+            self._metadata.clear()
+            self._metadata.update(entries)
+        else:
+            self._metadata = value
+
+    @property
+    def database(self) -> Optional[Path]:
+        """SQLite database file holding the graph, or None for in-memory graphs."""
+        return self.graph.path if self._in_database else None
+
+    def compile(self) -> CompiledGraph:
+        """Get the compiled snapshot of the current graph, building it if stale."""
+        if self._snapshot is None:
+            self._snapshot = CompiledGraph.from_graph(self.graph)
+            logger.debug(
+                f"Compiled graph snapshot: {self._snapshot.num_nodes} nodes, "
+                f"{self._snapshot.num_edges} edges"
+            )
+        return self._snapshot
+
+    def copy(self) -> "GraphEngine":
+        """Get an independent, writable copy of the engine.
+
+        Graph, metadata and mutation-maintained indexes are copied. Derived
+        structures and cached traversals are taken over as by
+        ``share_derived``. A database-backed graph is copied into a private
+        temporary database.
+        """
+        clone = GraphEngine(compiled=self.compiled, cache_size=self._cache_size)
+        clone._attach_graph(self.graph.copy())
+        clone.metadata = dict(self.metadata)
+        clone.share_derived(self)
+        clone._components = self._components.copy()
+        clone._components_stale = self._components_stale
+        clone._precedes_order = self._precedes_order.copy()
+        if not self._in_database:
+            clone._nodes_by_type = {t: dict(ids) for t, ids in self._nodes_by_type.items()}
+            for source, target in (
+                (self._out_index, clone._out_index),
+                (self._in_index, clone._in_index),
+            ):
+                for relation, index in source.items():
+                    target[relation] = {node: dict(nbrs) for node, nbrs in index.items()}
+        return clone
+
+    def share_derived(self, source: "GraphEngine") -> None:
+        """Take over the derived structures of an engine holding the same graph.
+
+        Immutable structures (compiled snapshot, reachability index, content
+        hashes and fingerprint) are shared until this engine is mutated, the
+        label index is rebound to this engine's graph, and cached traversals
+        are copied. The version is taken over too, so the cache keys stay
+        valid.
+        """
+        self._version = source._version
+        self._snapshot = source._snapshot
+        self._reachability = source._reachability
+        self._content_hashes = source._content_hashes
+        self._fingerprint = source._fingerprint
+        labels = source._labels
+        self._labels = labels.rebind(self.graph) if labels is not None else None
+        with source._cache_lock:
+            filter_plans = OrderedDict(source._filter_plans)
+            traversal_cache = OrderedDict(source._traversal_cache)
+        with self._cache_lock:
+            self._filter_plans = filter_plans
+            self._traversal_cache = traversal_cache
+
+    def freeze(self) -> None:
+        """Make the engine read-only; any later mutation raises RuntimeError.
+
+        Frozen engines can be read from several threads at once.
+        """
+        self._frozen = True
+        nx.freeze(self.graph)
+
+    def unfreeze(self) -> None:
+        """Make a frozen engine writable again.
+
+        Only safe once no reader can still be using the engine, since
+        readers of a frozen engine do not expect it to change.
+        """
+        self._frozen = False
+        for name in _FROZEN_GRAPH_ATTRIBUTES:
+            vars(self.graph).pop(name, None)
+
+    @property
+    def frozen(self) -> bool:
+        """Whether the engine has been frozen."""
+        return self._frozen
+
+    def _check_writable(self) -> None:
+        """Reject mutations of a frozen engine before anything is changed."""
+        if self._frozen:
+            raise RuntimeError("Cannot modify a frozen graph engine; copy() it first")
+
+    @property
+    def version(self) -> int:
+        """Graph version, incremented by every mutation."""
+        return self._version
+
+    def _invalidate(self, reachability_changed: bool = True) -> None:
+        """Drop derived structures after the graph has been mutated.
+
+        Args:
+            reachability_changed: Whether the mutation may have changed which nodes
+                can reach which; if not, the reachability index is kept.
+        """
+        self._version += 1
+        self._snapshot = None
+        self._content_hashes = None
+        if reachability_changed:
+            self._reachability = None
+        if self._in_database and self._fingerprint is not None:
+            # The database dropped its stored fingerprint when the rows changed
+            self.graph.fingerprint = format_digest(self._fingerprint)
+
+    def _update_fingerprint(
+        self,
+        sign: int,
+        nodes: Iterable[str] = (),
+        edges: Iterable[Tuple[str, str]] = (),
+    ) -> None:
+        """Add (sign 1) or subtract (sign -1) the hashes of existing elements.
+
+        Does nothing while the fingerprint is unknown, so bulk loads pay no
+        hashing cost until the fingerprint is first asked for.
+        """
+        if self._fingerprint is None:
+            return
+        nodes_view, graph = self.graph.nodes, self.graph
+        total = sum(node_hash(node_id, nodes_view[node_id]) for node_id in nodes)
+        total += sum(edge_hash(u, v, graph[u][v]) for u, v in edges)
+        self._fingerprint = (self._fingerprint + sign * total) & HASH_MASK
+
+    def _index_edge(self, source: str, target: str, relation: Optional[str]) -> None:
+        """Record an edge in the relation-partitioned indexes."""
+        rel = _RELATIONS.get(relation)
+        if rel is not None and not self._in_database:
+            self._out_index[rel].setdefault(source, {})[target] = None
+            self._in_index[rel].setdefault(target, {})[source] = None
+
+    def _unindex_edge(self, source: str, target: str, relation: Optional[str]) -> None:
+        """Remove an edge from the relation-partitioned indexes."""
+        rel = _RELATIONS.get(relation)
+        if rel is None or self._in_database:
+            return
+        for index, key, neighbor in (
+            (self._out_index[rel], source, target),
+            (self._in_index[rel], target, source),
+        ):
+            neighbors = index.get(key)
+            if neighbors is not None:
+                neighbors.pop(neighbor, None)
+                if not neighbors:
+                    del index[key]
+
+    def _order_edges(self, relations: Dict[Tuple[str, str], Optional[str]]) -> None:
+        """Apply edge insertions to the precedes order before the graph is changed.
+
+        Edges whose relation changes away from precedes leave the order, and new
+        precedes edges enter it. If any of them would close a cycle, the order
+        is restored and nothing is applied.
+
+        Args:
+            relations: Relation of each inserted ``(source, target)`` edge
+
+        Raises:
+            ValueError: If the precedes edges would contain a cycle
+        """
+        order = self._precedes_order
+        precedes = EdgeRelation.PRECEDES.value
+        removed = [
+            pair for pair, relation in relations.items()
+            if relation != precedes and order.has_edge(*pair)
+        ]
+        for pair in removed:
+            order.remove_edge(*pair)
+
+        added: List[Tuple[str, str]] = []
+        try:
+            for pair, relation in relations.items():
+                if relation == precedes and order.add_edge(*pair):
+                    added.append(pair)
+        except ValueError:
+            for pair in added:
+                order.remove_edge(*pair)
+            for pair in removed:
+                order.add_edge(*pair)
+            raise
+
+    def _index_node_type(self, node_id: str, node_type: Optional[str]) -> None:
+        """Move a node into the per-type index, dropping any previous entry.
+
+        Called whenever a node is added, updated or removed, so it also drops the
+        label index.
+        """
+        self._labels = None
+        if self._in_database:
+            return
+        previous = self.graph.nodes[node_id].get("type") if node_id in self.graph else None
+        if previous is not None:
+            ids = self._nodes_by_type.get(previous, {})
+            ids.pop(node_id, None)
+            if not ids:
+                self._nodes_by_type.pop(previous, None)
+        if node_type is not None:
+            self._nodes_by_type.setdefault(node_type, {})[node_id] = None
+
+    def clear(self) -> None:
+        """Remove all nodes and edges."""
+        self._check_writable()
+        self.graph.clear()
+        self._attach_graph(self.graph)
+        self.metadata = {}
+        self._invalidate()
 
     def add_node(self, node: GraphNode) -> None:
         """Add a node to the graph."""
+        self._check_writable()
+        existed = node.id in self.graph
+        if existed:
+            self._update_fingerprint(-1, [node.id])
+        self._index_node_type(node.id, node.type.value)
         self.graph.add_node(node.id, label=node.label, type=node.type.value, **node.properties)
+        self._update_fingerprint(1, [node.id])
+        if not self._components_stale:
+            self._components.add(node.id)
+        self._invalidate(reachability_changed=not existed)
         logger.debug(f"Added node: {node.id} ({node.type.value})")
 
     def add_edge(self, edge: GraphEdge) -> None:
-        """Add an edge to the graph."""
+        """Add an edge to the graph.
+
+        Raises:
+            ValueError: If a precedes edge would create a cycle of precedes edges
+        """
+        self._check_writable()
+        self._order_edges({(edge.source, edge.target): edge.relation.value})
+        created = [n for n in dict.fromkeys((edge.source, edge.target)) if n not in self.graph]
+        if created:
+            self._labels = None
+        # An edge between nodes that already reach each other leaves reachability intact
+        implied = self._reachability is not None and self._reachability.is_reachable(
+            edge.source, edge.target
+        )
+        if self.graph.has_edge(edge.source, edge.target):
+            self._update_fingerprint(-1, edges=[(edge.source, edge.target)])
+            self._unindex_edge(
+                edge.source, edge.target, self.graph[edge.source][edge.target].get("relation")
+            )
         self.graph.add_edge(
             edge.source, edge.target, relation=edge.relation.value, **edge.properties
         )
+        self._update_fingerprint(1, created, [(edge.source, edge.target)])
+        self._index_edge(edge.source, edge.target, edge.relation.value)
+        if not self._components_stale:
+            self._components.union(edge.source, edge.target)
+        self._invalidate(reachability_changed=not implied)
         logger.debug(f"Added edge: {edge.source} --[{edge.relation.value}]--> {edge.target}")
 
+    def add_nodes(self, nodes: Iterable[GraphNode]) -> int:
+        """Add many nodes in one bulk insert.
+
+        Args:
+            nodes: Nodes to add (existing nodes are updated, as with ``add_node``)
+
+        Returns:
+            Number of nodes processed
+        """
+        return self._add_node_records(
+            [
+                (node.id, {"label": node.label, "type": node.type.value, **node.properties})
+                for node in nodes
+            ]
+        )
+
+    def add_edges(self, edges: Iterable[GraphEdge], validate: bool = True) -> int:
+        """Add many edges in one bulk insert.
+
+        Args:
+            edges: Edges to add (existing edges are updated, as with ``add_edge``)
+            validate: Reject the whole batch if any endpoint is not an existing node
+
+        Returns:
+            Number of edges processed
+
+        Raises:
+            ValueError: If ``validate`` is set and edges reference unknown nodes, or
+                if the precedes edges would contain a cycle
+        """
+        return self._add_edge_records(
+            [
+                (edge.source, edge.target, {"relation": edge.relation.value, **edge.properties})
+                for edge in edges
+            ],
+            validate=validate,
+        )
+
+    def _add_node_records(self, records: List[NodeRecord]) -> int:
+        """Bulk insert ``(node_id, attributes)`` records with label and type attributes."""
+        self._check_writable()
+        if not records:
+            return 0
+
+        present = self._existing_nodes(r[0] for r in records)
+        existing = sum(1 for node_id, _ in records if node_id in present)
+        ids = dict.fromkeys(r[0] for r in records) if self._fingerprint is not None else {}
+        if existing:
+            self._update_fingerprint(-1, [node_id for node_id in ids if node_id in present])
+        # Last type wins for repeated IDs, matching sequential add_node calls
+        types = {node_id: attrs.get("type") for node_id, attrs in records}
+        for node_id, node_type in types.items():
+            self._index_node_type(node_id, node_type)
+        self.graph.add_nodes_from(records)
+        self._update_fingerprint(1, ids)
+        if not self._components_stale:
+            for node_id, _ in records:
+                self._components.add(node_id)
+
+        self._invalidate(reachability_changed=existing < len(records))
+        logger.debug(f"Added {len(records)} nodes ({existing} updated)")
+        return len(records)
+
+    def _existing_nodes(self, node_ids: Iterable[str]) -> Set[str]:
+        """Get the given nodes that are in the graph (in batched queries for a database)."""
+        if self._in_database:
+            return self.graph.existing_nodes(node_ids)
+        return {node_id for node_id in node_ids if node_id in self.graph}
+
+    def _add_edge_records(self, records: List[EdgeRecord], validate: bool = True) -> int:
+        """Bulk insert ``(source, target, attributes)`` records with a relation attribute."""
+        self._check_writable()
+        if not records:
+            return 0
+
+        if validate:
+            endpoints = {r[0] for r in records} | {r[1] for r in records}
+            missing = endpoints - self._existing_nodes(endpoints)
+            if missing:
+                raise ValueError(
+                    f"Edges reference {len(missing)} unknown nodes: {sorted(missing)[:10]}"
+                )
+        else:
+            self._labels = None  # edges may have created unlabeled nodes
+
+        # Last relation wins for repeated pairs, matching sequential add_edge calls
+        relations = {(source, target): attrs.get("relation") for source, target, attrs in records}
+        self._order_edges(relations)
+        created: List[str] = []
+        if self._fingerprint is not None:
+            if not validate:
+                endpoints = dict.fromkeys(node for pair in relations for node in pair)
+                present = self._existing_nodes(endpoints)
+                created = [node for node in endpoints if node not in present]
+            self._update_fingerprint(
+                -1, edges=[pair for pair in relations if self.graph.has_edge(*pair)]
+            )
+        if not self._in_database:
+            for source, target in relations:
+                if self.graph.has_edge(source, target):
+                    self._unindex_edge(
+                        source, target, self.graph[source][target].get("relation")
+                    )
+
+        self.graph.add_edges_from(records)
+        self._update_fingerprint(1, created, relations)
+        for (source, target), relation in relations.items():
+            self._index_edge(source, target, relation)
+            if not self._components_stale:
+                self._components.union(source, target)
+
+        self._invalidate()
+        logger.debug(f"Added {len(records)} edges")
+        return len(records)
+
     def remove_node(self, node_id: str) -> None:
         """Remove a node and its edges."""
+        self._check_writable()
         if node_id in self.graph:
+            self._update_fingerprint(
+                -1,
+                [node_id],
+                dict.fromkeys([*self.graph.out_edges(node_id), *self.graph.in_edges(node_id)]),
+            )
+            if not self._in_database:
+                for source, target, relation in self.graph.out_edges(node_id, data="relation"):
+                    self._unindex_edge(source, target, relation)
+                for source, target, relation in self.graph.in_edges(node_id, data="relation"):
+                    self._unindex_edge(source, target, relation)
+            self._index_node_type(node_id, None)
+            self._precedes_order.remove_node(node_id)
             self.graph.remove_node(node_id)
+            self._components_stale = True
+            self._invalidate()
             logger.debug(f"Removed node: {node_id}")
 
     def remove_edge(self, source: str, target: str) -> None:
         """Remove an edge."""
+        self._check_writable()
         if self.graph.has_edge(source, target):
+            self._update_fingerprint(-1, edges=[(source, target)])
+            self._unindex_edge(source, target, self.graph[source][target].get("relation"))
+            self._precedes_order.remove_edge(source, target)
             self.graph.remove_edge(source, target)
+            self._components_stale = True
+            self._invalidate()
             logger.debug(f"Removed edge: {source} --> {target}")
 
     def get_node(self, node_id: str) -> Optional[GraphNode]:
@@ -61,48 +668,273 @@ class GraphEngine:
         if node_id not in self.graph:
             return []
 
+        if relation:
+            return self._neighbors_by_relation(node_id, relation, direction)
+
+        if self.compiled:
+            return self.compile().get_neighbors(node_id, direction=direction)
+
         if direction == "out":
-            neighbors = list(self.graph.successors(node_id))
-            if relation:
-                neighbors = [
-                    n
-                    for n in neighbors
-                    if self.graph[node_id][n].get("relation") == relation.value
-                ]
-        elif direction == "in":
-            neighbors = list(self.graph.predecessors(node_id))
-            if relation:
-                neighbors = [
-                    n
-                    for n in neighbors
-                    if self.graph[n][node_id].get("relation") == relation.value
-                ]
-        else:  # both
-            out_neighbors = set(self.graph.successors(node_id))
-            in_neighbors = set(self.graph.predecessors(node_id))
-            neighbors = list(out_neighbors | in_neighbors)
-            if relation:
-                filtered = []
-                for n in neighbors:
-                    if n in out_neighbors and self.graph[node_id][n].get("relation") == relation.value:
-                        filtered.append(n)
-                    elif n in in_neighbors and self.graph[n][node_id].get("relation") == relation.value:
-                        filtered.append(n)
-                neighbors = filtered
+            return list(self.graph.successors(node_id))
+        if direction == "in":
+            return list(self.graph.predecessors(node_id))
+        return list(set(self.graph.successors(node_id)) | set(self.graph.predecessors(node_id)))
 
-        return neighbors
+    def _neighbors_by_relation(
+        self, node_id: str, relation: EdgeRelation, direction: str
+    ) -> List[str]:
+        """Look up relation-filtered neighbors in the relation-partitioned indexes."""
+        successors = self._out_index[relation].get(node_id, {})
+        predecessors = self._in_index[relation].get(node_id, {})
+
+        if direction == "out":
+            return list(successors)
+        if direction == "in":
+            return list(predecessors)
+        return list(set(successors) | set(predecessors))
+
+    def subgraph(
+        self,
+        center_ids: Iterable[str],
+        hops: int = 1,
+        relations: Optional[Iterable[EdgeRelation]] = None,
+        node_types: Optional[Iterable[NodeType]] = None,
+        direction: str = "both",
+    ) -> nx.DiGraph:
+        """Extract the k-hop neighborhood of one or more center nodes.
+
+        The neighborhood is found by a breadth-first expansion of at most
+        ``hops`` edges. Only edges of the given relations are followed, and
+        only nodes of the given types are entered; centers are always
+        included. The result is a read-only NetworkX view of this engine's
+        graph, so no node or edge attributes are copied. It reflects later
+        mutations of the engine, so take ``.copy()`` of it to keep a snapshot.
+
+        Args:
+            center_ids: IDs of the center nodes (unknown IDs are ignored)
+            hops: Maximum number of edges from the nearest center
+            relations: Edge relations to follow (default: all)
+            node_types: Node types to include besides the centers (default: all)
+            direction: Follow edges "out", "in" or "both" ways
+
+        Returns:
+            Subgraph view induced by the neighborhood nodes
+
+        Raises:
+            ValueError: If ``hops`` is negative or ``direction`` is unknown
+        """
+        if hops < 0:
+            raise ValueError(f"hops must be non-negative, got {hops}")
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction: {direction}")
+
+        relation_list = list(relations) if relations is not None else None
+        type_values = {t.value for t in node_types} if node_types is not None else None
+        directions = ("out", "in") if direction == "both" else (direction,)
+
+        def expand(node_id: str) -> Iterator[str]:
+            """Neighbors of a node along the requested relations and directions."""
+            for way in directions:
+                if relation_list is None:
+                    yield from (self.graph.succ if way == "out" else self.graph.pred)[node_id]
+                    continue
+                index = self._out_index if way == "out" else self._in_index
+                for relation in relation_list:
+                    yield from index[relation].get(node_id, ())
+
+        nodes: Dict[str, None] = dict.fromkeys(c for c in center_ids if c in self.graph)
+        frontier = list(nodes)
+        for _ in range(hops):
+            next_frontier: List[str] = []
+            for node_id in frontier:
+                for neighbor in expand(node_id):
+                    if neighbor in nodes:
+                        continue
+                    if (
+                        type_values is not None
+                        and self.graph.nodes[neighbor].get("type") not in type_values
+                    ):
+                        continue
+                    nodes[neighbor] = None
+                    next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+
+        view = self.graph.subgraph(nodes)
+        if relation_list is not None:
+            allowed = {relation.value for relation in relation_list}
+            graph = self.graph
+            view = nx.subgraph_view(
+                view, filter_edge=lambda u, v: graph[u][v].get("relation") in allowed
+            )
+        return view
 
     def find_path(
-        self, start: str, end: str, max_depth: int = 10
+        self,
+        start: str,
+        end: str,
+        max_depth: int = 10,
+        relation: Optional[EdgeRelation] = None,
     ) -> Optional[List[str]]:
-        """Find shortest path between two nodes."""
-        try:
-            path = nx.shortest_path(self.graph, start, end)
-            if len(path) <= max_depth + 1:
-                return path
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            pass
-        return None
+        """Find shortest path between two nodes.
+
+        Uses a depth-bounded bidirectional BFS, so the search stops once no path
+        of at most ``max_depth`` edges can exist.
+
+        Args:
+            start: Start node ID
+            end: End node ID
+            max_depth: Maximum path length in edges
+            relation: Only follow edges with this relation
+
+        Returns:
+            List of node IDs from start to end, or None if no path is found
+        """
+        if start not in self.graph or end not in self.graph:
+            return None
+
+        if self.compiled:
+            return self.compile().find_path(start, end, max_depth=max_depth, relation=relation)
+
+        if self._in_database:
+            rel = relation.value if relation is not None else None
+            return bidirectional_frontier_path(
+                start,
+                end,
+                self._frontier_adjacency(rel, outgoing=True),
+                self._frontier_adjacency(rel, outgoing=False),
+                max_depth,
+            )
+
+        successors, predecessors = self._path_adjacency(relation)
+        return bidirectional_shortest_path(start, end, successors, predecessors, max_depth)
+
+    def find_paths(
+        self,
+        start: str,
+        end: str,
+        k: int = 3,
+        max_depth: int = 10,
+        relation: Optional[EdgeRelation] = None,
+    ) -> List[List[str]]:
+        """Find the k shortest simple paths between two nodes.
+
+        Args:
+            start: Start node ID
+            end: End node ID
+            k: Maximum number of paths to return
+            max_depth: Maximum path length in edges
+            relation: Only follow edges with this relation
+
+        Returns:
+            Paths ordered by length, shortest first
+        """
+        if start not in self.graph or end not in self.graph:
+            return []
+
+        if self.compiled:
+            return self.compile().find_paths(
+                start, end, k=k, max_depth=max_depth, relation=relation
+            )
+
+        successors, predecessors = self._path_adjacency(relation)
+        return k_shortest_paths(start, end, successors, predecessors, k, max_depth)
+
+    def _path_adjacency(
+        self, relation: Optional[EdgeRelation]
+    ) -> Tuple[Callable[[str], Iterable[str]], Callable[[str], Iterable[str]]]:
+        """Get successor/predecessor callables, optionally restricted to one relation."""
+        if relation is None:
+            return self.graph.succ.__getitem__, self.graph.pred.__getitem__
+
+        out_index, in_index = self._out_index[relation], self._in_index[relation]
+        return (lambda n: out_index.get(n, {})), (lambda n: in_index.get(n, {}))
+
+    def _frontier_adjacency(self, relation: Optional[str], outgoing: bool) -> FrontierAdjacency:
+        """Get a callable fetching the neighbors of a whole frontier from the database."""
+
+        def neighbors(frontier: List[str]) -> Dict[str, List[str]]:
+            edges = self.graph.frontier_edges(frontier, outgoing=outgoing, relation=relation)
+            return {node: [neighbor for neighbor, _ in pairs] for node, pairs in edges.items()}
+
+        return neighbors
+
+    def reachability_index(self) -> ReachabilityIndex:
+        """Get the reachability index of the current graph, building it if stale."""
+        if self._reachability is None:
+            self._reachability = ReachabilityIndex(self.graph)
+            logger.debug(f"Built reachability index for {self.graph.number_of_nodes()} nodes")
+        return self._reachability
+
+    def label_index(self) -> LabelIndex:
+        """Get the node name index of the current graph, building it if stale."""
+        if self._labels is None:
+            self._labels = LabelIndex(self.graph)
+            logger.debug(f"Built label index for {self.graph.number_of_nodes()} nodes")
+        return self._labels
+
+    def search_nodes(
+        self, text: str, mode: str = "auto", limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Find nodes by label or ID.
+
+        Args:
+            text: Label, ID or partial name to look up
+            mode: "exact", "case_insensitive", "prefix", "fuzzy", or "auto" to
+                try them in that order
+            limit: Maximum number of matches
+
+        Returns:
+            Matches (id, label, type, match kind and score), best first
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        results = []
+        for node_id, kind, score in self.label_index().search(text, mode=mode, limit=limit):
+            data = self.graph.nodes[node_id]
+            results.append(
+                {
+                    "id": node_id,
+                    "label": data.get("label", node_id),
+                    "type": data.get("type"),
+                    "match": kind,
+                    "score": score,
+                }
+            )
+        return results
+
+    def pattern_matcher(self) -> PatternMatcher:
+        """Get a pattern query planner and executor over this engine's indexes."""
+        return PatternMatcher(
+            self.graph,
+            self._nodes_by_type,
+            self._out_index,
+            self._in_index,
+            self.label_index().labels,
+        )
+
+    def match(self, query: str) -> List[Dict[str, str]]:
+        """Run a declarative pattern query (see ``mcp_server.core.pattern_query``).
+
+        Args:
+            query: Query text, e.g.
+                ``MATCH (p:process)-[:requires]->(s:system) WHERE p.label = "Start" RETURN s``
+
+        Returns:
+            One ``{variable: node ID}`` dict per match
+
+        Raises:
+            ValueError: If the query is malformed
+        """
+        return self.pattern_matcher().match(parse_pattern_query(query))
+
+    def is_reachable(self, start: str, end: str) -> bool:
+        """Check whether end can be reached from start along directed edges."""
+        if start not in self.graph or end not in self.graph:
+            return False
+        return self.reachability_index().is_reachable(start, end)
 
     def traverse_bfs(
         self,
@@ -123,28 +955,53 @@ class GraphEngine:
         if start not in self.graph:
             return []
 
-        filters = filters or {}
+        plan = self.compile_filters(filters)
+        key = (self._version, start, plan.signature, max_depth)
+        with self._cache_lock:
+            cached = self._traversal_cache.get(key)
+            if cached is not None:
+                self._cache_hits += 1
+                self._traversal_cache.move_to_end(key)
+                return list(cached)
+            self._cache_misses += 1
+
+        if self.compiled:
+            visited = self.compile().traverse_bfs(start, plan=plan, max_depth=max_depth)
+        elif self._in_database:
+            visited = self._traverse_frontiers(start, plan, max_depth)
+        else:
+            visited = self._traverse(start, plan, max_depth)
+
+        if self._cache_size > 0:
+            with self._cache_lock:
+                self._traversal_cache[key] = visited
+                if len(self._traversal_cache) > self._cache_size:
+                    self._traversal_cache.popitem(last=False)
+        return list(visited)
+
+    def _traverse(self, start: str, plan: FilterPlan, max_depth: int) -> List[str]:
+        """Run the filtered BFS over the NetworkX graph."""
         visited: List[str] = []
-        queue: List[Tuple[str, int]] = [(start, 0)]
+        queue: Deque[Tuple[str, int]] = deque([(start, 0)])
         seen: Set[str] = {start}
+        label_matches: Dict[str, bool] = {}
 
         while queue:
-            current, depth = queue.pop(0)
+            current, depth = queue.popleft()
 
             if depth > max_depth:
                 continue
 
             visited.append(current)
 
-            for neighbor in self.graph.successors(current):
+            for neighbor, data in self.graph.succ[current].items():
                 if neighbor in seen:
                     continue
 
-                edge_data = self.graph[current][neighbor]
-                relation = edge_data.get("relation")
-
                 # Apply filtering logic
-                if not self._should_include_node(neighbor, relation, filters):
+                if not self._should_include_node(
+                    neighbor, data.get("relation"), plan, label_matches
+                ):
                     continue
 
                 seen.add(neighbor)
@@ -152,137 +1009,526 @@ class GraphEngine:
 
         return visited
 
+    def _traverse_frontiers(self, start: str, plan: FilterPlan, max_depth: int) -> List[str]:
+        """Run the filtered BFS level by level, fetching each level's edges in batches.
+
+        Visits nodes in the same order as ``_traverse``, with one database query
+        per batch of frontier nodes instead of one per node.
+        """
+        if max_depth < 0:
+            return []
+
+        visited: List[str] = [start]
+        seen: Set[str] = {start}
+        label_matches: Dict[str, bool] = {}
+        frontier = [start]
+
+        for _ in range(max_depth):
+            edges = self.graph.frontier_edges(frontier)
+            next_frontier: List[str] = []
+            for current in frontier:
+                for neighbor, relation in edges.get(current, ()):
+                    if neighbor in seen:
+                        continue
+                    if not self._should_include_node(neighbor, relation, plan, label_matches):
+                        continue
+                    seen.add(neighbor)
+                    next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            visited.extend(next_frontier)
+            frontier = next_frontier
+
+        return visited
+
+    def partition(self, num_shards: int) -> GraphPartition:
+        """Split the graph into shards along context and connected-component boundaries."""
+        return partition_graph(self.graph, num_shards)
+
+    def parallel_traverser(self, num_shards: Optional[int] = None) -> ParallelTraverser:
+        """Start a multi-process traverser over a partition of the current graph.
+
+        Args:
+            num_shards: Number of shards and worker processes (default: CPU count)
+
+        Returns:
+            Traverser whose ``traverse_bfs`` matches this engine's; close it when done
+        """
+        num_shards = num_shards or os.cpu_count() or 1
+        return ParallelTraverser(self.graph, self.partition(num_shards))
+
+    def compile_filters(self, filters: Optional[Dict[str, Any]] = None) -> FilterPlan:
+        """Get the compiled predicate plan for a filters dict.
+
+        Plans are cached by filter signature, so repeated traversals with the same
+        context reuse the lowercased values and token set.
+        """
+        signature = filter_signature(filters)
+        with self._cache_lock:
+            plan = self._filter_plans.get(signature)
+            if plan is None:
+                plan = FilterPlan(filters)
+                self._filter_plans[signature] = plan
+                if len(self._filter_plans) > FILTER_PLAN_CACHE_SIZE:
+                    self._filter_plans.popitem(last=False)
+            else:
+                self._filter_plans.move_to_end(signature)
+        return plan
+
+    def _label_matches(self, node_id: str, plan: FilterPlan, cache: Dict[str, bool]) -> bool:
+        """Match a node label against a filter plan, memoized per traversal."""
+        matched = cache.get(node_id)
+        if matched is None:
+            matched = plan.matches(self.graph.nodes[node_id].get("label", ""))
+            cache[node_id] = matched
+        return matched
+
     def _should_include_node(
-        self, node_id: str, relation: Optional[str], filters: Dict[str, Any]
+        self,
+        node_id: str,
+        relation: Optional[str],
+        plan: FilterPlan,
+        label_matches: Dict[str, bool],
     ) -> bool:
         """Determine if a node should be included based on filters."""
-        if not filters:
+        if not plan.active:
             return True
 
-        node_data = self.graph.nodes[node_id]
-
-        # Conditional filtering
-        if relation == "conditional_on":
-            # Check if node label matches conditional criteria
-            node_label = node_data.get("label", "").lower()
-            for key, value in filters.items():
-                if value and str(value).lower() in node_label:
-                    return True
-            return False
-
-        # Context filtering (applies_to)
-        if relation == "applies_to":
-            node_label = node_data.get("label", "").lower()
-            for key, value in filters.items():
-                if value and str(value).lower() in node_label:
-                    return True
-            return False
+        # Conditional filtering and context filtering (applies_to)
+        if relation == "conditional_on" or relation == "applies_to":
+            return self._label_matches(node_id, plan, label_matches)
 
         # For process nodes, check their context constraints
-        if node_data.get("type") == "process":
-            context_nodes = [
-                n
-                for n in self.graph.successors(node_id)
-                if self.graph[node_id][n].get("relation") == "applies_to"
-            ]
-
+        if self.graph.nodes[node_id].get("type") == "process":
+            context_nodes = self._out_index[EdgeRelation.APPLIES_TO].get(node_id)
             if context_nodes:
                 # Must match at least one context
-                for ctx_node in context_nodes:
-                    ctx_label = self.graph.nodes[ctx_node].get("label", "").lower()
-                    for key, value in filters.items():
-                        if value and str(value).lower() in ctx_label:
-                            return True
-                return False
+                return any(
+                    self._label_matches(ctx_node, plan, label_matches)
+                    for ctx_node in context_nodes
+                )
 
         return True
 
+    def procedure_steps(self, visited: List[str]) -> List[Dict[str, Any]]:
+        """Build procedure steps (process nodes with role and system hints) from a traversal.
+
+        Steps linked by precedes edges are put in topological order, read from
+        the maintained order in O(k log k); all other steps keep their
+        traversal order.
+        """
+        steps = []
+        for node_id in self._precedes_order.sort(visited):
+            node_data = self.graph.nodes[node_id]
+            if node_data.get("type") != NodeType.PROCESS.value:
+                continue
+
+            metadata = {
+                "id": node_id,
+                "label": node_data.get("label", node_id),
+                "type": node_data.get("type"),
+            }
+
+            # Get role and system
+            for neighbor, edge_data in self.graph.succ[node_id].items():
+                relation = edge_data.get("relation")
+                if relation == EdgeRelation.PERFORMED_BY.value:
+                    metadata["role"] = neighbor
+                if (
+                    relation == EdgeRelation.REQUIRES.value
+                    and self.graph.nodes[neighbor].get("type") == NodeType.SYSTEM.value
+                ):
+                    metadata["system"] = neighbor
+
+            steps.append(metadata)
+        return steps
+
+    def generate_procedures(
+        self,
+        start: str,
+        contexts: List[Optional[Dict[str, Any]]],
+        max_depth: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """Generate procedure steps for many filter contexts in one batch.
+
+        Each distinct context is traversed and turned into steps once; contexts
+        sharing a filter signature receive copies of the same steps.
+
+        Returns:
+            Procedure steps for each context, in the order of ``contexts``
+        """
+        steps: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+        for filters in contexts:
+            signature = filter_signature(filters)
+            if signature not in steps:
+                visited = self.traverse_bfs(start, filters=filters, max_depth=max_depth)
+                steps[signature] = self.procedure_steps(visited)
+
+        logger.debug(f"Generated procedures: {len(contexts)} contexts, {len(steps)} distinct")
+        return [
+            [dict(step) for step in steps[filter_signature(filters)]] for filters in contexts
+        ]
+
     def get_nodes_by_type(self, node_type: NodeType) -> List[GraphNode]:
         """Get all nodes of a specific type."""
         nodes = []
-        for node_id, data in self.graph.nodes(data=True):
-            if data.get("type") == node_type.value:
-                nodes.append(
-                    GraphNode(
-                        id=node_id,
-                        label=data.get("label", node_id),
-                        type=node_type,
-                        properties={k: v for k, v in data.items() if k not in ["label", "type"]},
-                    )
-                )
-        return nodes
-
-    def export_to_model(self) -> KnowledgeGraph:
-        """Export graph to KnowledgeGraph model."""
-        nodes = []
-        for node_id, data in self.graph.nodes(data=True):
+        for node_id in self._nodes_by_type.get(node_type.value, {}):
+            data = self.graph.nodes[node_id]
             nodes.append(
                 GraphNode(
                     id=node_id,
                     label=data.get("label", node_id),
-                    type=NodeType(data.get("type", "concept")),
+                    type=node_type,
                     properties={k: v for k, v in data.items() if k not in ["label", "type"]},
                 )
             )
+        return nodes
+
+    def count_nodes_by_type(self, node_type: NodeType) -> int:
+        """Count nodes of a specific type without materializing them."""
+        return len(self._nodes_by_type.get(node_type.value, {}))
+
+    def is_weakly_connected(self) -> bool:
+        """Check weak connectivity using the incrementally maintained union-find.
+
+        Insertions update the union-find in place; after a deletion it is rebuilt
+        lazily on the next call.
+        """
+        if self._components_stale:
+            edges = self.graph.edge_pairs() if self._in_database else self.graph.edges
+            self._components = UnionFind.build(self.graph.nodes, edges)
+            self._components_stale = False
+        return self.graph.number_of_nodes() > 0 and self._components.num_components == 1
+
+    def iter_node_models(self) -> Iterator[GraphNode]:
+        """Iterate the graph's nodes as GraphNode models, in insertion order."""
+        for node_id, data in self.graph.nodes(data=True):
+            yield GraphNode(
+                id=node_id,
+                label=data.get("label", node_id),
+                type=NodeType(data.get("type", "concept")),
+                properties={k: v for k, v in data.items() if k not in ["label", "type"]},
+            )
 
-        edges = []
+    def iter_edge_models(self) -> Iterator[GraphEdge]:
+        """Iterate the graph's edges as GraphEdge models, in insertion order."""
         for source, target, data in self.graph.edges(data=True):
-            edges.append(
-                GraphEdge(
-                    source=source,
-                    target=target,
-                    relation=EdgeRelation(data.get("relation", "related_to")),
-                    properties={k: v for k, v in data.items() if k != "relation"},
-                )
+            yield GraphEdge(
+                source=source,
+                target=target,
+                relation=EdgeRelation(data.get("relation", "related_to")),
+                properties={k: v for k, v in data.items() if k != "relation"},
             )
 
-        return KnowledgeGraph(nodes=nodes, edges=edges)
+    def export_to_model(self) -> KnowledgeGraph:
+        """Export graph to KnowledgeGraph model."""
+        return KnowledgeGraph(
+            nodes=list(self.iter_node_models()),
+            edges=list(self.iter_edge_models()),
+            metadata=dict(self.metadata),
+        )
 
     def load_from_model(self, knowledge_graph: KnowledgeGraph) -> None:
         """Load graph from KnowledgeGraph model."""
-        self.graph.clear()
-        for node in knowledge_graph.nodes:
-            self.add_node(node)
-        for edge in knowledge_graph.edges:
-            self.add_edge(edge)
+        self.clear()
+        self.metadata = dict(knowledge_graph.metadata)
+        self.add_nodes(knowledge_graph.nodes)
+        self.add_edges(knowledge_graph.edges)
         logger.info(
             f"Loaded graph with {len(knowledge_graph.nodes)} nodes and {len(knowledge_graph.edges)} edges"
         )
 
-    def save_to_file(self, file_path: Path) -> None:
-        """Save graph to JSON file."""
-        kg = self.export_to_model()
-        data = {
-            "nodes": [n.model_dump() for n in kg.nodes],
-            "edges": [e.model_dump() for e in kg.edges],
-            "metadata": kg.metadata,
-        }
+    def save_to_file(self, file_path: Path, trusted: bool = False) -> None:
+        """Save graph to JSON, a binary snapshot (``.dgraph``) or a graph database (``.sqlite``).
+
+        Args:
+            file_path: Graph file to write
+            trusted: Write JSON straight from the graph's attributes without
+                building models, compactly (no indentation)
+
+        The graph's fingerprint is saved in the file metadata of JSON and
+        binary files, and in its own table of a graph database. Saving a
+        database-backed graph to its own database does nothing, since every
+        mutation is already stored there.
+        """
+        if is_sqlite_path(file_path):
+            if self.database is not None and _same_file(self.database, file_path):
+                return
+            write_sqlite_graph(self.graph, file_path, self.metadata, self.fingerprint)
+            logger.info(f"Saved graph database to {file_path}")
+            return
+
+        metadata = {**self.metadata, FINGERPRINT_KEY: self.fingerprint}
+        if is_binary_path(file_path):
+            write_binary_graph(self.graph, file_path, metadata)
+            logger.info(f"Saved binary graph snapshot to {file_path}")
+            return
+
+        if trusted:
+            nodes: Iterable[Dict[str, Any]] = (
+                {
+                    "id": node_id,
+                    "label": data.get("label", node_id),
+                    "type": data.get("type", "concept"),
+                    "properties": {k: v for k, v in data.items() if k not in ["label", "type"]},
+                }
+                for node_id, data in self.graph.nodes(data=True)
+            )
+            edges: Iterable[Dict[str, Any]] = (
+                {
+                    "source": source,
+                    "target": target,
+                    "relation": data.get("relation", "related_to"),
+                    "properties": {k: v for k, v in data.items() if k != "relation"},
+                }
+                for source, target, data in self.graph.edges(data=True)
+            )
+        else:
+            nodes = (n.model_dump() for n in self.iter_node_models())
+            edges = (e.model_dump() for e in self.iter_edge_models())
+
         file_path.parent.mkdir(parents=True, exist_ok=True)
         with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+            write_graph_json(f, nodes, edges, metadata, compact=trusted)
         logger.info(f"Saved graph to {file_path}")
 
-    def load_from_file(self, file_path: Path) -> None:
-        """Load graph from JSON file."""
+    def load_from_file(
+        self, file_path: Path, replay_log: bool = True, trusted: bool = False
+    ) -> None:
+        """Load graph from a JSON file, or a binary snapshot for the ``.dgraph`` extension.
+
+        A ``.sqlite`` graph database is opened in place rather than loaded: the
+        engine's graph becomes the database, so later mutations are written to
+        it. Loading a JSON or binary file into a database-backed engine
+        replaces the database's contents.
+
+        Args:
+            file_path: Graph file to load
+            replay_log: Apply pending records of the file's mutation log
+            trusted: Skip model validation of JSON nodes and edges (for files
+                written by ``save_to_file``); only node types and relations are
+                checked, and the fingerprint stored in the file is adopted
+
+        Raises:
+            FileNotFoundError: If a graph database file does not exist
+        """
+        if is_sqlite_path(file_path):
+            self._open_database(file_path)
+        else:
+            self._load_snapshot(file_path, trusted)
+        if replay_log:
+            MutationLog(file_path).replay(self)
+
+    def _open_database(self, file_path: Path) -> None:
+        """Switch the engine's graph to a SQLite graph database file."""
+        self._check_writable()
+        if not file_path.exists():
+            raise FileNotFoundError(f"Graph database not found: {file_path}")
+        self._attach_graph(SQLiteDiGraph(file_path))
+        self._invalidate()
+        logger.info(
+            f"Opened graph database {file_path} ({self.graph.number_of_nodes()} nodes, "
+            f"{self.graph.number_of_edges()} edges)"
+        )
+
+    def _load_snapshot(self, file_path: Path, trusted: bool = False) -> None:
+        """Load a graph file as written by ``save_to_file``.
+
+        The fingerprint stored in the file is adopted for binary snapshots and
+        trusted JSON files. Other JSON files may have been edited by hand or
+        merged, so their fingerprint is dropped and recomputed when needed.
+        """
+        self._read_snapshot(file_path, trusted)
+        fingerprint = self.metadata.pop(FINGERPRINT_KEY, None)
+        if fingerprint is not None and (trusted or is_binary_path(file_path)):
+            self._fingerprint = int(fingerprint, 16)
+            if self._in_database:
+                self.graph.fingerprint = fingerprint
+
+    def _read_snapshot(self, file_path: Path, trusted: bool = False) -> None:
+        """Read the nodes, edges and metadata of a graph file."""
+        if is_binary_path(file_path):
+            node_records, edge_records, metadata = read_binary_graph(file_path)
+            self.clear()
+            self.metadata = metadata
+            self._add_node_records(node_records)
+            self._add_edge_records(edge_records, validate=False)
+            logger.info(
+                f"Loaded binary graph snapshot from {file_path} "
+                f"({len(node_records)} nodes, {len(edge_records)} edges)"
+            )
+            return
+
+        to_node_record = _trusted_node_record if trusted else _node_record
+        to_edge_record = _trusted_edge_record if trusted else _edge_record
+
+        self.clear()
+        num_nodes = num_edges = 0
+        nodes: List[NodeRecord] = []
+        edges: List[EdgeRecord] = []
         with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+            for key, value in iter_graph_json(f):
+                if key == "nodes":
+                    nodes.append(to_node_record(value))
+                    if len(nodes) >= LOAD_BATCH_SIZE:
+                        num_nodes += self._add_node_records(nodes)
+                        nodes = []
+                    continue
+
+                if nodes:
+                    num_nodes += self._add_node_records(nodes)
+                    nodes = []
+
+                if key == "edges":
+                    edges.append(to_edge_record(value))
+                    # Edges are validated against loaded nodes, so files that list
+                    # edges before nodes keep them buffered until the end
+                    if num_nodes and len(edges) >= LOAD_BATCH_SIZE:
+                        num_edges += self._add_edge_records(edges)
+                        edges = []
+                elif key == "metadata":
+                    self.metadata = dict(value)
 
-        nodes = [GraphNode(**n) for n in data.get("nodes", [])]
-        edges = [GraphEdge(**e) for e in data.get("edges", [])]
-        kg = KnowledgeGraph(nodes=nodes, edges=edges, metadata=data.get("metadata", {}))
+        num_nodes += self._add_node_records(nodes)
+        num_edges += self._add_edge_records(edges)
+        logger.info(f"Loaded graph from {file_path} ({num_nodes} nodes, {num_edges} edges)")
 
-        self.load_from_model(kg)
-        logger.info(f"Loaded graph from {file_path}")
+    @staticmethod
+    def open_mapped(file_path: Path) -> MappedGraph:
+        """Open a binary snapshot read-only through a memory mapping.
+
+        Unlike ``load_from_file`` nothing is copied into NetworkX: lookups and
+        traversals read the mapped arrays directly, and processes opening the
+        same file share its pages. Pending mutation log records are not applied.
+        """
+        return MappedGraph(file_path)
+
+    def content_hashes(self) -> ContentHashes:
+        """Get the content hash of every node and edge, computing them if stale."""
+        if self._content_hashes is None:
+            self._content_hashes = content_hashes(self)
+            if self._fingerprint is None:
+                self._fingerprint = graph_digest(self._content_hashes)
+        return self._content_hashes
+
+    @property
+    def fingerprint(self) -> str:
+        """Content fingerprint of the graph's nodes and edges, as 32 hex digits.
+
+        Graphs with the same nodes, edges and attributes have the same
+        fingerprint regardless of insertion order or file format, so it can key
+        caches of anything derived from the graph. It is computed on first use
+        (or taken from the loaded file), then updated by each mutation in time
+        proportional to the elements it touches. Metadata is not included.
+        """
+        if self._fingerprint is None:
+            if self._in_database:
+                # Streamed, so the hashes of a large stored graph are not all
+                # kept, and stored so that reopening the database reuses it
+                self._fingerprint = stream_digest(self)
+                self.graph.fingerprint = format_digest(self._fingerprint)
+            else:
+                self.content_hashes()
+        return format_digest(self._fingerprint)
+
+    def diff(self, other: "GraphEngine") -> Dict[str, Any]:
+        """Compute the delta that turns this graph into ``other``.
+
+        Elements are compared through their content hashes, in O(N + E).
+
+        Args:
+            other: Graph to compare against
+
+        Returns:
+            JSON-serializable delta for ``apply_delta``
+        """
+        return compute_delta(self, other)
+
+    def apply_delta(self, delta: Dict[str, Any], verify: bool = True) -> Dict[str, int]:
+        """Apply a delta computed by ``diff``.
+
+        Removed and changed edges are removed first, then removed nodes.
+        Changed nodes and edges are replaced rather than merged, so properties
+        dropped in the target graph are dropped here too. The delta is applied
+        in place; apply it to a ``copy()`` (or a ``GraphStore`` write) to keep
+        the graph unchanged if it fails.
+
+        Args:
+            delta: Delta as returned by ``diff`` (or loaded from its JSON)
+            verify: Check the graph's digest against the delta's base digest
+                before applying it, and against its target digest afterwards
+
+        Returns:
+            Number of elements applied per delta section
+
+        Raises:
+            ValueError: If the delta is malformed, was computed against a
+                different graph, or did not produce the target graph
+        """
+        self._check_writable()
+        check_delta(delta)
+        if verify and self.fingerprint != delta["base_digest"]:
+            raise ValueError("Delta does not apply to this graph: base digest mismatch")
+
+        for source, target in delta["edges_removed"]:
+            self.remove_edge(source, target)
+        for edge in delta["edges_changed"]:
+            self.remove_edge(edge["source"], edge["target"])
+        for node_id in delta["nodes_removed"]:
+            self.remove_node(node_id)
+        for node in delta["nodes_changed"]:
+            if node["id"] in self.graph:
+                self._update_fingerprint(-1, [node["id"]])
+                self._index_node_type(node["id"], None)
+                self.graph.nodes[node["id"]].clear()
+                self._update_fingerprint(1, [node["id"]])
+
+        self._add_node_records(
+            [_node_record(node) for node in (*delta["nodes_added"], *delta["nodes_changed"])]
+        )
+        self._add_edge_records(
+            [_edge_record(edge) for edge in (*delta["edges_added"], *delta["edges_changed"])]
+        )
+        if delta.get("metadata") is not None:
+            sequence = self.metadata.get(SEQUENCE_KEY)
+            self.metadata = dict(delta["metadata"])
+            if sequence is not None:
+                self.metadata[SEQUENCE_KEY] = sequence
+
+        if verify and self.fingerprint != delta["target_digest"]:
+            raise ValueError("Delta did not produce the target graph: target digest mismatch")
+        counts = delta_size(delta)
+        logger.info(f"Applied graph delta: {counts}")
+        return counts
 
     def get_statistics(self) -> Dict[str, Any]:
-        """Get graph statistics."""
-        return {
+        """Get graph statistics.
+
+        ``fingerprint`` is the content fingerprint when it is already known
+        (taken from the loaded file or database, or maintained since it was
+        first read) and None otherwise, since computing it hashes the whole
+        graph; read the ``fingerprint`` property to compute it.
+        ``is_connected`` comes from the incrementally maintained union-find
+        (built with one scan of the edge table on first use for a
+        database-backed graph).
+        """
+        stats: Dict[str, Any] = {
             "num_nodes": self.graph.number_of_nodes(),
             "num_edges": self.graph.number_of_edges(),
             "node_types": {
-                node_type.value: len(self.get_nodes_by_type(node_type))
-                for node_type in NodeType
+                node_type.value: self.count_nodes_by_type(node_type) for node_type in NodeType
             },
             "is_directed": self.graph.is_directed(),
-            "is_connected": nx.is_weakly_connected(self.graph) if self.graph.number_of_nodes() > 0 else False,
+            "is_connected": self.is_weakly_connected(),
+            "fingerprint": (
+                format_digest(self._fingerprint) if self._fingerprint is not None else None
+            ),
+        }
+        stats["version"] = self._version
+        stats["traversal_cache"] = {
+            "hits": self._cache_hits,
+            "misses": self._cache_misses,
+            "size": len(self._traversal_cache),
+            "max_size": self._cache_size,
         }
+        return stats
@@ -0,0 +1,180 @@
+"""Streaming reader and writer for the JSON graph file format.
+
+The format is a single object with ``nodes`` and ``edges`` arrays and a
+``metadata`` object. The reader decodes one array element at a time from a
+chunked text stream and the writer emits one element at a time, so neither
+ever holds the whole document in memory. Writer output is byte-identical to
+``json.dump(data, f, indent=2)``, or to ``separators=(",", ":")`` in compact mode.
+"""
+
+import json
+import re
+from typing import IO, Any, Dict, Iterable, Iterator, Tuple
+
+# Characters read from the file per refill
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+# Streamed item: ("nodes" | "edges", element) or (key, whole value) for other keys
+GraphItem = Tuple[str, Any]
+
+
+class _Scanner:
+    """Chunked text buffer with JSON value decoding."""
+
+    def __init__(self, f: IO[str], chunk_size: int) -> None:
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping consumed text. Returns False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it ("" at end of file)."""
+        if self._pos < len(self._buffer) and self._buffer[self._pos] not in " \t\n\r":
+            return self._buffer[self._pos]
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the next non-whitespace character, which must be ``char``."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed graph JSON: expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value, reading more chunks as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A value ending at the buffer edge may continue in the next chunk (numbers)
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array(self) -> Iterator[Any]:
+        """Decode the elements of the JSON array at the current position one by one."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Malformed graph JSON: expected ',' or ']', found {separator!r}")
+
+
+def iter_graph_json(f: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[GraphItem]:
+    """Stream the contents of a JSON graph document.
+
+    Yields ``("nodes", node_dict)`` and ``("edges", edge_dict)`` for each array
+    element, and ``(key, value)`` for every other top-level key (such as
+    ``metadata``), in document order.
+
+    Raises:
+        ValueError: If the document is not a JSON object of the expected shape
+    """
+    scanner = _Scanner(f, chunk_size)
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        return
+
+    while True:
+        key = scanner.value()
+        if not isinstance(key, str):
+            raise ValueError("Malformed graph JSON: expected an object key")
+        scanner.expect(":")
+
+        if key in ("nodes", "edges"):
+            for item in scanner.array():
+                yield key, item
+        else:
+            yield key, scanner.value()
+
+        if scanner.peek() == "}":
+            return
+        scanner.expect(",")
+
+
+def _write_array(f: IO[str], key: str, items: Iterable[Dict[str, Any]]) -> None:
+    """Write ``"key": [...]`` one element at a time in ``indent=2`` layout."""
+    f.write(f"  {json.dumps(key)}: [")
+    empty = True
+    for item in items:
+        f.write("\n    " if empty else ",\n    ")
+        f.write(json.dumps(item, indent=2).replace("\n", "\n    "))
+        empty = False
+    f.write("]" if empty else "\n  ]")
+
+
+def _write_compact_array(f: IO[str], items: Iterable[Dict[str, Any]]) -> None:
+    """Write a JSON array one element at a time without whitespace."""
+    f.write("[")
+    separator = ""
+    for item in items:
+        f.write(separator)
+        f.write(json.dumps(item, separators=(",", ":")))
+        separator = ","
+    f.write("]")
+
+
+def write_graph_json(
+    f: IO[str],
+    nodes: Iterable[Dict[str, Any]],
+    edges: Iterable[Dict[str, Any]],
+    metadata: Dict[str, Any],
+    compact: bool = False,
+) -> None:
+    """Write a JSON graph document, consuming nodes and edges lazily.
+
+    Args:
+        f: Text stream to write to
+        nodes: Node dicts (id, label, type, properties)
+        edges: Edge dicts (source, target, relation, properties)
+        metadata: Graph metadata
+        compact: Omit all indentation and whitespace
+    """
+    if compact:
+        f.write('{"nodes":')
+        _write_compact_array(f, nodes)
+        f.write(',"edges":')
+        _write_compact_array(f, edges)
+        f.write(f',"metadata":{json.dumps(metadata, separators=(",", ":"))}}}')
+        return
+
+    f.write("{\n")
+    _write_array(f, "nodes", nodes)
+    f.write(",\n")
+    _write_array(f, "edges", edges)
+    f.write(',\n  "metadata": ')
+    f.write(json.dumps(metadata, indent=2).replace("\n", "\n  "))
+    f.write("\n}")
@@ -0,0 +1,195 @@
+"""Read-only knowledge graphs served from memory-mapped binary snapshots."""
+
+import json
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, overload
+
+import numpy as np
+from loguru import logger
+
+from mcp_server.core.filters import FilterPlan
+from mcp_server.core.graph_binary import read_arrays
+from mcp_server.core.graph_snapshot import NODE_TYPES, RELATIONS, UNKNOWN_CODE, CompiledGraph
+from mcp_server.models.schemas import GraphNode, NodeType
+
+if TYPE_CHECKING:
+    from mcp_server.core.graph_engine import GraphEngine
+
+
+class StringTable(Sequence):
+    """Lazily decoded view of a string table (offsets + UTF-8 blob)."""
+
+    def __init__(self, offsets: np.ndarray, data: np.ndarray) -> None:
+        """Wrap string table arrays (typically memory-mapped)."""
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        """Number of strings in the table."""
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[str]: ...
+
+    def __getitem__(self, i: Any) -> Any:
+        """Decode the string at index ``i`` (or a list of strings for a slice)."""
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self.raw(i).decode("utf-8")
+
+    def raw(self, i: int) -> bytes:
+        """Get the undecoded UTF-8 bytes of the string at index ``i``."""
+        if i < 0:
+            i += len(self)
+        return self._data[self._offsets[i] : self._offsets[i + 1]].tobytes()
+
+
+class SortedIdIndex(Mapping):
+    """Node id to node index lookup by binary search over ids in sorted order."""
+
+    def __init__(self, ids: StringTable, order: np.ndarray) -> None:
+        """Wrap an id string table and the permutation that sorts it by UTF-8 bytes."""
+        self._ids = ids
+        self._order = order
+
+    def __getitem__(self, node_id: str) -> int:
+        """Find the node index of an id in O(log N) string comparisons."""
+        key = node_id.encode("utf-8")
+        low, high = 0, len(self._order)
+        while low < high:
+            mid = (low + high) // 2
+            if self._ids.raw(int(self._order[mid])) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self._order):
+            i = int(self._order[low])
+            if self._ids.raw(i) == key:
+                return i
+        raise KeyError(node_id)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate node ids in sorted order."""
+        return (self._ids[int(i)] for i in self._order)
+
+    def __len__(self) -> int:
+        """Number of indexed node ids."""
+        return len(self._order)
+
+
+def _remap_codes(
+    codes: np.ndarray, file_vocabulary: List[str], vocabulary: List[str], kind: str
+) -> np.ndarray:
+    """Translate vocabulary codes written by another release into current codes.
+
+    Raises:
+        ValueError: If any code stands for a value this release does not know
+    """
+    if file_vocabulary == vocabulary:
+        return codes
+
+    unknown = [code for code, v in enumerate(file_vocabulary) if v not in vocabulary]
+    used = np.unique(codes[np.isin(codes, unknown)]) if unknown else []
+    if len(used):
+        values = sorted(file_vocabulary[int(code)] for code in used)
+        raise ValueError(f"Snapshot uses unknown {kind} values: {values}")
+
+    lookup = np.asarray(
+        [vocabulary.index(v) if v in vocabulary else UNKNOWN_CODE for v in file_vocabulary],
+        dtype=np.int8,
+    )
+    return lookup[codes]
+
+
+class MappedGraph(CompiledGraph):
+    """Read-only graph backed by a memory-mapped ``.dgraph`` snapshot.
+
+    Id tables and CSR adjacency stay in the mapped file, so several processes
+    opening the same snapshot share one copy through the OS page cache and
+    opening is independent of graph size. Traversal, neighbor, path and node
+    lookups run directly on the mapping; use ``to_engine()`` for a mutable
+    NetworkX-backed copy.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        """Open a binary snapshot read-only.
+
+        Args:
+            file_path: Path to a ``.dgraph`` snapshot (format version 2 or later)
+
+        Raises:
+            ValueError: If the file is not a snapshot, predates CSR arrays or
+                uses node types or relations this release does not know
+        """
+        header, arrays = read_arrays(file_path, mmap=True)
+        if "succ_indptr" not in arrays:
+            raise ValueError(
+                f"Snapshot has no CSR arrays, re-convert it with convert-graph: {file_path}"
+            )
+
+        self.file_path = file_path
+        self.metadata: Dict[str, Any] = header.get("metadata", {})
+
+        ids = StringTable(arrays["node_ids.offsets"], arrays["node_ids.data"])
+        relations = _remap_codes(
+            arrays["edge_relations"], header["relations"], RELATIONS, "relation"
+        )
+        super().__init__(
+            ids=ids,
+            index=SortedIdIndex(ids, arrays["id_order"]),
+            labels=StringTable(arrays["node_labels.offsets"], arrays["node_labels.data"]),
+            types=_remap_codes(
+                arrays["node_types"], header["node_types"], NODE_TYPES, "node type"
+            ),
+            succ=(arrays["succ_indptr"], arrays["edge_targets"], relations),
+            pred=(
+                arrays["pred_indptr"],
+                arrays["pred_indices"],
+                _remap_codes(
+                    arrays["pred_relations"], header["relations"], RELATIONS, "relation"
+                ),
+            ),
+        )
+        self._properties = StringTable(arrays["node_props.offsets"], arrays["node_props.data"])
+        logger.info(f"Opened memory-mapped graph {file_path} ({self.num_nodes} nodes)")
+
+    def __contains__(self, node_id: str) -> bool:
+        """Check whether a node exists."""
+        return node_id in self.index
+
+    def get_node(self, node_id: str) -> Optional[GraphNode]:
+        """Get a node by ID."""
+        i = self.index.get(node_id)
+        if i is None:
+            return None
+
+        properties = self._properties[i]
+        return GraphNode(
+            id=node_id,
+            label=self.labels[i],
+            type=NodeType(NODE_TYPES[int(self.types[i])]),
+            properties=json.loads(properties) if properties else {},
+        )
+
+    def traverse_bfs(  # type: ignore[override]
+        self, start: str, filters: Optional[Dict[str, Any]] = None, max_depth: int = 10
+    ) -> List[str]:
+        """Breadth-first traversal with context-aware filtering.
+
+        Takes the same filter dict as ``GraphEngine.traverse_bfs`` and returns
+        the same visit order as it does on the source graph.
+        """
+        return super().traverse_bfs(start, FilterPlan(filters), max_depth)
+
+    def to_engine(self) -> "GraphEngine":
+        """Load the snapshot into a mutable NetworkX-backed engine."""
+        from mcp_server.core.graph_engine import GraphEngine
+
+        engine = GraphEngine()
+        engine.load_from_file(self.file_path)
+        return engine
+
@@ -0,0 +1,282 @@
+"""Compiled, read-only CSR snapshot of a knowledge graph for fast traversal."""
+
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import networkx as nx
+import numpy as np
+
+from mcp_server.core.filters import FilterPlan
+from mcp_server.core.paths import bidirectional_shortest_path, k_shortest_paths
+from mcp_server.models.schemas import EdgeRelation, NodeType
+
+# Relation and node type vocabularies, in enum order; codes index into these lists
+RELATIONS: List[str] = [relation.value for relation in EdgeRelation]
+NODE_TYPES: List[str] = [node_type.value for node_type in NodeType]
+
+_RELATION_CODES: Dict[str, int] = {value: code for code, value in enumerate(RELATIONS)}
+_NODE_TYPE_CODES: Dict[str, int] = {value: code for code, value in enumerate(NODE_TYPES)}
+
+UNKNOWN_CODE = -1
+APPLIES_TO = _RELATION_CODES[EdgeRelation.APPLIES_TO.value]
+CONDITIONAL_ON = _RELATION_CODES[EdgeRelation.CONDITIONAL_ON.value]
+PROCESS = _NODE_TYPE_CODES[NodeType.PROCESS.value]
+
+
+def relation_code(relation: Optional[str]) -> int:
+    """Map a relation value to its integer code (-1 if unknown)."""
+    return _RELATION_CODES.get(relation, UNKNOWN_CODE) if relation else UNKNOWN_CODE
+
+
+def node_type_code(node_type: Optional[str]) -> int:
+    """Map a node type value to its integer code (-1 if unknown)."""
+    return _NODE_TYPE_CODES.get(node_type, UNKNOWN_CODE) if node_type else UNKNOWN_CODE
+
+
+def build_csr(
+    adjacency: Any, ids: List[str], index: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build CSR arrays (indptr, indices, relation codes) from a NetworkX adjacency view.
+
+    Neighbor order within each row follows the adjacency's insertion order, so
+    traversals over the snapshot visit nodes in the same order as NetworkX.
+    """
+    indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+    indices: List[int] = []
+    relations: List[int] = []
+
+    for i, node_id in enumerate(ids):
+        for neighbor, data in adjacency[node_id].items():
+            indices.append(index[neighbor])
+            relations.append(relation_code(data.get("relation")))
+        indptr[i + 1] = len(indices)
+
+    return (
+        indptr,
+        np.asarray(indices, dtype=np.int32),
+        np.asarray(relations, dtype=np.int8),
+    )
+
+
+class CompiledGraph:
+    """Read-only snapshot of a directed graph with integer ids and CSR adjacency.
+
+    Node ids are mapped to dense integers. Successors and predecessors are stored
+    as CSR arrays with a parallel array of relation codes, which avoids the
+    per-edge attribute dict lookups of the NetworkX dict-of-dicts.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        index: Mapping[str, int],
+        labels: Sequence[str],
+        types: np.ndarray,
+        succ: Tuple[np.ndarray, np.ndarray, np.ndarray],
+        pred: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    ) -> None:
+        """Wrap prebuilt snapshot arrays.
+
+        Args:
+            ids: Node ids by node index
+            index: Node id to node index lookup
+            labels: Node labels by node index
+            types: Node type codes by node index
+            succ: Successor CSR arrays (indptr, indices, relation codes)
+            pred: Predecessor CSR arrays (indptr, indices, relation codes)
+        """
+        self.ids = ids
+        self.index = index
+        self.labels = labels
+        self.types = types
+        self.succ_indptr, self.succ_indices, self.succ_relations = succ
+        self.pred_indptr, self.pred_indices, self.pred_relations = pred
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph) -> "CompiledGraph":
+        """Compile a snapshot of a NetworkX graph (the graph is not modified)."""
+        ids: List[str] = list(graph.nodes)
+        index = {node_id: i for i, node_id in enumerate(ids)}
+        return cls(
+            ids=ids,
+            index=index,
+            labels=[graph.nodes[n].get("label", "") for n in ids],
+            types=np.asarray(
+                [node_type_code(graph.nodes[n].get("type")) for n in ids], dtype=np.int8
+            ),
+            succ=build_csr(graph.succ, ids, index),
+            pred=build_csr(graph.pred, ids, index),
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        """Number of nodes in the snapshot."""
+        return len(self.ids)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of edges in the snapshot."""
+        return int(self.succ_indices.shape[0])
+
+    def successors(self, i: int) -> List[int]:
+        """Get successor indices of node index ``i``."""
+        return self.succ_indices[self.succ_indptr[i] : self.succ_indptr[i + 1]].tolist()
+
+    def predecessors(self, i: int) -> List[int]:
+        """Get predecessor indices of node index ``i``."""
+        return self.pred_indices[self.pred_indptr[i] : self.pred_indptr[i + 1]].tolist()
+
+    def successor_edges(self, i: int) -> List[Tuple[int, int]]:
+        """Get ``(successor index, relation code)`` pairs of node index ``i``."""
+        start, end = self.succ_indptr[i], self.succ_indptr[i + 1]
+        return list(
+            zip(self.succ_indices[start:end].tolist(), self.succ_relations[start:end].tolist())
+        )
+
+    def predecessor_edges(self, i: int) -> List[Tuple[int, int]]:
+        """Get ``(predecessor index, relation code)`` pairs of node index ``i``."""
+        start, end = self.pred_indptr[i], self.pred_indptr[i + 1]
+        return list(
+            zip(self.pred_indices[start:end].tolist(), self.pred_relations[start:end].tolist())
+        )
+
+    def get_neighbors(
+        self, node_id: str, relation: Optional[EdgeRelation] = None, direction: str = "out"
+    ) -> List[str]:
+        """Get neighboring node ids, optionally filtered by relation and direction."""
+        i = self.index.get(node_id)
+        if i is None:
+            return []
+
+        code = relation_code(relation.value) if relation else None
+
+        def select(edges: List[Tuple[int, int]]) -> List[int]:
+            return [n for n, rel in edges if code is None or rel == code]
+
+        if direction == "out":
+            return [self.ids[n] for n in select(self.successor_edges(i))]
+        if direction == "in":
+            return [self.ids[n] for n in select(self.predecessor_edges(i))]
+
+        neighbors = set(select(self.successor_edges(i))) | set(select(self.predecessor_edges(i)))
+        return [self.ids[n] for n in neighbors]
+
+    def _path_adjacency(
+        self, relation: Optional[EdgeRelation]
+    ) -> Tuple[Callable[[int], List[int]], Callable[[int], List[int]]]:
+        """Get successor/predecessor callables, optionally restricted to one relation."""
+        if relation is None:
+            return self.successors, self.predecessors
+
+        code = relation_code(relation.value)
+        return (
+            lambda i: [n for n, rel in self.successor_edges(i) if rel == code],
+            lambda i: [n for n, rel in self.predecessor_edges(i) if rel == code],
+        )
+
+    def find_path(
+        self,
+        start: str,
+        end: str,
+        max_depth: int = 10,
+        relation: Optional[EdgeRelation] = None,
+    ) -> Optional[List[str]]:
+        """Find a shortest path of at most ``max_depth`` edges."""
+        source, target = self.index.get(start), self.index.get(end)
+        if source is None or target is None:
+            return None
+
+        successors, predecessors = self._path_adjacency(relation)
+        path = bidirectional_shortest_path(source, target, successors, predecessors, max_depth)
+        return [self.ids[n] for n in path] if path else None
+
+    def find_paths(
+        self,
+        start: str,
+        end: str,
+        k: int = 3,
+        max_depth: int = 10,
+        relation: Optional[EdgeRelation] = None,
+    ) -> List[List[str]]:
+        """Find the k shortest simple paths of at most ``max_depth`` edges."""
+        source, target = self.index.get(start), self.index.get(end)
+        if source is None or target is None:
+            return []
+
+        successors, predecessors = self._path_adjacency(relation)
+        paths = k_shortest_paths(source, target, successors, predecessors, k, max_depth)
+        return [[self.ids[n] for n in path] for path in paths]
+
+    def traverse_bfs(self, start: str, plan: FilterPlan, max_depth: int = 10) -> List[str]:
+        """Breadth-first traversal with context-aware filtering.
+
+        Mirrors ``GraphEngine.traverse_bfs`` and returns the same visit order.
+        Each level is expanded with one gather over the CSR arrays: the
+        frontier's out-edges are taken in frontier order, and the first
+        included edge into each unseen node adds it to the next level.
+        """
+        source = self.index.get(start)
+        if source is None or max_depth < 0:
+            return []
+
+        seen = np.zeros(self.num_nodes, dtype=bool)
+        seen[source] = True
+        frontier = np.array([source], dtype=np.int64)
+        levels = [frontier]
+        label_matches: Dict[int, bool] = {}
+
+        for _ in range(max_depth):
+            neighbors, relations = self._frontier_successor_edges(frontier)
+            unseen = ~seen[neighbors]
+            neighbors, relations = neighbors[unseen], relations[unseen]
+            if plan.active and neighbors.size:
+                included = [
+                    self._should_include_node(neighbor, relation, plan, label_matches)
+                    for neighbor, relation in zip(neighbors.tolist(), relations.tolist())
+                ]
+                neighbors = neighbors[np.asarray(included, dtype=bool)]
+            if not neighbors.size:
+                break
+
+            # First occurrence of each node, in edge order
+            frontier = np.fromiter(dict.fromkeys(neighbors.tolist()), dtype=np.int64)
+            seen[frontier] = True
+            levels.append(frontier)
+
+        return [self.ids[i] for i in np.concatenate(levels).tolist()]
+
+    def _frontier_successor_edges(self, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the successor and relation code arrays of all frontier nodes' out-edges.
+
+        Edges are ordered by frontier position, then by insertion order.
+        """
+        starts = self.succ_indptr[frontier]
+        counts = self.succ_indptr[frontier + 1] - starts
+        # Position of each edge: its row start plus its rank within the row
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        positions = np.arange(offsets.shape[0]) + offsets
+        return self.succ_indices[positions], self.succ_relations[positions]
+
+    def _label_matches(self, i: int, plan: FilterPlan, cache: Dict[int, bool]) -> bool:
+        """Match a node label against a filter plan, memoized per traversal."""
+        matched = cache.get(i)
+        if matched is None:
+            matched = cache[i] = plan.matches(self.labels[i])
+        return matched
+
+    def _should_include_node(
+        self, i: int, relation: int, plan: FilterPlan, label_matches: Dict[int, bool]
+    ) -> bool:
+        """Determine if a node should be included based on filters."""
+        if not plan.active:
+            return True
+
+        if relation == CONDITIONAL_ON or relation == APPLIES_TO:
+            return self._label_matches(i, plan, label_matches)
+
+        # For process nodes, check their context constraints
+        if self.types[i] == PROCESS:
+            context_nodes = [n for n, rel in self.successor_edges(i) if rel == APPLIES_TO]
+            if context_nodes:
+                return any(self._label_matches(n, plan, label_matches) for n in context_nodes)
+
+        return True
@@ -0,0 +1,345 @@
+"""Multi-version graph store: readers pin snapshots, writers publish new versions."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator as IteratorABC
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from mcp_server.core.graph_engine import GraphEngine
+from mcp_server.core.mutation_log import SEQUENCE_KEY, MutationLog, log_path_for
+from mcp_server.core.sqlite_graph import is_sqlite_path
+
+# Maximum number of graph files whose stores are kept between tool calls
+MAX_SHARED_STORES = 8
+
+# (mtime_ns, size) of a graph file and of the files that change along with it
+FileSignature = Tuple[Optional[Tuple[int, int]], ...]
+
+# Engine methods that mutate the graph, recorded by a write to be replayed
+MUTATING_METHODS = frozenset(
+    {
+        "add_node",
+        "add_edge",
+        "add_nodes",
+        "add_edges",
+        "remove_node",
+        "remove_edge",
+        "clear",
+        "load_from_model",
+        "apply_delta",
+    }
+)
+
+# (method name, positional arguments, keyword arguments, whether it raised)
+RecordedCall = Tuple[str, Tuple[Any, ...], Dict[str, Any], bool]
+
+
+class RecordingEngine:
+    """Wrapper of a draft engine that records the mutating calls made through it.
+
+    Every other attribute is the engine's own. Iterator arguments are
+    materialized first, so that the recorded calls can be replayed.
+    """
+
+    def __init__(self, engine: GraphEngine) -> None:
+        """Wrap an engine with an empty record."""
+        object.__setattr__(self, "engine", engine)
+        object.__setattr__(self, "calls", [])
+
+    def __getattr__(self, name: str) -> Any:
+        """Get an engine attribute, wrapping mutating methods to record their calls."""
+        attribute = getattr(self.engine, name)
+        if name not in MUTATING_METHODS:
+            return attribute
+        return self._recorder(name, attribute)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an engine attribute (such as ``metadata``)."""
+        setattr(self.engine, name, value)
+
+    def _recorder(self, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a mutating method so that each call is recorded."""
+        calls: List[RecordedCall] = self.calls
+
+        def record(*args: Any, **kwargs: Any) -> Any:
+            args = tuple(list(a) if isinstance(a, IteratorABC) else a for a in args)
+            kwargs = {k: list(v) if isinstance(v, IteratorABC) else v for k, v in kwargs.items()}
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                calls.append((name, args, kwargs, True))
+                raise
+            calls.append((name, args, kwargs, False))
+            return result
+
+        return record
+
+
+def replay_calls(engine: GraphEngine, calls: List[RecordedCall]) -> bool:
+    """Apply recorded calls to an engine in the state they were first made in.
+
+    Returns:
+        True if every call behaved as recorded (raising only if it raised)
+    """
+    for name, args, kwargs, raised in calls:
+        try:
+            getattr(engine, name)(*args, **kwargs)
+        except Exception:
+            if not raised:
+                return False
+        else:
+            if raised:
+                return False
+    return True
+
+
+class GraphStore:
+    """Holds the current version of a graph for a long-running server.
+
+    Every published version is a frozen ``GraphEngine``. Readers pin the
+    current version for the duration of a call and never see a half-applied
+    mutation. Writers are serialized among themselves but never wait for
+    readers: a writer mutates a private draft of the current version, which is
+    frozen and published atomically when the write block exits cleanly (and
+    discarded if it raises). Superseded versions are released once their last
+    reader unpins them.
+
+    The draft is normally the previous version, recycled once no reader pins
+    it: the mutating calls of the last write are replayed onto it, so a write
+    costs time in proportion to the elements it touches (twice) rather than
+    to the graph. Only the first write, a write while the previous version is
+    still pinned, and a write after a failed one copy the current version.
+    Drafts must therefore be mutated through the engine's methods, not by
+    editing ``draft.graph`` directly.
+
+    Example:
+        ```python
+        store = GraphStore.open(path)
+        with store.read() as graph:
+            visited = graph.traverse_bfs("Start")
+        with store.write() as draft:
+            draft.add_node(node)
+        ```
+    """
+
+    def __init__(self, engine: Optional[GraphEngine] = None) -> None:
+        """Create a store whose first version is ``engine`` (frozen on entry)."""
+        self._current = engine or GraphEngine()
+        self._current.freeze()
+        self._lock = threading.Lock()  # guards _current and the pin counts
+        self._write_lock = threading.Lock()  # serializes writers
+        # Reader pins and pinned superseded versions, keyed by engine identity
+        self._pins: Dict[int, int] = {}
+        self._retained: Dict[int, GraphEngine] = {}
+        # Superseded version to recycle as the next draft, and the calls that
+        # bring it up to the current version
+        self._spare: Optional[GraphEngine] = None
+        self._spare_calls: List[RecordedCall] = []
+
+    @classmethod
+    def open(cls, file_path: Path) -> "GraphStore":
+        """Create a store from a graph file (including its mutation log)."""
+        engine = GraphEngine()
+        engine.load_from_file(file_path)
+        return cls(engine)
+
+    @property
+    def version(self) -> int:
+        """Version number of the current graph."""
+        return self._current.version
+
+    def current(self) -> GraphEngine:
+        """Get the current version without pinning it.
+
+        Only for reads that cannot overlap a write: a superseded version
+        nobody pins is recycled as a later write's draft. Use ``read`` for
+        anything else.
+        """
+        return self._current
+
+    def retained_versions(self) -> List[int]:
+        """Superseded versions still pinned by readers."""
+        with self._lock:
+            return sorted(engine.version for engine in self._retained.values())
+
+    @contextmanager
+    def read(self) -> Iterator[GraphEngine]:
+        """Pin the current version for the duration of a read."""
+        with self._lock:
+            engine = self._current
+            self._pins[id(engine)] = self._pins.get(id(engine), 0) + 1
+        try:
+            yield engine
+        finally:
+            self._unpin(engine)
+
+    def _unpin(self, engine: GraphEngine) -> None:
+        """Release a reader's pin, dropping superseded versions with no readers."""
+        key = id(engine)
+        with self._lock:
+            self._pins[key] -= 1
+            if self._pins[key] == 0:
+                del self._pins[key]
+                if self._retained.pop(key, None) is not None:
+                    logger.debug(f"Released graph version {engine.version}")
+
+    @contextmanager
+    def write(self) -> Iterator[GraphEngine]:
+        """Mutate a private draft of the current version and publish it on exit.
+
+        Yields:
+            The draft, wrapped to record its mutating calls
+        """
+        with self._write_lock:
+            base = self._current
+            draft = self._take_draft(base)
+            recorder = RecordingEngine(draft)
+            try:
+                yield recorder  # type: ignore[misc]
+            except BaseException:
+                self._keep_unchanged_draft(base, draft, recorder.calls)
+                raise
+
+            if draft.version == base.version:
+                self._keep_unchanged_draft(base, draft, recorder.calls)
+                return
+            draft.freeze()
+            with self._lock:
+                self._current = draft
+                if id(base) in self._pins:
+                    self._retained[id(base)] = base
+            self._spare, self._spare_calls = base, recorder.calls
+            logger.debug(f"Published graph version {draft.version} (was {base.version})")
+
+    def _keep_unchanged_draft(
+        self, base: GraphEngine, draft: GraphEngine, calls: List[RecordedCall]
+    ) -> None:
+        """Keep a draft that was not published as the spare if it still matches ``base``.
+
+        A call that raised may have left part of its change behind without
+        counting as a mutation, so such drafts are dropped.
+        """
+        if draft.version == base.version and not any(raised for *_, raised in calls):
+            self._spare = draft
+
+    def _take_draft(self, base: GraphEngine) -> GraphEngine:
+        """Get a writable engine matching ``base``, recycling the spare version if possible."""
+        spare, calls = self._spare, self._spare_calls
+        self._spare, self._spare_calls = None, []
+        if spare is not None:
+            with self._lock:
+                pinned = id(spare) in self._pins
+            if not pinned:
+                spare.unfreeze()
+                if (
+                    replay_calls(spare, calls)
+                    and spare.version == base.version
+                    and spare.graph.number_of_nodes() == base.graph.number_of_nodes()
+                ):
+                    spare.metadata = dict(base.metadata)
+                    spare.share_derived(base)
+                    return spare
+                logger.warning("Recycled graph version diverged from the current one; copying")
+        return base.copy()
+
+
+def file_signature(file_path: Path) -> FileSignature:
+    """Modification time and size of a graph file, its mutation log and SQLite WAL.
+
+    Missing files (no log yet) are recorded as None.
+    """
+    paths = [file_path, log_path_for(file_path)]
+    if is_sqlite_path(file_path):
+        paths.append(file_path.with_name(file_path.name + "-wal"))
+
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+_shared_stores: "OrderedDict[Path, Tuple[FileSignature, GraphStore]]" = OrderedDict()
+_shared_stores_lock = threading.Lock()
+
+
+def shared_store(file_path: Path) -> GraphStore:
+    """Get the process-wide store of a graph file, shared by all tool calls.
+
+    The loaded graph, with its traversal cache and lazily built indexes, is
+    reused for as long as the file's signature (path, modification time and
+    size of the file and its mutation log) is unchanged; if another process
+    changed the file it is loaded again. The least recently used stores are
+    dropped beyond ``MAX_SHARED_STORES`` files.
+
+    Args:
+        file_path: Graph file (JSON, binary snapshot or SQLite database)
+
+    Returns:
+        Store whose current version is the graph in the file
+    """
+    key = file_path.resolve()
+    with _shared_stores_lock:
+        signature = file_signature(key)
+        entry = _shared_stores.get(key)
+        if entry is not None and entry[0] == signature:
+            _shared_stores.move_to_end(key)
+            return entry[1]
+
+        store = GraphStore.open(key)
+        _remember_store(key, signature, store)
+        logger.debug(f"Loaded shared graph store for {key}")
+        return store
+
+
+def _remember_store(key: Path, signature: FileSignature, store: GraphStore) -> None:
+    """Record a shared store and its file signature, evicting the least recently used."""
+    _shared_stores[key] = (signature, store)
+    _shared_stores.move_to_end(key)
+    while len(_shared_stores) > MAX_SHARED_STORES:
+        _shared_stores.popitem(last=False)
+
+
+@contextmanager
+def shared_write(file_path: Path) -> Iterator[GraphEngine]:
+    """Mutate the shared graph of a file through its store's ``write``.
+
+    Concurrent readers of the shared store keep their version while the
+    mutation is applied to a draft; the new version is published when the
+    block exits cleanly. The block is expected to persist the mutation (e.g.
+    to the mutation log), after which the store is kept for the file's new
+    signature instead of being reloaded, unless another process has logged
+    mutations the new version lacks.
+
+    A SQLite graph database is mutated in place instead, since SQLite already
+    isolates its readers and every mutation is written straight to it; the
+    shared store then reloads it on the next read.
+
+    Args:
+        file_path: Graph file (JSON, binary snapshot or SQLite database)
+
+    Yields:
+        Writable engine holding the file's current graph
+    """
+    key = file_path.resolve()
+    if is_sqlite_path(key):
+        engine = GraphEngine()
+        engine.load_from_file(key)
+        yield engine
+        return
+
+    store = shared_store(key)
+    with store.write() as draft:
+        yield draft
+    with _shared_stores_lock:
+        # If other processes logged mutations the draft lacks, reload on the next read
+        if MutationLog(key).last_sequence() <= draft.metadata.get(SEQUENCE_KEY, 0):
+            _remember_store(key, file_signature(key), store)
@@ -0,0 +1,258 @@
+"""Node lookup by name: exact, case-insensitive, prefix and fuzzy (trigram) matching."""
+
+from bisect import bisect_left
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import networkx as nx
+import numpy as np
+
+# Search modes, in the order "auto" tries them
+SEARCH_MODES = ("exact", "case_insensitive", "prefix", "fuzzy")
+
+# Maximum number of names scanned per prefix search
+PREFIX_SCAN_LIMIT = 10_000
+
+# Maximum number of trigram postings scanned per fuzzy search
+FUZZY_POSTINGS_BUDGET = 200_000
+
+# Minimum trigram similarity (Dice coefficient) of a fuzzy match
+FUZZY_MIN_SIMILARITY = 0.3
+
+# Names per batch while building the trigram postings
+TRIGRAM_BATCH_SIZE = 100_000
+
+# Multiplier of the 32-bit trigram hash (FNV prime)
+_HASH_PRIME = 0x01000193
+
+# Match: (node id, match kind, score in [0, 1])
+LabelMatch = Tuple[str, str, float]
+
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams of a casefolded name, padded so short names and word starts count."""
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _trigram_hash(trigram: str) -> int:
+    """32-bit hash of a trigram, equal to the vectorized hash in ``_trigram_pairs``."""
+    c0, c1, c2 = (ord(c) for c in trigram)
+    return (((c0 * _HASH_PRIME) ^ c1) * _HASH_PRIME ^ c2) & 0xFFFFFFFF
+
+
+def _trigram_pairs(keys: List[str], first_id: int) -> np.ndarray:
+    """``(trigram hash << 32) | name id`` pairs of a batch of names, with repeats."""
+    padded = [f"  {key} " for key in keys]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    chars = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    hashes = ((chars[:-2] * _HASH_PRIME) ^ chars[1:-1]) * _HASH_PRIME ^ chars[2:]
+    name_of = np.repeat(np.arange(len(keys), dtype=np.int64), lengths)[:-2]
+    ends = np.cumsum(lengths)
+    # A trigram belongs to a name if it ends before the name does
+    valid = np.arange(len(hashes)) + 2 < ends[name_of]
+
+    return ((hashes[valid] & 0xFFFFFFFF) << np.uint64(32)) | (
+        name_of[valid] + first_id
+    ).astype(np.uint64)
+
+
+class LabelIndex:
+    """Name index over a graph's node labels and node IDs.
+
+    Exact lookups use the graph and a label dict. The other lookups work on
+    casefolded names (labels, plus IDs that differ from their label) and
+    build their structures on first use: a dict for case-insensitive
+    matches, a sorted array searched by bisection for prefix matches, and
+    trigram posting lists in CSR arrays for fuzzy matches. Fuzzy search
+    scans the rarest query trigrams first, within a postings budget, and
+    ranks the names sharing the most trigrams by their exact trigram
+    similarity.
+
+    The index reads the graph lazily, so it must be dropped once nodes are
+    added, changed or removed.
+    """
+
+    def __init__(self, graph: nx.DiGraph) -> None:
+        """Index the labels of a graph's nodes."""
+        self._graph = graph
+        self.labels: Dict[str, List[str]] = {}
+        for node_id, label in graph.nodes(data="label"):
+            if label is not None:
+                self.labels.setdefault(label, []).append(node_id)
+
+        self._folded: Optional[Dict[str, List[str]]] = None
+        self._keys: Optional[List[str]] = None
+        self._postings: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def rebind(self, graph: nx.DiGraph) -> "LabelIndex":
+        """Get an index over ``graph``, which must have the same nodes and labels.
+
+        The structures built so far are shared rather than rebuilt.
+        """
+        index = LabelIndex.__new__(LabelIndex)
+        index._graph = graph
+        index.labels = self.labels
+        index._folded = self._folded
+        index._keys = self._keys
+        index._postings = self._postings
+        return index
+
+    def folded(self) -> Dict[str, List[str]]:
+        """Node IDs per casefolded name."""
+        if self._folded is None:
+            folded: Dict[str, List[str]] = {}
+            for node_id, label in self._graph.nodes(data="label"):
+                key = None
+                if isinstance(label, str):
+                    key = label.casefold()
+                    folded.setdefault(key, []).append(node_id)
+                if isinstance(node_id, str) and node_id.casefold() != key:
+                    folded.setdefault(node_id.casefold(), []).append(node_id)
+            self._folded = folded
+        return self._folded
+
+    def keys(self) -> List[str]:
+        """Sorted casefolded names."""
+        if self._keys is None:
+            self._keys = sorted(self.folded())
+        return self._keys
+
+    def postings(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Trigram posting lists over ``keys()``.
+
+        Returns:
+            ``(hashes, indptr, names)``: sorted distinct trigram hashes, and
+            for hash ``hashes[i]`` the positions in ``keys()`` of the names
+            containing it, ``names[indptr[i]:indptr[i + 1]]``
+        """
+        if self._postings is None:
+            keys = self.keys()
+            batches = [
+                _trigram_pairs(keys[start : start + TRIGRAM_BATCH_SIZE], start)
+                for start in range(0, len(keys), TRIGRAM_BATCH_SIZE)
+            ]
+            pairs = np.concatenate(batches) if batches else np.zeros(0, np.uint64)
+            pairs.sort()
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+            hashes = (pairs >> np.uint64(32)).astype(np.uint32)
+            names = (pairs & np.uint64(0xFFFFFFFF)).astype(np.int32)
+            starts = np.flatnonzero(np.concatenate(([True], hashes[1:] != hashes[:-1])))
+            indptr = np.append(starts, len(hashes)).astype(np.int64)
+            self._postings = (hashes[starts], indptr, names)
+        return self._postings
+
+    def exact(self, text: str) -> List[LabelMatch]:
+        """Nodes whose ID or label equals ``text``."""
+        ids = dict.fromkeys([text] if text in self._graph else [])
+        ids.update(dict.fromkeys(self.labels.get(text, ())))
+        return [(node_id, "exact", 1.0) for node_id in ids]
+
+    def case_insensitive(self, text: str) -> List[LabelMatch]:
+        """Nodes whose label or ID equals ``text`` ignoring case."""
+        ids = self.folded().get(text.casefold(), ())
+        return [(node_id, "case_insensitive", 1.0) for node_id in ids]
+
+    def prefix(self, text: str, limit: int) -> List[LabelMatch]:
+        """Nodes whose label or ID starts with ``text`` ignoring case.
+
+        Shortest names come first, among the first ``PREFIX_SCAN_LIMIT`` names
+        with the prefix in sorted order.
+        """
+        prefix = text.casefold()
+        keys, folded = self.keys(), self.folded()
+        start = bisect_left(keys, prefix)
+        matches: List[Tuple[int, str]] = []
+        for position in range(start, min(start + PREFIX_SCAN_LIMIT, len(keys))):
+            key = keys[position]
+            if not key.startswith(prefix):
+                break
+            matches.append((len(key), key))
+        matches.sort()
+
+        results: List[LabelMatch] = []
+        for length, key in matches:
+            score = round(len(prefix) / length, 4) if length else 1.0
+            results.extend((node_id, "prefix", score) for node_id in folded[key])
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def fuzzy(self, text: str, limit: int) -> List[LabelMatch]:
+        """Nodes whose label or ID is most similar to ``text`` by trigram overlap."""
+        query = _trigrams(text.casefold())
+        hashes, indptr, names = self.postings()
+        keys, folded = self.keys(), self.folded()
+
+        lists: List[np.ndarray] = []
+        for code in {_trigram_hash(trigram) for trigram in query}:
+            i = int(np.searchsorted(hashes, code))
+            if i < len(hashes) and hashes[i] == code:
+                lists.append(names[indptr[i] : indptr[i + 1]])
+        lists.sort(key=len)
+
+        scanned: List[np.ndarray] = []
+        budget = FUZZY_POSTINGS_BUDGET
+        for positions in lists:
+            if len(positions) > budget and scanned:
+                break
+            scanned.append(positions)
+            budget -= len(positions)
+        if not scanned:
+            return []
+
+        candidates, shared = np.unique(np.concatenate(scanned), return_counts=True)
+        if len(candidates) > limit * 20:
+            top = np.argpartition(-shared, limit * 20)[: limit * 20]
+            candidates = candidates[top]
+
+        scored: List[Tuple[float, str]] = []
+        for position in candidates.tolist():
+            key = keys[position]
+            trigrams = _trigrams(key)
+            score = 2 * len(query & trigrams) / (len(query) + len(trigrams))
+            if score >= FUZZY_MIN_SIMILARITY:
+                scored.append((score, key))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        results: List[LabelMatch] = []
+        for score, key in scored:
+            results.extend((node_id, "fuzzy", round(score, 4)) for node_id in folded[key])
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def search(self, text: str, mode: str = "auto", limit: int = 10) -> List[LabelMatch]:
+        """Find nodes by name.
+
+        Args:
+            text: Label, ID or partial name to look up
+            mode: One of ``SEARCH_MODES``, or "auto" to try them in order. Auto
+                stops at an exact or case-insensitive hit; otherwise it merges
+                prefix and fuzzy matches, prefix matches first
+            limit: Maximum number of matches
+
+        Returns:
+            ``(node id, match kind, score)`` tuples, best first
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in SEARCH_MODES and mode != "auto":
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        results: Dict[str, LabelMatch] = {}
+        for current in SEARCH_MODES if mode == "auto" else (mode,):
+            if current == "exact":
+                matches = self.exact(text)
+            elif current == "case_insensitive":
+                matches = self.case_insensitive(text)
+            elif current == "prefix":
+                matches = self.prefix(text, limit)
+            else:
+                matches = self.fuzzy(text, limit)
+            for match in matches:
+                results.setdefault(match[0], match)
+            if len(results) >= limit or (results and current == "case_insensitive"):
+                break
+        return list(results.values())[:limit]
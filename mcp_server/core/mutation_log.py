@@ -0,0 +1,263 @@
+"""Append-only mutation log (write-ahead log) for knowledge graph files.
+
+Each graph file may have a sibling ``<name>.log`` of JSON lines, one mutation
+record per line. Records carry increasing sequence numbers, and the graph
+snapshot remembers the last sequence it contains in its ``log_sequence``
+metadata entry. Loading a graph replays the records newer than the snapshot,
+so a crash between writing a compacted snapshot and removing the log never
+applies a mutation twice. A torn last line (a crash mid-append) is ignored
+and trimmed before the next append.
+
+Appends and compactions hold an exclusive lock on a sibling ``<name>.log.lock``
+file, so writers in several processes never reuse a sequence number.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within the process
+    fcntl = None  # type: ignore[assignment]
+
+from loguru import logger
+
+from mcp_server.models.schemas import GraphEdge, GraphNode
+
+if TYPE_CHECKING:
+    from mcp_server.core.graph_engine import GraphEngine
+
+LOG_SUFFIX = ".log"
+LOCK_SUFFIX = ".lock"
+SEQUENCE_KEY = "log_sequence"
+
+# Serializes writers where file locks are not available
+_process_lock = threading.Lock()
+
+# Default log size in bytes above which the log is folded into a new snapshot
+COMPACTION_THRESHOLD = 1024 * 1024
+
+
+def log_path_for(graph_path: Path) -> Path:
+    """Get the mutation log path that belongs to a graph file."""
+    return graph_path.with_name(graph_path.name + LOG_SUFFIX)
+
+
+def apply_mutation(engine: "GraphEngine", record: Dict[str, Any]) -> None:
+    """Apply one mutation record to an engine.
+
+    Raises:
+        ValueError: If the record has an unknown operation
+    """
+    operation = record["op"]
+    if operation == "add_node":
+        engine.add_node(GraphNode(**record["node"]))
+    elif operation == "remove_node":
+        engine.remove_node(record["node_id"])
+    elif operation == "add_edge":
+        engine.add_edge(GraphEdge(**record["edge"]))
+    elif operation == "remove_edge":
+        engine.remove_edge(record["source"], record["target"])
+    elif operation == "add_nodes":
+        engine.add_nodes(GraphNode(**n) for n in record["nodes"])
+    elif operation == "add_edges":
+        engine.add_edges(GraphEdge(**e) for e in record["edges"])
+    else:
+        raise ValueError(f"Unknown mutation log operation: {operation}")
+
+
+class MutationLog:
+    """Write-ahead log of mutations applied on top of a graph snapshot file."""
+
+    def __init__(self, graph_path: Path, compaction_threshold: int = COMPACTION_THRESHOLD) -> None:
+        """Attach to the log of a graph file (the log is created on first append).
+
+        Args:
+            graph_path: Graph snapshot file (JSON, binary or SQLite database)
+            compaction_threshold: Log size in bytes that triggers compaction
+                (0 compacts after every append)
+        """
+        self.graph_path = graph_path
+        self.path = log_path_for(graph_path)
+        self.compaction_threshold = compaction_threshold
+
+    def size(self) -> int:
+        """Current log size in bytes (0 if there is no log)."""
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Read all complete records, ignoring a torn last line.
+
+        Raises:
+            ValueError: If a record other than the last one is corrupt
+        """
+        if not self.path.exists():
+            return []
+
+        lines = self.path.read_bytes().split(b"\n")
+        # A complete log ends with a newline, so the final piece is empty
+        # unless the last append was interrupted
+        if lines[-1]:
+            logger.warning(f"Ignoring torn record at the end of {self.path}")
+
+        records = []
+        for number, line in enumerate(lines[:-1], start=1):
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Corrupt mutation log record {number} in {self.path}") from e
+        return records
+
+    def last_sequence(self) -> int:
+        """Sequence number of the last complete record (0 if the log is empty).
+
+        Only the end of the log is read.
+        """
+        if not self.path.exists():
+            return 0
+
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            chunk = 4096
+            while True:
+                start = max(0, size - chunk)
+                f.seek(start)
+                data = f.read(size - start)
+                end = data.rfind(b"\n")
+                if end >= 0:
+                    begin = data.rfind(b"\n", 0, end) + 1
+                    if begin > 0 or start == 0:
+                        return json.loads(data[begin:end])["seq"]
+                elif start == 0:
+                    return 0
+                chunk *= 2
+
+    def replay(self, engine: "GraphEngine") -> int:
+        """Apply the records newer than the engine's snapshot.
+
+        Returns:
+            Number of records applied
+
+        Raises:
+            ValueError: If sequence numbers repeat or decrease along the log
+        """
+        applied = 0
+        sequence = engine.metadata.get(SEQUENCE_KEY, 0)
+        previous = 0
+        for number, record in enumerate(self.read(), start=1):
+            if record["seq"] <= previous:
+                raise ValueError(
+                    f"Mutation log record {number} in {self.path} has sequence "
+                    f"{record['seq']} after {previous}"
+                )
+            previous = record["seq"]
+            if record["seq"] <= sequence:
+                continue
+            apply_mutation(engine, record)
+            sequence = record["seq"]
+            applied += 1
+
+        if applied:
+            engine.metadata[SEQUENCE_KEY] = sequence
+            logger.info(f"Replayed {applied} mutations from {self.path}")
+        return applied
+
+    def append(self, engine: "GraphEngine", record: Dict[str, Any]) -> None:
+        """Durably append a mutation that has already been applied to the engine.
+
+        The engine must have been loaded from this log's graph file (with the
+        log replayed). The record's sequence number follows the last one in
+        the log, read under the log lock. Compacts the log once it outgrows
+        the threshold, unless other writers have appended records the engine
+        has not seen (which the engine's snapshot would lose). Nothing is
+        logged if the graph file is the engine's own database, which has
+        already stored the mutation.
+        """
+        if self._is_database_of(engine):
+            return
+
+        with self.lock():
+            known = engine.metadata.get(SEQUENCE_KEY, 0)
+            last = max(known, self.last_sequence())
+            sequence = last + 1
+            line = json.dumps({"seq": sequence, **record}, separators=(",", ":")) + "\n"
+
+            with open(self.path, "a+b") as f:
+                self._trim_torn_tail(f)
+                f.write(line.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+            if last > known:
+                logger.warning(
+                    f"{self.path} has {last - known} records from other writers that the "
+                    f"graph has not applied; not compacting"
+                )
+                return
+            engine.metadata[SEQUENCE_KEY] = sequence
+            if self.size() >= self.compaction_threshold:
+                self._compact(engine)
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold the log's exclusive lock, shared with writers in other processes."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if fcntl is None:
+            with _process_lock:
+                yield
+            return
+
+        lock_path = self.path.with_name(self.path.name + LOCK_SUFFIX)
+        with open(lock_path, "a+b") as f:
+            # Released when the file is closed
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            yield
+
+    def _is_database_of(self, engine: "GraphEngine") -> bool:
+        """Check whether the graph file is the database the engine stores its graph in."""
+        database = engine.database
+        return database is not None and database.resolve() == self.graph_path.resolve()
+
+    def _trim_torn_tail(self, f: Any) -> None:
+        """Cut an interrupted last record so the next append starts on a fresh line."""
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        f.seek(0)
+        f.truncate(f.read().rfind(b"\n") + 1)
+        f.seek(0, os.SEEK_END)
+
+    def compact(self, engine: "GraphEngine") -> None:
+        """Fold the log into a new snapshot of the engine and remove it.
+
+        The snapshot is written to a temporary file and atomically renamed over
+        the graph file before the log is removed. Records appended by other
+        writers since the engine was loaded are applied to it first. If the
+        graph file is the engine's own database, which already holds every
+        mutation, only the log is removed.
+        """
+        with self.lock():
+            if not self._is_database_of(engine):
+                self.replay(engine)
+            self._compact(engine)
+
+    def _compact(self, engine: "GraphEngine") -> None:
+        """Compact the log while holding its lock."""
+        if self._is_database_of(engine):
+            self.path.unlink(missing_ok=True)
+            return
+
+        temp_path = self.graph_path.with_name(
+            f"{self.graph_path.stem}.compacting{self.graph_path.suffix}"
+        )
+        engine.save_to_file(temp_path)
+        os.replace(temp_path, self.graph_path)
+        self.path.unlink(missing_ok=True)
+        logger.info(f"Compacted mutation log into {self.graph_path}")
@@ -0,0 +1,254 @@
+"""Context-aware graph partitioning and multi-process filtered traversal."""
+
+import multiprocessing
+from collections import deque
+from multiprocessing.connection import Connection
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+from loguru import logger
+
+from mcp_server.core.filters import FilterPlan, filter_signature
+from mcp_server.models.schemas import EdgeRelation, NodeType
+
+# Node types that anchor a shard: each one pulls in the nodes closest to it
+SEED_TYPES = frozenset({NodeType.CONTEXT.value, NodeType.REGULATION.value})
+
+_CONTEXT_RELATIONS = frozenset({EdgeRelation.CONDITIONAL_ON.value, EdgeRelation.APPLIES_TO.value})
+
+# Per-node data needed for filter decisions: (label, labels of applies_to contexts
+# for process nodes that have any, else None)
+NodeProfile = Tuple[str, Optional[Tuple[str, ...]]]
+
+
+class GraphPartition:
+    """Assignment of graph nodes to shards, with the edges cut between shards."""
+
+    def __init__(self, shards: List[List[str]], cut_edges: List[Tuple[str, str]]) -> None:
+        """Wrap a partition.
+
+        Args:
+            shards: Node ids of each shard
+            cut_edges: ``(source, target)`` edges whose endpoints lie in different shards
+        """
+        self.shards = shards
+        self.cut_edges = cut_edges
+        self.shard_of: Dict[str, int] = {
+            node_id: shard for shard, nodes in enumerate(shards) for node_id in nodes
+        }
+
+    @property
+    def num_shards(self) -> int:
+        """Number of shards."""
+        return len(self.shards)
+
+
+def partition_graph(graph: nx.DiGraph, num_shards: int) -> GraphPartition:
+    """Split a graph into shards along context and connected-component boundaries.
+
+    Each weakly connected component is divided into regions, one per context
+    or regulation node, by a multi-source BFS that ignores edge direction.
+    Every node joins the region of its nearest seed, and components without
+    seeds form a single region. Regions are then packed into ``num_shards``
+    shards, largest first into the least loaded shard.
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be at least 1, got {num_shards}")
+
+    regions: List[List[str]] = []
+    for component in nx.weakly_connected_components(graph):
+        seeds = [n for n in component if graph.nodes[n].get("type") in SEED_TYPES]
+        if not seeds:
+            regions.append(list(component))
+            continue
+
+        region_of: Dict[str, int] = {}
+        queue = deque()
+        for seed in seeds:
+            region_of[seed] = len(regions)
+            regions.append([seed])
+            queue.append(seed)
+        while queue:
+            node = queue.popleft()
+            for neighbor in (*graph.succ[node], *graph.pred[node]):
+                if neighbor not in region_of:
+                    region_of[neighbor] = region_of[node]
+                    regions[region_of[node]].append(neighbor)
+                    queue.append(neighbor)
+
+    shards: List[List[str]] = [[] for _ in range(num_shards)]
+    for region in sorted(regions, key=len, reverse=True):
+        min(shards, key=len).extend(region)
+
+    partition = GraphPartition(shards, [])
+    partition.cut_edges = [
+        (u, v) for u, v in graph.edges if partition.shard_of[u] != partition.shard_of[v]
+    ]
+    logger.debug(
+        f"Partitioned {graph.number_of_nodes()} nodes into {num_shards} shards "
+        f"({len(regions)} regions, {len(partition.cut_edges)} cut edges)"
+    )
+    return partition
+
+
+def _node_profile(graph: nx.DiGraph, node_id: str) -> NodeProfile:
+    """Extract the data the traversal filters look at for one node."""
+    data = graph.nodes[node_id]
+    contexts = None
+    if data.get("type") == NodeType.PROCESS.value:
+        labels = tuple(
+            graph.nodes[target].get("label", "")
+            for target, edge in graph.succ[node_id].items()
+            if edge.get("relation") == EdgeRelation.APPLIES_TO.value
+        )
+        contexts = labels or None
+    return data.get("label", ""), contexts
+
+
+def _is_included(profile: NodeProfile, relation: Optional[str], plan: FilterPlan) -> bool:
+    """Same decision as ``GraphEngine._should_include_node``, from a node profile."""
+    if not plan.active:
+        return True
+    label, contexts = profile
+    if relation in _CONTEXT_RELATIONS:
+        return plan.matches(label)
+    if contexts is not None:
+        return any(plan.matches(context) for context in contexts)
+    return True
+
+
+def _shard_worker(
+    conn: Connection,
+    adjacency: Dict[str, List[Tuple[str, Optional[str]]]],
+    profiles: Dict[str, NodeProfile],
+) -> None:
+    """Worker loop: expand frontier nodes of one shard until told to stop.
+
+    Each request is ``(frontier, filters)``, and the reply lists the included
+    successors of every frontier node in adjacency order.
+    """
+    plans: Dict[Tuple[Any, ...], FilterPlan] = {}
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        frontier, filters = request
+        signature = filter_signature(filters)
+        plan = plans.get(signature)
+        if plan is None:
+            plan = plans[signature] = FilterPlan(filters)
+
+        conn.send(
+            [
+                [
+                    neighbor
+                    for neighbor, relation in adjacency[node]
+                    if _is_included(profiles[neighbor], relation, plan)
+                ]
+                for node in frontier
+            ]
+        )
+    conn.close()
+
+
+class ParallelTraverser:
+    """Filtered BFS over a partitioned graph with one worker process per shard.
+
+    Each worker holds the out-edges of its shard's nodes plus the filter
+    profiles of their successors, including those across cut edges. The
+    traversal is level-synchronous: every frontier is sent to the owning
+    shards in parallel, and the coordinator merges the expansions in frontier
+    order. The visit order is therefore identical to a single-process
+    ``GraphEngine.traverse_bfs``.
+
+    The traverser works on a snapshot of the graph taken at construction. Use
+    it as a context manager, or call ``close()``, to stop the workers.
+    """
+
+    def __init__(self, graph: nx.DiGraph, partition: GraphPartition) -> None:
+        """Start one worker process per shard.
+
+        Args:
+            graph: Graph to traverse (not modified)
+            partition: Partition of the graph's nodes
+        """
+        self.partition = partition
+        self._connections: List[Connection] = []
+        self._workers: List[multiprocessing.Process] = []
+
+        for nodes in partition.shards:
+            adjacency = {
+                node: [(v, edge.get("relation")) for v, edge in graph.succ[node].items()]
+                for node in nodes
+            }
+            profiles = {
+                v: _node_profile(graph, v) for targets in adjacency.values() for v, _ in targets
+            }
+            parent_conn, child_conn = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_shard_worker, args=(child_conn, adjacency, profiles), daemon=True
+            )
+            worker.start()
+            child_conn.close()
+            self._connections.append(parent_conn)
+            self._workers.append(worker)
+
+    def traverse_bfs(
+        self, start: str, filters: Optional[Dict[str, Any]] = None, max_depth: int = 10
+    ) -> List[str]:
+        """Breadth-first traversal with context-aware filtering.
+
+        Returns:
+            List of visited node IDs in the same order as ``GraphEngine.traverse_bfs``
+        """
+        if start not in self.partition.shard_of or max_depth < 0:
+            return []
+
+        visited: List[str] = [start]
+        seen = {start}
+        frontier = [start]
+        depth = 0
+
+        while frontier and depth < max_depth:
+            by_shard: Dict[int, List[str]] = {}
+            for node in frontier:
+                by_shard.setdefault(self.partition.shard_of[node], []).append(node)
+            for shard, nodes in by_shard.items():
+                self._connections[shard].send((nodes, filters))
+
+            expansions: Dict[str, List[str]] = {}
+            for shard, nodes in by_shard.items():
+                expansions.update(zip(nodes, self._connections[shard].recv()))
+
+            next_frontier: List[str] = []
+            for node in frontier:
+                for neighbor in expansions[node]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        next_frontier.append(neighbor)
+
+            visited.extend(next_frontier)
+            frontier = next_frontier
+            depth += 1
+
+        return visited
+
+    def close(self) -> None:
+        """Stop the worker processes."""
+        for conn in self._connections:
+            try:
+                conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for worker in self._workers:
+            worker.join(timeout=5)
+        self._connections, self._workers = [], []
+
+    def __enter__(self) -> "ParallelTraverser":
+        """Use the traverser as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the workers on exit."""
+        self.close()
@@ -0,0 +1,214 @@
+"""Depth-bounded path search over adjacency callables."""
+
+import heapq
+from itertools import count
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T", bound=Hashable)
+
+Adjacency = Callable[[T], Iterable[T]]
+
+# Neighbors of a whole frontier at once: frontier nodes -> neighbors per node
+FrontierAdjacency = Callable[[List[T]], Mapping[T, Iterable[T]]]
+
+
+def bidirectional_shortest_path(
+    source: T,
+    target: T,
+    successors: Adjacency,
+    predecessors: Adjacency,
+    max_depth: int,
+) -> Optional[List[T]]:
+    """Find a shortest path of at most ``max_depth`` edges with a bidirectional BFS.
+
+    Frontiers grow level by level from both ends, always expanding the smaller
+    one. The search stops as soon as the combined depth reaches ``max_depth``
+    without the frontiers meeting, instead of exploring the whole graph.
+
+    Args:
+        source: Start node
+        target: End node
+        successors: Callable returning the successors of a node
+        predecessors: Callable returning the predecessors of a node
+        max_depth: Maximum path length in edges
+
+    Returns:
+        List of nodes from source to target, or None if no short enough path exists
+    """
+    return bidirectional_frontier_path(
+        source, target, _per_node(successors), _per_node(predecessors), max_depth
+    )
+
+
+def bidirectional_frontier_path(
+    source: T,
+    target: T,
+    successors: FrontierAdjacency,
+    predecessors: FrontierAdjacency,
+    max_depth: int,
+) -> Optional[List[T]]:
+    """Bidirectional BFS that fetches the neighbors of each frontier in one call.
+
+    Same search as ``bidirectional_shortest_path``, for adjacency stores where
+    one lookup per frontier is much cheaper than one per node (a database).
+
+    Args:
+        source: Start node
+        target: End node
+        successors: Callable returning the successors of each node of a frontier
+            (nodes without successors may be left out)
+        predecessors: Callable returning the predecessors of each node of a frontier
+        max_depth: Maximum path length in edges
+
+    Returns:
+        List of nodes from source to target, or None if no short enough path exists
+    """
+    if source == target:
+        return [source]
+    if max_depth < 1:
+        return None
+
+    forward_parents: Dict[T, Optional[T]] = {source: None}
+    backward_parents: Dict[T, Optional[T]] = {target: None}
+    forward_frontier: List[T] = [source]
+    backward_frontier: List[T] = [target]
+    forward_depth = backward_depth = 0
+
+    while forward_frontier and backward_frontier and forward_depth + backward_depth < max_depth:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, parents, others, neighbors = (
+                forward_frontier, forward_parents, backward_parents, successors
+            )
+        else:
+            frontier, parents, others, neighbors = (
+                backward_frontier, backward_parents, forward_parents, predecessors
+            )
+
+        adjacency = neighbors(frontier)
+        next_frontier: List[T] = []
+        meeting: Optional[T] = None
+        for node in frontier:
+            for neighbor in adjacency.get(node, ()):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = node
+                next_frontier.append(neighbor)
+                if meeting is None and neighbor in others:
+                    meeting = neighbor
+
+        if expand_forward:
+            forward_frontier, forward_depth = next_frontier, forward_depth + 1
+        else:
+            backward_frontier, backward_depth = next_frontier, backward_depth + 1
+
+        if meeting is not None:
+            return _join_paths(meeting, forward_parents, backward_parents)
+
+    return None
+
+
+def _per_node(neighbors: Adjacency) -> FrontierAdjacency:
+    """Turn a per-node adjacency callable into a frontier adjacency callable."""
+    return lambda frontier: {node: neighbors(node) for node in frontier}
+
+
+def _join_paths(
+    meeting: T, forward_parents: Dict[T, Optional[T]], backward_parents: Dict[T, Optional[T]]
+) -> List[T]:
+    """Stitch the forward and backward parent chains through the meeting node."""
+    path: List[T] = []
+    node: Optional[T] = meeting
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+
+    node = backward_parents[meeting]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+    return path
+
+
+def k_shortest_paths(
+    source: T,
+    target: T,
+    successors: Adjacency,
+    predecessors: Adjacency,
+    k: int,
+    max_depth: int,
+) -> List[List[T]]:
+    """Find up to ``k`` shortest simple paths of at most ``max_depth`` edges (Yen's algorithm).
+
+    Each spur search is a depth-bounded bidirectional BFS, so candidate paths
+    longer than ``max_depth`` are never explored.
+
+    Returns:
+        Paths ordered by length (ties in discovery order)
+    """
+    first = bidirectional_shortest_path(source, target, successors, predecessors, max_depth)
+    if first is None or k < 1:
+        return []
+
+    paths: List[List[T]] = [first]
+    seen: Set[Tuple[T, ...]] = {tuple(first)}
+    candidates: List[Tuple[int, int, List[T]]] = []
+    tiebreak = count()
+
+    while len(paths) < k:
+        previous = paths[-1]
+        for j in range(len(previous) - 1):
+            spur, root = previous[j], previous[: j + 1]
+            blocked_nodes = set(root[:-1])
+            blocked_edges = {(p[j], p[j + 1]) for p in paths if p[: j + 1] == root}
+
+            spur_path = bidirectional_shortest_path(
+                spur,
+                target,
+                _restrict(successors, blocked_nodes, blocked_edges, outgoing=True),
+                _restrict(predecessors, blocked_nodes, blocked_edges, outgoing=False),
+                max_depth - j,
+            )
+            if spur_path is None:
+                continue
+
+            candidate = root[:-1] + spur_path
+            key = tuple(candidate)
+            if key not in seen:
+                seen.add(key)
+                heapq.heappush(candidates, (len(candidate), next(tiebreak), candidate))
+
+        if not candidates:
+            break
+        paths.append(heapq.heappop(candidates)[2])
+
+    return paths
+
+
+def _restrict(
+    neighbors: Adjacency, blocked_nodes: Set[T], blocked_edges: Set[Tuple[T, T]], outgoing: bool
+) -> Adjacency:
+    """Wrap an adjacency callable to skip blocked nodes and edges."""
+
+    def restricted(node: T) -> Iterable[T]:
+        for neighbor in neighbors(node):
+            if neighbor in blocked_nodes:
+                continue
+            edge = (node, neighbor) if outgoing else (neighbor, node)
+            if edge in blocked_edges:
+                continue
+            yield neighbor
+
+    return restricted
@@ -0,0 +1,596 @@
+"""Declarative pattern queries over a knowledge graph, with an index-aware planner.
+
+Queries use a small subset of Cypher::
+
+    MATCH (p:process)-[:applies_to]->(c:context {label: "Texas"}),
+          (p)-[:requires]->(s:system)<-[:requires]-(r:process)
+    WHERE r.label CONTAINS "Rule Check"
+    RETURN DISTINCT p, s
+    LIMIT 10
+
+Node patterns are ``(var:type {key: value, ...})``, with the type and
+properties optional. Edge patterns are ``-[:relation]->``, ``<-[:relation]-``
+or ``-[:relation]-`` (either direction); ``|`` separates alternative
+relations, and ``-->`` / ``<--`` / ``--`` match any relation. ``WHERE`` takes
+``AND``-ed comparisons of ``var.property`` with a literal, using ``=``,
+``<>``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``CONTAINS``, ``STARTS WITH``,
+``ENDS WITH`` or ``IN [...]`` (the only one taking a list literal).
+``var.id``, ``var.label`` and ``var.type`` address the node ID and its core
+attributes. Distinct variables may bind the same node.
+"""
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import networkx as nx
+
+from mcp_server.models.schemas import EdgeRelation, NodeType
+
+_TOKEN_RE = re.compile(
+    r"""
+    \s+
+    | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+    | (?P<number>\d+(?:\.\d+)?)
+    | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<symbol><>|<=|>=|!=|->|<-|[()\[\]{}:,.|<>=-])
+    """,
+    re.VERBOSE,
+)
+
+_NODE_TYPE_VALUES = frozenset(node_type.value for node_type in NodeType)
+_RELATION_VALUES = frozenset(relation.value for relation in EdgeRelation)
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "=": lambda a, b: a == b,
+    "<>": lambda a, b: a != b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "CONTAINS": lambda a, b: isinstance(a, str) and b in a,
+    "STARTS WITH": lambda a, b: isinstance(a, str) and a.startswith(b),
+    "ENDS WITH": lambda a, b: isinstance(a, str) and a.endswith(b),
+    "IN": lambda a, b: a in b,
+}
+
+# Token: (kind, text); kind is "string", "number", "name", "symbol" or "end"
+Token = Tuple[str, str]
+
+
+class Predicate:
+    """Comparison of one variable's property with a literal."""
+
+    __slots__ = ("var", "prop", "op", "value")
+
+    def __init__(self, var: str, prop: str, op: str, value: Any) -> None:
+        """Create a predicate ``var.prop op value``."""
+        self.var = var
+        self.prop = prop
+        self.op = op
+        self.value = value
+
+    def evaluate(self, graph: nx.DiGraph, node_id: str) -> bool:
+        """Evaluate the predicate for a node; missing properties never match."""
+        actual = node_id if self.prop == "id" else graph.nodes[node_id].get(self.prop)
+        if actual is None:
+            return False
+        try:
+            return _COMPARISONS[self.op](actual, self.value)
+        except TypeError:
+            return False
+
+    def __repr__(self) -> str:
+        """Render the predicate in query syntax."""
+        return f"{self.var}.{self.prop} {self.op} {self.value!r}"
+
+
+class PatternEdge:
+    """Edge pattern between two variables.
+
+    Edges written right to left are stored left to right, so ``source`` is
+    always the tail of a directed edge.
+    """
+
+    __slots__ = ("source", "target", "relations", "directed")
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        relations: Optional[Tuple[str, ...]],
+        directed: bool,
+    ) -> None:
+        """Create an edge pattern (``relations`` None matches any relation)."""
+        self.source = source
+        self.target = target
+        self.relations = relations
+        self.directed = directed
+
+    def __repr__(self) -> str:
+        """Render the edge pattern in query syntax."""
+        relation = f"[:{'|'.join(self.relations)}]" if self.relations else ""
+        return f"({self.source})-{relation}-{'>' if self.directed else ''}({self.target})"
+
+
+class PatternQuery:
+    """Parsed pattern query."""
+
+    def __init__(self) -> None:
+        """Create an empty query."""
+        self.variables: List[str] = []
+        self.node_types: Dict[str, str] = {}
+        self.edges: List[PatternEdge] = []
+        self.predicates: List[Predicate] = []
+        self.returns: List[str] = []
+        self.distinct = False
+        self.limit: Optional[int] = None
+
+
+class _Parser:
+    """Recursive-descent parser for pattern queries."""
+
+    def __init__(self, text: str) -> None:
+        """Tokenize the query text."""
+        self.tokens: List[Token] = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN_RE.match(text, position)
+            if match is None:
+                raise ValueError(f"Unexpected character {text[position]!r} at {position}")
+            if match.lastgroup is not None:
+                self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        self.tokens.append(("end", ""))
+        self.index = 0
+        self.query = PatternQuery()
+        self._anonymous = 0
+
+    def peek(self) -> Token:
+        """Get the next token without consuming it."""
+        return self.tokens[self.index]
+
+    def next(self) -> Token:
+        """Consume the next token."""
+        token = self.tokens[self.index]
+        if token[0] != "end":
+            self.index += 1
+        return token
+
+    def accept(self, symbol: str) -> bool:
+        """Consume the next token if it is the given symbol."""
+        if self.peek() == ("symbol", symbol):
+            self.index += 1
+            return True
+        return False
+
+    def accept_keyword(self, keyword: str) -> bool:
+        """Consume the next token if it is the given keyword (case-insensitive)."""
+        kind, text = self.peek()
+        if kind == "name" and text.upper() == keyword:
+            self.index += 1
+            return True
+        return False
+
+    def expect(self, symbol: str) -> None:
+        """Consume the given symbol or fail."""
+        if not self.accept(symbol):
+            raise ValueError(f"Expected {symbol!r}, got {self.peek()[1] or 'end of query'!r}")
+
+    def expect_keyword(self, keyword: str) -> None:
+        """Consume the given keyword or fail."""
+        if not self.accept_keyword(keyword):
+            raise ValueError(f"Expected {keyword}, got {self.peek()[1] or 'end of query'!r}")
+
+    def name(self) -> str:
+        """Consume an identifier."""
+        kind, text = self.next()
+        if kind != "name":
+            raise ValueError(f"Expected a name, got {text or 'end of query'!r}")
+        return text
+
+    def literal(self) -> Any:
+        """Consume a string, number, boolean, null or list literal."""
+        if self.accept("["):
+            items: List[Any] = []
+            if not self.accept("]"):
+                items.append(self.literal())
+                while self.accept(","):
+                    items.append(self.literal())
+                self.expect("]")
+            return items
+
+        negative = self.accept("-")
+        kind, text = self.next()
+        if kind == "number":
+            value = float(text) if "." in text else int(text)
+            return -value if negative else value
+        if negative:
+            raise ValueError(f"Expected a number after '-', got {text!r}")
+        if kind == "string":
+            return re.sub(r"\\(.)", r"\1", text[1:-1])
+        if kind == "name" and text.upper() in ("TRUE", "FALSE"):
+            return text.upper() == "TRUE"
+        if kind == "name" and text.upper() == "NULL":
+            return None
+        raise ValueError(f"Expected a literal, got {text or 'end of query'!r}")
+
+    def parse(self) -> PatternQuery:
+        """Parse a whole query."""
+        self.expect_keyword("MATCH")
+        self.path()
+        while self.accept(","):
+            self.path()
+
+        if self.accept_keyword("WHERE"):
+            self.comparison()
+            while self.accept_keyword("AND"):
+                self.comparison()
+
+        query = self.query
+        if self.accept_keyword("RETURN"):
+            query.distinct = self.accept_keyword("DISTINCT")
+            query.returns.append(self.variable_reference())
+            while self.accept(","):
+                query.returns.append(self.variable_reference())
+        else:
+            query.returns = [v for v in query.variables if not v.startswith("_")]
+
+        if self.accept_keyword("LIMIT"):
+            kind, text = self.next()
+            if kind != "number" or not text.isdigit():
+                raise ValueError(f"LIMIT takes a non-negative integer, got {text!r}")
+            query.limit = int(text)
+
+        if self.peek()[0] != "end":
+            raise ValueError(f"Unexpected {self.peek()[1]!r} after the end of the query")
+        return query
+
+    def variable_reference(self) -> str:
+        """Consume the name of a variable bound in the MATCH clause."""
+        var = self.name()
+        if var not in self.query.variables:
+            raise ValueError(f"Unknown variable: {var}")
+        return var
+
+    def path(self) -> None:
+        """Parse a chain of node patterns joined by edge patterns."""
+        left = self.node()
+        while self.peek() in (("symbol", "-"), ("symbol", "<-")):
+            incoming = self.next()[1] == "<-"
+            relations = self.relations()
+            outgoing = self.accept("->")
+            if not outgoing:
+                self.expect("-")
+            if incoming and outgoing:
+                raise ValueError("An edge pattern cannot point both ways")
+            right = self.node()
+            if incoming:
+                edge = PatternEdge(right, left, relations, directed=True)
+            else:
+                edge = PatternEdge(left, right, relations, directed=outgoing)
+            self.query.edges.append(edge)
+            left = right
+
+    def relations(self) -> Optional[Tuple[str, ...]]:
+        """Parse the optional ``[:relation|...]`` part of an edge pattern."""
+        if not self.accept("["):
+            return None
+        relations: List[str] = []
+        if self.accept(":"):
+            relations.append(self.name())
+            while self.accept("|"):
+                relations.append(self.name())
+        self.expect("]")
+        for relation in relations:
+            if relation not in _RELATION_VALUES:
+                raise ValueError(f"Unknown relation: {relation}")
+        return tuple(relations) or None
+
+    def node(self) -> str:
+        """Parse a node pattern and return its variable."""
+        self.expect("(")
+        if self.peek()[0] == "name":
+            var = self.name()
+        else:
+            var = f"_{self._anonymous}"
+            self._anonymous += 1
+        if var not in self.query.variables:
+            self.query.variables.append(var)
+
+        if self.accept(":"):
+            node_type = self.name()
+            if node_type not in _NODE_TYPE_VALUES:
+                raise ValueError(f"Unknown node type: {node_type}")
+            if self.query.node_types.setdefault(var, node_type) != node_type:
+                raise ValueError(f"Conflicting node types for {var}")
+
+        if self.accept("{"):
+            if not self.accept("}"):
+                self.property(var)
+                while self.accept(","):
+                    self.property(var)
+                self.expect("}")
+        self.expect(")")
+        return var
+
+    def property(self, var: str) -> None:
+        """Parse one ``key: value`` entry of a node pattern."""
+        key = self.name()
+        self.expect(":")
+        value = self.literal()
+        if isinstance(value, list):
+            raise ValueError(f"{{{key}: ...}} of ({var}) takes a scalar literal, not a list")
+        self.query.predicates.append(Predicate(var, key, "=", value))
+
+    def comparison(self) -> None:
+        """Parse one ``var.property op literal`` comparison."""
+        var = self.variable_reference()
+        self.expect(".")
+        prop = self.name()
+
+        kind, text = self.next()
+        op = text.upper()
+        if op in ("STARTS", "ENDS"):
+            self.expect_keyword("WITH")
+            op = f"{op} WITH"
+        if op not in _COMPARISONS or kind not in ("symbol", "name"):
+            raise ValueError(f"Unknown comparison operator: {text or 'end of query'!r}")
+
+        value = self.literal()
+        if op == "IN":
+            if not isinstance(value, list):
+                raise ValueError("IN takes a list literal")
+        elif isinstance(value, list):
+            raise ValueError(f"{var}.{prop} {op} takes a scalar literal, not a list")
+        self.query.predicates.append(Predicate(var, prop, op, value))
+
+
+def parse_pattern_query(text: str) -> PatternQuery:
+    """Parse a pattern query.
+
+    Raises:
+        ValueError: If the query is malformed
+    """
+    return _Parser(text).parse()
+
+
+class PatternMatcher:
+    """Plans and executes pattern queries against a graph and its indexes.
+
+    The planner binds one variable at a time. It starts from the variable
+    with the fewest candidates according to the most selective available
+    index: a node ID, the label index, the type index, or the
+    relation-partitioned adjacency of an incident edge pattern. It then
+    repeatedly follows the edge pattern that leads to the most selective
+    unbound variable. Each such step is a hash join of the rows bound so far
+    with the matching edges, building its hash table from whichever side is
+    smaller: the distinct values of the bound variable (probing their
+    adjacency) or the candidates of the new variable (probing their reverse
+    adjacency). Edge patterns between two bound variables become filters.
+    """
+
+    def __init__(
+        self,
+        graph: nx.DiGraph,
+        nodes_by_type: Mapping[str, Mapping[str, None]],
+        out_index: Mapping[EdgeRelation, Mapping[str, Mapping[str, None]]],
+        in_index: Mapping[EdgeRelation, Mapping[str, Mapping[str, None]]],
+        labels: Mapping[str, List[str]],
+    ) -> None:
+        """Wrap a graph and its indexes (none of them are modified).
+
+        Args:
+            graph: Graph to match against
+            nodes_by_type: Node IDs per node type value
+            out_index: Successors per relation and node
+            in_index: Predecessors per relation and node
+            labels: Node IDs per label
+        """
+        self.graph = graph
+        self.nodes_by_type = nodes_by_type
+        self.out_index = out_index
+        self.in_index = in_index
+        self.labels = labels
+
+    def _candidates(self, query: PatternQuery, var: str) -> Tuple[str, Iterable[str], int]:
+        """Pick the most selective index for a variable.
+
+        Returns:
+            ``(index description, candidate node IDs, candidate count)``; the
+            candidates are a superset of the variable's matches
+        """
+        options: List[Tuple[str, Iterable[str], int]] = []
+        for predicate in query.predicates:
+            if predicate.var != var or predicate.op != "=":
+                continue
+            if predicate.prop == "id":
+                ids = [predicate.value] if predicate.value in self.graph else []
+                options.append((f"id = {predicate.value!r}", ids, len(ids)))
+            elif predicate.prop == "label":
+                ids = self.labels.get(predicate.value, [])
+                options.append((f"label = {predicate.value!r}", ids, len(ids)))
+
+        node_type = query.node_types.get(var)
+        if node_type is not None:
+            ids = self.nodes_by_type.get(node_type, {})
+            options.append((f"type {node_type}", ids, len(ids)))
+
+        for edge in query.edges:
+            if not edge.directed or not edge.relations or var not in (edge.source, edge.target):
+                continue
+            index = self.out_index if var == edge.source else self.in_index
+            nodes = [index[EdgeRelation(relation)] for relation in edge.relations]
+            count = sum(len(by_node) for by_node in nodes)
+            side = "source" if var == edge.source else "target"
+            options.append(
+                (f"{side} of {'|'.join(edge.relations)}", _union_keys(nodes), count)
+            )
+
+        options.append(("all nodes", self.graph, self.graph.number_of_nodes()))
+        return min(options, key=lambda option: option[2])
+
+    def plan(self, query: PatternQuery) -> List[Tuple[Any, ...]]:
+        """Order the binding steps of a query.
+
+        Returns:
+            Steps ``("scan", var, index)``, ``("join", edge, bound var, new var)``
+            and ``("check", edge)``
+        """
+        estimates = {var: self._candidates(query, var)[2] for var in query.variables}
+        bound: Set[str] = set()
+        pending = list(query.edges)
+        steps: List[Tuple[Any, ...]] = []
+
+        while len(bound) < len(query.variables):
+            frontier = [
+                edge for edge in pending if (edge.source in bound) != (edge.target in bound)
+            ]
+            if frontier:
+                edge = min(
+                    frontier,
+                    key=lambda e: estimates[e.target if e.source in bound else e.source],
+                )
+                known, new = (
+                    (edge.source, edge.target) if edge.source in bound else
+                    (edge.target, edge.source)
+                )
+                steps.append(("join", edge, known, new))
+                pending.remove(edge)
+            else:
+                new = min((v for v in query.variables if v not in bound), key=estimates.get)
+                steps.append(("scan", new, self._candidates(query, new)[0]))
+            bound.add(new)
+
+            for edge in [e for e in pending if e.source in bound and e.target in bound]:
+                steps.append(("check", edge))
+                pending.remove(edge)
+        return steps
+
+    def explain(self, query: PatternQuery) -> List[str]:
+        """Describe the plan of a query, one line per step."""
+        lines = []
+        for step in self.plan(query):
+            if step[0] == "scan":
+                lines.append(f"scan {step[1]} via {step[2]}")
+            elif step[0] == "join":
+                lines.append(f"join {step[3]} from {step[2]} along {step[1]!r}")
+            else:
+                lines.append(f"check {step[1]!r}")
+        return lines
+
+    def match(self, query: PatternQuery) -> List[Dict[str, str]]:
+        """Find all bindings of the query's returned variables.
+
+        Returns:
+            One ``{variable: node ID}`` dict per match
+        """
+        predicates: Dict[str, List[Predicate]] = {}
+        for predicate in query.predicates:
+            predicates.setdefault(predicate.var, []).append(predicate)
+        accepted: Dict[str, Dict[str, bool]] = {var: {} for var in query.variables}
+
+        def accepts(var: str, node_id: str) -> bool:
+            """Check a node against a variable's type and predicates (memoized)."""
+            cache = accepted[var]
+            result = cache.get(node_id)
+            if result is None:
+                node_type = query.node_types.get(var)
+                result = (
+                    node_type is None or self.graph.nodes[node_id].get("type") == node_type
+                ) and all(p.evaluate(self.graph, node_id) for p in predicates.get(var, ()))
+                cache[node_id] = result
+            return result
+
+        position: Dict[str, int] = {}
+        rows: List[Tuple[str, ...]] = [()]
+        for step in self.plan(query):
+            if step[0] == "scan":
+                var = step[1]
+                candidates = [c for c in self._candidates(query, var)[1] if accepts(var, c)]
+                rows = [row + (c,) for row in rows for c in candidates]
+                position[var] = len(position)
+            elif step[0] == "join":
+                _, edge, known, new = step
+                rows = self._hash_join(query, rows, position[known], edge, known, new, accepts)
+                position[new] = len(position)
+            else:
+                edge = step[1]
+                source, target = position[edge.source], position[edge.target]
+                rows = [row for row in rows if self._has_edge(edge, row[source], row[target])]
+            if not rows:
+                return []
+
+        results = [{var: row[position[var]] for var in query.returns} for row in rows]
+        if query.distinct:
+            results = list({tuple(r.values()): r for r in results}.values())
+        if query.limit is not None:
+            results = results[: query.limit]
+        return results
+
+    def _hash_join(
+        self,
+        query: PatternQuery,
+        rows: List[Tuple[str, ...]],
+        column: int,
+        edge: PatternEdge,
+        known: str,
+        new: str,
+        accepts: Callable[[str, str], bool],
+    ) -> List[Tuple[str, ...]]:
+        """Extend every row with the nodes matching ``new`` across ``edge``."""
+        bound_values = {row[column] for row in rows}
+        _, candidates, count = self._candidates(query, new)
+        forward = known == edge.source
+
+        table: Dict[str, List[str]] = {}
+        if count < len(bound_values):
+            # Build from the new variable's candidates, probing back towards known
+            for candidate in candidates:
+                if not accepts(new, candidate):
+                    continue
+                for value in self._neighbors(edge, candidate, not forward):
+                    if value in bound_values:
+                        table.setdefault(value, []).append(candidate)
+        else:
+            for value in bound_values:
+                matches = [n for n in self._neighbors(edge, value, forward) if accepts(new, n)]
+                if matches:
+                    table[value] = matches
+
+        return [row + (match,) for row in rows for match in table.get(row[column], ())]
+
+    def _neighbors(self, edge: PatternEdge, node_id: str, forward: bool) -> List[str]:
+        """Nodes across an edge pattern from ``node_id`` (from its source if ``forward``)."""
+        directions = (forward, not forward) if not edge.directed else (forward,)
+        neighbors: Dict[str, None] = {}
+        for outgoing in directions:
+            if edge.relations is None:
+                adjacency = self.graph.succ if outgoing else self.graph.pred
+                neighbors.update(dict.fromkeys(adjacency[node_id]))
+                continue
+            index = self.out_index if outgoing else self.in_index
+            for relation in edge.relations:
+                neighbors.update(index[EdgeRelation(relation)].get(node_id, {}))
+        return list(neighbors)
+
+    def _has_edge(self, edge: PatternEdge, source: str, target: str) -> bool:
+        """Check whether two bound nodes satisfy an edge pattern."""
+        pairs = [(source, target)] if edge.directed else [(source, target), (target, source)]
+        for u, v in pairs:
+            data = self.graph.succ[u].get(v)
+            if data is not None and (
+                edge.relations is None or data.get("relation") in edge.relations
+            ):
+                return True
+        return False
+
+
+def _union_keys(mappings: List[Mapping[str, Any]]) -> Iterable[str]:
+    """Keys of one or more mappings, without duplicates."""
+    if len(mappings) == 1:
+        return mappings[0]
+    keys: Dict[str, None] = {}
+    for mapping in mappings:
+        keys.update(dict.fromkeys(mapping))
+    return keys
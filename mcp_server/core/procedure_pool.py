@@ -0,0 +1,122 @@
+"""Process-pool execution of bulk procedure generation jobs."""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from mcp_server.core.graph_engine import GraphEngine
+
+# Procedure job: (start node, filters)
+ProcedureJob = Tuple[str, Optional[Dict[str, Any]]]
+
+# Job result: (job index, procedure steps, or None if the start node does not exist)
+ProcedureResult = Tuple[int, Optional[List[Dict[str, Any]]]]
+
+# Default number of jobs sent to a worker per task
+CHUNK_SIZE = 32
+
+# Graph engine of the current worker process, loaded once by the initializer
+_worker_graph: Optional[GraphEngine] = None
+
+
+def _init_worker(graph_path: str) -> None:
+    """Load the graph once per worker process."""
+    global _worker_graph
+    _worker_graph = GraphEngine()
+    _worker_graph.load_from_file(Path(graph_path))
+
+
+def _run_chunk(
+    chunk: List[Tuple[int, str, Optional[Dict[str, Any]]]], max_depth: int
+) -> List[ProcedureResult]:
+    """Generate the procedures of one chunk of jobs in a worker."""
+    graph = _worker_graph
+    if graph is None:
+        raise RuntimeError("Procedure worker used before its graph was loaded")
+
+    results: List[ProcedureResult] = []
+    for index, start_node, filters in chunk:
+        if start_node not in graph.graph:
+            results.append((index, None))
+            continue
+        visited = graph.traverse_bfs(start_node, filters=filters, max_depth=max_depth)
+        results.append((index, graph.procedure_steps(visited)))
+    return results
+
+
+class ProcedurePool:
+    """Generates procedures for many ``(start_node, filters)`` jobs on all cores.
+
+    Every worker process loads the graph file once, through the pool
+    initializer. Jobs are streamed to the workers in chunks, and results are
+    yielded as chunks complete, so memory stays bounded for very long job
+    streams. Each worker's engine caches traversals, so repeated contexts
+    within a worker are only traversed once.
+    """
+
+    def __init__(
+        self,
+        graph_path: Path,
+        max_workers: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """Start the worker processes.
+
+        Args:
+            graph_path: Graph file (JSON or binary snapshot) loaded by every worker
+            max_workers: Number of worker processes (default: CPU count)
+            chunk_size: Number of jobs per worker task
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(str(graph_path),),
+        )
+        logger.info(f"Started procedure pool with {self.max_workers} workers for {graph_path}")
+
+    def generate(
+        self, jobs: Iterable[ProcedureJob], max_depth: int = 10
+    ) -> Iterator[ProcedureResult]:
+        """Generate procedures for a stream of jobs.
+
+        At most two chunks per worker are in flight at a time, so the job
+        iterable is consumed lazily.
+
+        Returns:
+            Iterator of ``(job index, steps)`` in completion order; steps are
+            None when the job's start node does not exist
+        """
+        indexed = ((index, start, filters) for index, (start, filters) in enumerate(jobs))
+        pending: Set[Future] = set()
+        max_pending = 2 * self.max_workers
+
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(indexed, self.chunk_size))
+                if not chunk:
+                    break
+                pending.add(self._executor.submit(_run_chunk, chunk, max_depth))
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self._executor.shutdown(cancel_futures=True)
+
+    def __enter__(self) -> "ProcedurePool":
+        """Use the pool as a context manager."""
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Shut down the workers on exit."""
+        self.close()
@@ -0,0 +1,109 @@
+"""Reachability index over the condensation DAG of a directed graph."""
+
+from typing import Dict, Hashable, List, Set, Tuple
+
+import networkx as nx
+
+
+class ReachabilityIndex:
+    """Answers "is v reachable from u" queries in near-constant time.
+
+    Strongly connected components are collapsed into a condensation DAG. A DFS
+    spanning forest of the DAG gives every component a pre/post-order interval,
+    and v's component is reachable from u's whenever its interval nests inside
+    u's. Reachability through non-tree edges falls back to a DFS that is pruned
+    by the same intervals and by topological levels, and the answers are
+    memoized.
+    """
+
+    def __init__(self, graph: nx.DiGraph) -> None:
+        """Build the index for a graph (the graph is not modified).
+
+        Args:
+            graph: Directed graph to index
+        """
+        condensation = nx.condensation(graph)
+        self._component: Dict[Hashable, int] = condensation.graph["mapping"]
+        self._successors: Dict[int, List[int]] = {
+            c: list(condensation.successors(c)) for c in condensation.nodes
+        }
+
+        # Topological level: a component can only reach components at a higher level
+        self._level: Dict[int, int] = {}
+        for c in nx.topological_sort(condensation):
+            self._level.setdefault(c, 0)
+            for succ in self._successors[c]:
+                self._level[succ] = max(self._level.get(succ, 0), self._level[c] + 1)
+
+        self._pre: Dict[int, int] = {}
+        self._post: Dict[int, int] = {}
+        self._label_intervals(condensation)
+
+        self._memo: Dict[Tuple[int, int], bool] = {}
+
+    def _label_intervals(self, condensation: nx.DiGraph) -> None:
+        """Assign pre/post-order numbers along a DFS spanning forest of the DAG."""
+        clock = 0
+        roots = [c for c in condensation.nodes if condensation.in_degree(c) == 0]
+        for root in roots:
+            if root in self._pre:
+                continue
+            self._pre[root] = clock
+            clock += 1
+            stack = [(root, iter(self._successors[root]))]
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    if child not in self._pre:
+                        self._pre[child] = clock
+                        clock += 1
+                        stack.append((child, iter(self._successors[child])))
+                        break
+                else:
+                    self._post[node] = clock
+                    clock += 1
+                    stack.pop()
+
+    def _tree_reaches(self, source: int, target: int) -> bool:
+        """Check whether target's interval nests inside source's (tree descendant)."""
+        return self._pre[source] <= self._pre[target] and self._post[target] <= self._post[source]
+
+    def __contains__(self, node: Hashable) -> bool:
+        """Check whether a node is covered by the index."""
+        return node in self._component
+
+    def is_reachable(self, source: Hashable, target: Hashable) -> bool:
+        """Check whether target can be reached from source along directed edges.
+
+        A node always reaches itself. Unknown nodes are never reachable.
+        """
+        if source not in self._component or target not in self._component:
+            return False
+
+        u, v = self._component[source], self._component[target]
+        if u == v or self._tree_reaches(u, v):
+            return True
+        if self._level[u] >= self._level[v]:
+            return False
+
+        key = (u, v)
+        cached = self._memo.get(key)
+        if cached is None:
+            cached = self._memo[key] = self._search(u, v)
+        return cached
+
+    def _search(self, source: int, target: int) -> bool:
+        """Pruned DFS over the DAG for reachability through non-tree edges."""
+        target_level = self._level[target]
+        stack = [source]
+        visited: Set[int] = {source}
+        while stack:
+            node = stack.pop()
+            for succ in self._successors[node]:
+                if succ in visited or self._level[succ] > target_level:
+                    continue
+                if succ == target or self._tree_reaches(succ, target):
+                    return True
+                visited.add(succ)
+                stack.append(succ)
+        return False
@@ -0,0 +1,965 @@
+"""SQLite storage for knowledge graphs that do not fit in memory.
+
+``SQLiteDiGraph`` is a NetworkX ``DiGraph`` whose nodes and edges live in
+SQLite tables instead of nested dicts. Its node and adjacency mappings run
+indexed queries on access, so code reading ``graph.nodes[n]``,
+``graph.succ[n]`` or ``graph[u][v].get("relation")`` works unchanged, and only
+the rows being read are held in memory. Mutations are written through at once
+(bulk inserts in one transaction per batch), so the database file is always
+the current graph.
+
+Besides the NetworkX interface, the graph serves the node type and relation
+indexes of ``GraphEngine`` straight from the table indexes, and fetches the
+edges of a whole BFS frontier in one query per batch of nodes.
+
+Tables:
+    nodes(id, label, type, properties): ``type`` is indexed
+    edges(id, source, target, relation, properties): unique on
+        ``(source, target)``, indexed on ``(source, relation)`` and
+        ``(target, relation)``; ``id`` keeps insertion order
+    metadata(key, value): graph metadata as JSON values
+
+String ``label``, ``type`` and ``relation`` attributes get their own columns;
+all other attributes are stored as a JSON object in ``properties``.
+"""
+
+import json
+import os
+import sqlite3
+from abc import abstractmethod
+from collections.abc import ItemsView, Mapping, MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+import networkx as nx
+
+SQLITE_SUFFIX = ".sqlite"
+
+# Nodes or edges written per executemany batch
+INSERT_BATCH_SIZE = 10_000
+
+# Nodes per IN (...) list of a frontier or membership query
+FRONTIER_BATCH_SIZE = 500
+
+# SQLite page cache per connection, in KiB
+CACHE_SIZE_KIB = 64 * 1024
+
+_NODE_COLUMNS = ("label", "type")
+_EDGE_COLUMNS = ("relation",)
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id TEXT PRIMARY KEY,
+    label TEXT,
+    type TEXT,
+    properties TEXT
+);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    relation TEXT,
+    properties TEXT
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fingerprint (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    value TEXT NOT NULL
+);
+"""
+
+# Created after the rows when a new database is written in bulk, which is
+# several times faster than maintaining them row by row
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS nodes_type ON nodes (type);
+CREATE UNIQUE INDEX IF NOT EXISTS edges_source_target ON edges (source, target);
+CREATE INDEX IF NOT EXISTS edges_source_relation ON edges (source, relation);
+CREATE INDEX IF NOT EXISTS edges_target_relation ON edges (target, relation);
+"""
+
+# Row of a node or edge: column values, then the JSON properties
+Row = Tuple[Optional[str], ...]
+
+
+def is_sqlite_path(file_path: Path) -> bool:
+    """Check whether a path selects the SQLite graph database format by extension."""
+    return file_path.suffix == SQLITE_SUFFIX
+
+
+def _encode(attrs: Mapping[str, Any], columns: Sequence[str]) -> Row:
+    """Split attributes into column values (string values only) and JSON properties."""
+    values = [attrs.get(column) for column in columns]
+    values = [value if isinstance(value, str) else None for value in values]
+    properties = {
+        key: value
+        for key, value in attrs.items()
+        if key not in columns or not isinstance(value, str)
+    }
+    encoded = json.dumps(properties, ensure_ascii=False, default=str) if properties else None
+    return (*values, encoded)
+
+
+def _decode(row: Sequence[Optional[str]], columns: Sequence[str]) -> Dict[str, Any]:
+    """Join column values and JSON properties back into an attribute dict."""
+    attrs = {column: value for column, value in zip(columns, row) if value is not None}
+    properties = row[len(columns)]
+    if properties:
+        attrs.update(json.loads(properties))
+    return attrs
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _clear_converted_graphs(graph: nx.DiGraph) -> None:
+    """Drop the backend conversions NetworkX caches on a graph after it changes.
+
+    NetworkX 3.3+ keeps them in ``__networkx_cache__``; older versions have none.
+    """
+    cache = getattr(graph, "__networkx_cache__", None)
+    if cache:
+        cache.clear()
+
+
+class _StoredAttributes(MutableMapping):
+    """Attributes of a stored node or edge; every change is written back at once.
+
+    Subclasses implement ``_write`` for their table.
+    """
+
+    __slots__ = ("_graph", "_key", "_data")
+
+    def __init__(self, graph: "SQLiteDiGraph", key: Tuple[str, ...], data: Dict[str, Any]):
+        """Wrap the decoded attributes of the row with the given key."""
+        self._graph = graph
+        self._key = key
+        self._data = data
+
+    @abstractmethod
+    def _write(self) -> None:
+        """Store the current attributes."""
+
+    def __getitem__(self, key: str) -> Any:
+        """Get an attribute value."""
+        return self._data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get an attribute value, or a default if it is missing."""
+        return self._data.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether an attribute is set."""
+        return key in self._data
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Set an attribute and store the row."""
+        self._data[key] = value
+        self._write()
+
+    def __delitem__(self, key: str) -> None:
+        """Remove an attribute and store the row."""
+        del self._data[key]
+        self._write()
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate attribute names."""
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        """Number of attributes."""
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Remove all attributes with a single write."""
+        self._data.clear()
+        self._write()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Update attributes with a single write."""
+        self._data.update(*args, **kwargs)
+        self._write()
+
+    def copy(self) -> Dict[str, Any]:
+        """Get the attributes as a plain dict."""
+        return dict(self._data)
+
+    def __repr__(self) -> str:
+        """Show the attributes like a dict."""
+        return repr(self._data)
+
+
+class _NodeAttributes(_StoredAttributes):
+    """Attributes of a stored node."""
+
+    __slots__ = ()
+
+    def _write(self) -> None:
+        """Store the node's attributes."""
+        self._graph._drop_fingerprint()
+        self._graph._execute(
+            "UPDATE nodes SET label = ?, type = ?, properties = ? WHERE id = ?",
+            (*_encode(self._data, _NODE_COLUMNS), *self._key),
+        )
+
+
+class _EdgeAttributes(_StoredAttributes):
+    """Attributes of a stored edge."""
+
+    __slots__ = ()
+
+    def _write(self) -> None:
+        """Store the edge's attributes."""
+        self._graph._drop_fingerprint()
+        self._graph._execute(
+            "UPDATE edges SET relation = ?, properties = ? WHERE source = ? AND target = ?",
+            (*_encode(self._data, _EDGE_COLUMNS), *self._key),
+        )
+
+
+class _Items(ItemsView):
+    """Items view that iterates a query instead of looking up every key."""
+
+    def __init__(self, mapping: Mapping, rows: Any) -> None:
+        """Create a view whose iteration calls ``rows()``."""
+        super().__init__(mapping)
+        self._rows = rows
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        """Iterate the items in one query."""
+        return self._rows()
+
+
+class _NodeStore(Mapping):
+    """Node ID -> attributes mapping over the nodes table (``graph._node``)."""
+
+    def __init__(self, graph: "SQLiteDiGraph") -> None:
+        """Bind the mapping to a graph."""
+        self._graph = graph
+
+    def __getitem__(self, node: str) -> _NodeAttributes:
+        """Get a node's attributes."""
+        row = self._graph._fetchone(
+            "SELECT label, type, properties FROM nodes WHERE id = ?", (node,)
+        )
+        if row is None:
+            raise KeyError(node)
+        return _NodeAttributes(self._graph, (node,), _decode(row, _NODE_COLUMNS))
+
+    def __contains__(self, node: object) -> bool:
+        """Check whether a node exists."""
+        return isinstance(node, str) and self._graph._has_node(node)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate node IDs in insertion order."""
+        for (node,) in self._graph._execute("SELECT id FROM nodes ORDER BY rowid"):
+            yield node
+
+    def __len__(self) -> int:
+        """Number of nodes."""
+        return self._graph.number_of_nodes()
+
+    def items(self) -> _Items:
+        """Nodes and their attributes, read in one query."""
+        return _Items(self, self._iter_items)
+
+    def _iter_items(self) -> Iterator[Tuple[str, _NodeAttributes]]:
+        """Iterate nodes and their attributes in insertion order."""
+        graph = self._graph
+        rows = graph._execute("SELECT id, label, type, properties FROM nodes ORDER BY rowid")
+        for node, *row in rows:
+            yield node, _NodeAttributes(graph, (node,), _decode(row, _NODE_COLUMNS))
+
+
+class _Neighbors(Mapping):
+    """Neighbor -> edge attributes mapping of one node, in edge insertion order."""
+
+    def __init__(self, graph: "SQLiteDiGraph", node: str, outgoing: bool) -> None:
+        """Bind the mapping to a node and an edge direction."""
+        self._graph = graph
+        self._node = node
+        self._outgoing = outgoing
+        self._near, self._far = ("source", "target") if outgoing else ("target", "source")
+
+    def _key(self, neighbor: str) -> Tuple[str, str]:
+        """``(source, target)`` of the edge to a neighbor."""
+        return (self._node, neighbor) if self._outgoing else (neighbor, self._node)
+
+    def __getitem__(self, neighbor: str) -> _EdgeAttributes:
+        """Get the attributes of the edge to a neighbor."""
+        key = self._key(neighbor)
+        row = self._graph._fetchone(
+            "SELECT relation, properties FROM edges WHERE source = ? AND target = ?", key
+        )
+        if row is None:
+            raise KeyError(neighbor)
+        return _EdgeAttributes(self._graph, key, _decode(row, _EDGE_COLUMNS))
+
+    def __contains__(self, neighbor: object) -> bool:
+        """Check whether the edge to a neighbor exists."""
+        return isinstance(neighbor, str) and self._graph._has_edge(*self._key(neighbor))
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate neighbors."""
+        rows = self._graph._execute(
+            f"SELECT {self._far} FROM edges WHERE {self._near} = ? ORDER BY id", (self._node,)
+        )
+        for (neighbor,) in rows:
+            yield neighbor
+
+    def __len__(self) -> int:
+        """Number of neighbors."""
+        row = self._graph._fetchone(
+            f"SELECT COUNT(*) FROM edges WHERE {self._near} = ?", (self._node,)
+        )
+        return row[0]
+
+    def items(self) -> _Items:
+        """Neighbors and edge attributes, read in one query."""
+        return _Items(self, self._iter_items)
+
+    def _iter_items(self) -> Iterator[Tuple[str, _EdgeAttributes]]:
+        """Iterate neighbors and edge attributes."""
+        graph = self._graph
+        rows = graph._execute(
+            f"SELECT {self._far}, relation, properties FROM edges "
+            f"WHERE {self._near} = ? ORDER BY id",
+            (self._node,),
+        ).fetchall()
+        for neighbor, *row in rows:
+            yield neighbor, _EdgeAttributes(graph, self._key(neighbor), _decode(row, _EDGE_COLUMNS))
+
+
+class _Adjacency(Mapping):
+    """Node -> neighbors mapping over the edges table (``graph._succ``/``graph._pred``)."""
+
+    def __init__(self, graph: "SQLiteDiGraph", outgoing: bool) -> None:
+        """Bind the mapping to a graph and an edge direction."""
+        self._graph = graph
+        self._outgoing = outgoing
+
+    def __getitem__(self, node: str) -> _Neighbors:
+        """Get a node's neighbors."""
+        if node not in self._graph._node:
+            raise KeyError(node)
+        return _Neighbors(self._graph, node, self._outgoing)
+
+    def __contains__(self, node: object) -> bool:
+        """Check whether a node exists."""
+        return node in self._graph._node
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate node IDs in insertion order."""
+        return iter(self._graph._node)
+
+    def __len__(self) -> int:
+        """Number of nodes."""
+        return self._graph.number_of_nodes()
+
+    def items(self) -> _Items:
+        """Every node with its neighbors, read in one query."""
+        return _Items(self, self._iter_items)
+
+    def _iter_items(self) -> Iterator[Tuple[str, Dict[str, _EdgeAttributes]]]:
+        """Iterate nodes in insertion order with their neighbors in edge order."""
+        graph = self._graph
+        near, far = ("source", "target") if self._outgoing else ("target", "source")
+        rows = graph._execute(
+            f"SELECT n.id, e.{far}, e.relation, e.properties FROM nodes AS n "
+            f"LEFT JOIN edges AS e ON e.{near} = n.id ORDER BY n.rowid, e.id"
+        )
+        current: Optional[str] = None
+        neighbors: Dict[str, _EdgeAttributes] = {}
+        for node, neighbor, *row in rows:
+            if node != current:
+                if current is not None:
+                    yield current, neighbors
+                current, neighbors = node, {}
+            if neighbor is not None:
+                key = (node, neighbor) if self._outgoing else (neighbor, node)
+                neighbors[neighbor] = _EdgeAttributes(graph, key, _decode(row, _EDGE_COLUMNS))
+        if current is not None:
+            yield current, neighbors
+
+
+class _NodesOfType(Mapping):
+    """Node ID -> None mapping of the nodes of one type."""
+
+    def __init__(self, graph: "SQLiteDiGraph", node_type: str) -> None:
+        """Bind the mapping to a node type."""
+        self._graph = graph
+        self._type = node_type
+
+    def __getitem__(self, node: str) -> None:
+        """Map a node of the type to None."""
+        if node not in self:
+            raise KeyError(node)
+        return None
+
+    def __contains__(self, node: object) -> bool:
+        """Check whether a node has the type."""
+        row = self._graph._fetchone("SELECT type FROM nodes WHERE id = ?", (node,))
+        return row is not None and row[0] == self._type
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the nodes of the type in insertion order."""
+        rows = self._graph._execute(
+            "SELECT id FROM nodes WHERE type = ? ORDER BY rowid", (self._type,)
+        )
+        for (node,) in rows:
+            yield node
+
+    def __len__(self) -> int:
+        """Number of nodes of the type."""
+        return self._graph._fetchone(
+            "SELECT COUNT(*) FROM nodes WHERE type = ?", (self._type,)
+        )[0]
+
+
+class TypeIndex(Mapping):
+    """Node type -> node IDs index, read from the ``type`` column index."""
+
+    def __init__(self, graph: "SQLiteDiGraph") -> None:
+        """Bind the index to a graph."""
+        self._graph = graph
+
+    def __getitem__(self, node_type: str) -> _NodesOfType:
+        """Get the nodes of a type."""
+        if self._graph._fetchone("SELECT 1 FROM nodes WHERE type = ?", (node_type,)) is None:
+            raise KeyError(node_type)
+        return _NodesOfType(self._graph, node_type)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the node types in use."""
+        rows = self._graph._execute("SELECT DISTINCT type FROM nodes WHERE type IS NOT NULL")
+        for (node_type,) in rows:
+            yield node_type
+
+    def __len__(self) -> int:
+        """Number of node types in use."""
+        return self._graph._fetchone("SELECT COUNT(DISTINCT type) FROM nodes")[0]
+
+
+class RelationIndex(Mapping):
+    """Node -> neighbors index of one relation and direction, read from the edge indexes."""
+
+    def __init__(self, graph: "SQLiteDiGraph", relation: str, outgoing: bool) -> None:
+        """Bind the index to a relation and an edge direction."""
+        self._graph = graph
+        self._relation = relation
+        self._near, self._far = ("source", "target") if outgoing else ("target", "source")
+
+    def __getitem__(self, node: str) -> Dict[str, None]:
+        """Get a node's neighbors along the relation."""
+        rows = self._graph._execute(
+            f"SELECT {self._far} FROM edges WHERE {self._near} = ? AND relation = ? "
+            "ORDER BY id",
+            (node, self._relation),
+        ).fetchall()
+        if not rows:
+            raise KeyError(node)
+        return {neighbor: None for (neighbor,) in rows}
+
+    def __contains__(self, node: object) -> bool:
+        """Check whether a node has an edge of the relation."""
+        return (
+            self._graph._fetchone(
+                f"SELECT 1 FROM edges WHERE {self._near} = ? AND relation = ?",
+                (node, self._relation),
+            )
+            is not None
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the nodes with edges of the relation, by their first such edge."""
+        rows = self._graph._execute(
+            f"SELECT {self._near} FROM edges WHERE relation = ? "
+            f"GROUP BY {self._near} ORDER BY MIN(id)",
+            (self._relation,),
+        )
+        for (node,) in rows:
+            yield node
+
+    def __len__(self) -> int:
+        """Number of nodes with edges of the relation."""
+        return self._graph._fetchone(
+            f"SELECT COUNT(DISTINCT {self._near}) FROM edges WHERE relation = ?",
+            (self._relation,),
+        )[0]
+
+
+class SQLiteMetadata(MutableMapping):
+    """Graph metadata stored as JSON values in the metadata table."""
+
+    def __init__(self, graph: "SQLiteDiGraph") -> None:
+        """Bind the mapping to a graph."""
+        self._graph = graph
+
+    def __getitem__(self, key: str) -> Any:
+        """Get a metadata value."""
+        row = self._graph._fetchone("SELECT value FROM metadata WHERE key = ?", (key,))
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        """Store a metadata value, keeping the key's position."""
+        self._graph._execute(
+            "INSERT INTO metadata (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value, ensure_ascii=False, default=str)),
+        )
+
+    def __delitem__(self, key: str) -> None:
+        """Remove a metadata value."""
+        if self._graph._execute("DELETE FROM metadata WHERE key = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate metadata keys in insertion order."""
+        for (key,) in self._graph._execute("SELECT key FROM metadata ORDER BY rowid").fetchall():
+            yield key
+
+    def __len__(self) -> int:
+        """Number of metadata entries."""
+        return self._graph._fetchone("SELECT COUNT(*) FROM metadata")[0]
+
+    def clear(self) -> None:
+        """Remove all metadata."""
+        self._graph._execute("DELETE FROM metadata")
+
+    def __repr__(self) -> str:
+        """Show the metadata like a dict."""
+        return repr(dict(self.items()))
+
+
+class SQLiteDiGraph(nx.DiGraph):
+    """Directed graph stored in a SQLite database.
+
+    Node IDs must be strings. Nodes and edges keep NetworkX's insertion
+    order, and adding an existing node or edge updates its attributes, as
+    with ``nx.DiGraph``. Attribute values that JSON cannot represent are
+    stored as strings, and tuples come back as lists.
+
+    The connection is opened on first use, so the empty graphs NetworkX
+    creates for subgraph views cost nothing.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        """Open (or create) a graph database.
+
+        Args:
+            path: Database file, or None for a private temporary database
+                that SQLite deletes when the graph is closed
+        """
+        super().__init__()
+        self.path = Path(path) if path is not None else None
+        self._connection: Optional[sqlite3.Connection] = None
+        self._transaction_depth = 0
+        self._num_nodes: Optional[int] = None
+        self._num_edges: Optional[int] = None
+        self._node = _NodeStore(self)
+        self._adj = _Adjacency(self, outgoing=True)
+        self._pred = _Adjacency(self, outgoing=False)
+        self.metadata = SQLiteMetadata(self)
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Connection to the database, opened and initialized on first use."""
+        if self._connection is None:
+            connection = sqlite3.connect(
+                str(self.path) if self.path is not None else "",
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+            connection.executescript(_TABLES + _INDEXES)
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, sql: str, parameters: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """Run one statement."""
+        return self._db.execute(sql, parameters)
+
+    def _fetchone(self, sql: str, parameters: Sequence[Any] = ()) -> Optional[Tuple[Any, ...]]:
+        """Run a query and get its first row."""
+        return self._db.execute(sql, parameters).fetchone()
+
+    def _has_node(self, node: str) -> bool:
+        """Check whether a node exists."""
+        return self._fetchone("SELECT 1 FROM nodes WHERE id = ?", (node,)) is not None
+
+    def _has_edge(self, source: str, target: str) -> bool:
+        """Check whether an edge exists."""
+        row = self._fetchone(
+            "SELECT 1 FROM edges WHERE source = ? AND target = ?", (source, target)
+        )
+        return row is not None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """Group writes into one transaction (nested blocks join the outer one)."""
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        db = self._db
+        db.execute("BEGIN")
+        self._transaction_depth = 1
+        try:
+            yield
+        except BaseException:
+            db.execute("ROLLBACK")
+            self._num_nodes = self._num_edges = None
+            raise
+        else:
+            db.execute("COMMIT")
+        finally:
+            self._transaction_depth = 0
+
+    def _insert(self, sql: str, rows: List[Sequence[Any]]) -> int:
+        """Insert rows, ignoring existing keys, and count the rows inserted."""
+        db = self._db
+        before = db.total_changes
+        db.executemany(sql, rows)
+        return db.total_changes - before
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Content fingerprint stored with the graph, or None if unknown.
+
+        Every write to the nodes or edges drops it, so a stored value always
+        matches the stored rows; ``GraphEngine`` stores its maintained value
+        again after each mutation.
+        """
+        row = self._fetchone("SELECT value FROM fingerprint")
+        return row[0] if row is not None else None
+
+    @fingerprint.setter
+    def fingerprint(self, value: Optional[str]) -> None:
+        """Store the content fingerprint (None drops it)."""
+        with self._transaction():
+            self._drop_fingerprint()
+            if value is not None:
+                self._execute("INSERT INTO fingerprint (id, value) VALUES (0, ?)", (value,))
+
+    def _drop_fingerprint(self) -> None:
+        """Forget the stored fingerprint before the rows it describes change."""
+        self._execute("DELETE FROM fingerprint")
+
+    def close(self) -> None:
+        """Close the database connection (it is reopened on next use)."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def number_of_nodes(self) -> int:
+        """Number of nodes, counted once and then maintained."""
+        if not isinstance(self._node, _NodeStore):
+            return len(self._node)
+        if self._num_nodes is None:
+            self._num_nodes = self._fetchone("SELECT COUNT(*) FROM nodes")[0]
+        return self._num_nodes
+
+    def __len__(self) -> int:
+        """Number of nodes."""
+        return self.number_of_nodes()
+
+    def number_of_edges(self, u: Optional[str] = None, v: Optional[str] = None) -> int:
+        """Number of edges (counted once and then maintained), or of edges from u to v."""
+        if u is not None or not isinstance(self._adj, _Adjacency):
+            return super().number_of_edges(u, v)
+        if self._num_edges is None:
+            self._num_edges = self._fetchone("SELECT COUNT(*) FROM edges")[0]
+        return self._num_edges
+
+    def add_node(self, node_for_adding: str, **attr: Any) -> None:
+        """Add a node, or update the attributes of an existing one."""
+        self.add_nodes_from([(node_for_adding, attr)])
+
+    def add_nodes_from(self, nodes_for_adding: Iterable[Any], **attr: Any) -> None:
+        """Add nodes given as IDs or ``(id, attributes)`` pairs, in batched inserts."""
+        items = (
+            (item[0], {**attr, **item[1]}) if isinstance(item, tuple) else (item, dict(attr))
+            for item in nodes_for_adding
+        )
+        for batch in _batches(items, INSERT_BATCH_SIZE):
+            merged: Dict[str, Dict[str, Any]] = {}
+            for node, data in batch:
+                if node is None:
+                    raise ValueError("None cannot be a node")
+                merged.setdefault(node, {}).update(data)
+            with self._transaction():
+                self._drop_fingerprint()
+                inserted = self._insert(
+                    "INSERT INTO nodes (id, label, type, properties) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO NOTHING",
+                    [(node, *_encode(data, _NODE_COLUMNS)) for node, data in merged.items()],
+                )
+                if inserted < len(merged):
+                    for node, data in merged.items():
+                        self._node[node].update(data)
+            if self._num_nodes is not None:
+                self._num_nodes += inserted
+        _clear_converted_graphs(self)
+
+    def add_edge(self, u_of_edge: str, v_of_edge: str, **attr: Any) -> None:
+        """Add an edge (and missing endpoints), or update an existing edge."""
+        self.add_edges_from([(u_of_edge, v_of_edge, attr)])
+
+    def add_edges_from(self, ebunch_to_add: Iterable[Tuple[Any, ...]], **attr: Any) -> None:
+        """Add edges given as ``(u, v)`` or ``(u, v, attributes)``, in batched inserts."""
+        for batch in _batches(ebunch_to_add, INSERT_BATCH_SIZE):
+            merged: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for edge in batch:
+                if len(edge) not in (2, 3):
+                    raise nx.NetworkXError(f"Edge tuple {edge} must be a 2-tuple or 3-tuple.")
+                if edge[0] is None or edge[1] is None:
+                    raise ValueError("None cannot be a node")
+                data = merged.setdefault((edge[0], edge[1]), {})
+                data.update(attr)
+                if len(edge) == 3:
+                    data.update(edge[2])
+
+            endpoints = dict.fromkeys(node for pair in merged for node in pair)
+            with self._transaction():
+                self._drop_fingerprint()
+                new_nodes = self._insert(
+                    "INSERT INTO nodes (id) VALUES (?) ON CONFLICT (id) DO NOTHING",
+                    [(node,) for node in endpoints],
+                )
+                inserted = self._insert(
+                    "INSERT INTO edges (source, target, relation, properties) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT (source, target) DO NOTHING",
+                    [(*pair, *_encode(data, _EDGE_COLUMNS)) for pair, data in merged.items()],
+                )
+                if inserted < len(merged):
+                    for (source, target), data in merged.items():
+                        self._succ[source][target].update(data)
+            if self._num_nodes is not None:
+                self._num_nodes += new_nodes
+            if self._num_edges is not None:
+                self._num_edges += inserted
+        _clear_converted_graphs(self)
+
+    def remove_node(self, n: str) -> None:
+        """Remove a node and its edges.
+
+        Raises:
+            NetworkXError: If the node is not in the graph
+        """
+        if n not in self._node:
+            raise nx.NetworkXError(f"The node {n} is not in the digraph.")
+        with self._transaction():
+            self._drop_fingerprint()
+            removed = self._execute(
+                "DELETE FROM edges WHERE source = ? OR target = ?", (n, n)
+            ).rowcount
+            self._execute("DELETE FROM nodes WHERE id = ?", (n,))
+        if self._num_edges is not None:
+            self._num_edges -= removed
+        if self._num_nodes is not None:
+            self._num_nodes -= 1
+        _clear_converted_graphs(self)
+
+    def remove_nodes_from(self, nodes: Iterable[str]) -> None:
+        """Remove nodes and their edges, ignoring nodes not in the graph."""
+        with self._transaction():
+            for node in nodes:
+                if node in self._node:
+                    self.remove_node(node)
+
+    def remove_edge(self, u: str, v: str) -> None:
+        """Remove an edge.
+
+        Raises:
+            NetworkXError: If the edge is not in the graph
+        """
+        with self._transaction():
+            self._drop_fingerprint()
+            cursor = self._execute("DELETE FROM edges WHERE source = ? AND target = ?", (u, v))
+            if cursor.rowcount == 0:
+                raise nx.NetworkXError(f"The edge {u}-{v} not in graph.")
+        if self._num_edges is not None:
+            self._num_edges -= 1
+        _clear_converted_graphs(self)
+
+    def remove_edges_from(self, ebunch: Iterable[Tuple[str, ...]]) -> None:
+        """Remove edges, ignoring edges not in the graph."""
+        with self._transaction():
+            for edge in ebunch:
+                if self._has_edge(edge[0], edge[1]):
+                    self.remove_edge(edge[0], edge[1])
+
+    def clear(self) -> None:
+        """Remove all nodes, edges and graph attributes."""
+        with self._transaction():
+            self._drop_fingerprint()
+            self._execute("DELETE FROM edges")
+            self._execute("DELETE FROM nodes")
+        self._num_nodes = self._num_edges = 0
+        self.graph.clear()
+        _clear_converted_graphs(self)
+
+    def clear_edges(self) -> None:
+        """Remove all edges."""
+        with self._transaction():
+            self._drop_fingerprint()
+            self._execute("DELETE FROM edges")
+        self._num_edges = 0
+        _clear_converted_graphs(self)
+
+    def copy(self, as_view: bool = False) -> nx.DiGraph:
+        """Copy the graph into a private temporary database (or return a view)."""
+        if as_view or not isinstance(self._node, _NodeStore):
+            return super().copy(as_view=as_view)
+        clone = SQLiteDiGraph()
+        self._db.backup(clone._db)
+        clone._num_nodes, clone._num_edges = self._num_nodes, self._num_edges
+        clone.graph.update(self.graph)
+        return clone
+
+    def backup(self, file_path: Path) -> None:
+        """Write a consistent copy of the database to a file."""
+        target = sqlite3.connect(str(file_path))
+        try:
+            self._db.backup(target)
+        finally:
+            target.close()
+
+    def type_index(self) -> TypeIndex:
+        """Node type -> node IDs index over the stored nodes."""
+        return TypeIndex(self)
+
+    def relation_index(self, relation: str, outgoing: bool = True) -> RelationIndex:
+        """Node -> neighbors index of one relation over the stored edges."""
+        return RelationIndex(self, relation, outgoing)
+
+    def relation_edges(self, relation: str) -> Iterator[Tuple[str, str]]:
+        """Iterate the ``(source, target)`` pairs of one relation in insertion order."""
+        rows = self._execute(
+            "SELECT source, target FROM edges WHERE relation = ? ORDER BY id", (relation,)
+        )
+        yield from rows
+
+    def edge_pairs(self) -> Iterator[Tuple[str, str]]:
+        """Iterate the ``(source, target)`` pairs of all edges, without attributes."""
+        yield from self._execute("SELECT source, target FROM edges")
+
+    def existing_nodes(self, nodes: Iterable[str]) -> Set[str]:
+        """Get the given nodes that are in the graph, with one query per batch."""
+        found: Set[str] = set()
+        for batch in _batches(dict.fromkeys(nodes), FRONTIER_BATCH_SIZE):
+            rows = self._execute(
+                f"SELECT id FROM nodes WHERE id IN ({', '.join('?' * len(batch))})", batch
+            )
+            found.update(node for (node,) in rows)
+        return found
+
+    def frontier_edges(
+        self, nodes: Sequence[str], outgoing: bool = True, relation: Optional[str] = None
+    ) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        """Get the edges of many nodes with one query per ``FRONTIER_BATCH_SIZE`` nodes.
+
+        Args:
+            nodes: Nodes whose edges to fetch
+            outgoing: Fetch out-edges (else in-edges)
+            relation: Only fetch edges with this relation
+
+        Returns:
+            ``(neighbor, relation)`` pairs per node, in edge insertion order
+            (nodes without such edges are left out)
+        """
+        near, far = ("source", "target") if outgoing else ("target", "source")
+        condition = " AND relation = ?" if relation is not None else ""
+        edges: Dict[str, List[Tuple[str, Optional[str]]]] = {}
+        for start in range(0, len(nodes), FRONTIER_BATCH_SIZE):
+            batch = list(nodes[start : start + FRONTIER_BATCH_SIZE])
+            parameters = batch + [relation] if relation is not None else batch
+            rows = self._execute(
+                f"SELECT {near}, {far}, relation FROM edges "
+                f"WHERE {near} IN ({', '.join('?' * len(batch))}){condition} ORDER BY id",
+                parameters,
+            )
+            for node, neighbor, edge_relation in rows:
+                edges.setdefault(node, []).append((neighbor, edge_relation))
+        return edges
+
+
+def write_sqlite_graph(
+    graph: nx.DiGraph,
+    file_path: Path,
+    metadata: Mapping[str, Any],
+    fingerprint: Optional[str] = None,
+) -> None:
+    """Write a graph, its metadata and its fingerprint to a new SQLite graph database.
+
+    The database is built in a temporary file that then replaces
+    ``file_path``, so readers never see a partly written graph. A
+    ``SQLiteDiGraph`` is copied page by page; any other graph is inserted in
+    batches, and the indexes are built once all rows are in.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_name(f"{file_path.stem}.writing{file_path.suffix}")
+    temp_path.unlink(missing_ok=True)
+
+    if isinstance(graph, SQLiteDiGraph) and isinstance(graph._node, _NodeStore):
+        graph.backup(temp_path)
+    connection = sqlite3.connect(str(temp_path), isolation_level=None)
+    try:
+        connection.executescript(_TABLES)
+        connection.execute("BEGIN")
+        if not isinstance(graph, SQLiteDiGraph) or not isinstance(graph._node, _NodeStore):
+            nodes = (
+                (node, *_encode(data, _NODE_COLUMNS)) for node, data in graph.nodes(data=True)
+            )
+            for batch in _batches(nodes, INSERT_BATCH_SIZE):
+                connection.executemany(
+                    "INSERT INTO nodes (id, label, type, properties) VALUES (?, ?, ?, ?)", batch
+                )
+            edges = (
+                (source, target, *_encode(data, _EDGE_COLUMNS))
+                for source, target, data in graph.edges(data=True)
+            )
+            for batch in _batches(edges, INSERT_BATCH_SIZE):
+                connection.executemany(
+                    "INSERT INTO edges (source, target, relation, properties) "
+                    "VALUES (?, ?, ?, ?)",
+                    batch,
+                )
+        connection.execute("DELETE FROM metadata")
+        connection.executemany(
+            "INSERT INTO metadata (key, value) VALUES (?, ?)",
+            [
+                (key, json.dumps(value, ensure_ascii=False, default=str))
+                for key, value in metadata.items()
+            ],
+        )
+        connection.execute("DELETE FROM fingerprint")
+        if fingerprint is not None:
+            connection.execute(
+                "INSERT INTO fingerprint (id, value) VALUES (0, ?)", (fingerprint,)
+            )
+        connection.execute("COMMIT")
+        connection.executescript(_INDEXES)
+    finally:
+        connection.close()
+    os.replace(temp_path, file_path)
@@ -1,7 +1,7 @@
 """Template engine for document generation."""
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
 from loguru import logger
@@ -135,17 +135,53 @@ class TemplateEngine:
                 for n in nodes
             ]
 
-        def find_path(start: str, end: str) -> Optional[list]:
-            """Find path between two nodes."""
-            path = graph.find_path(start, end)
+        def find_path(
+            start: str,
+            end: str,
+            max_depth: int = 10,
+            relation: Optional[str] = None,
+            k: Optional[int] = None,
+        ) -> Optional[list]:
+            """Find path between two nodes (or the k shortest paths if k is given)."""
+            from mcp_server.models.schemas import EdgeRelation
+
+            rel = EdgeRelation(relation) if relation else None
+            if k is not None:
+                paths = graph.find_paths(start, end, k=k, max_depth=max_depth, relation=rel)
+                return [[get_node(nid) for nid in path] for path in paths] if paths else None
+
+            path = graph.find_path(start, end, max_depth=max_depth, relation=rel)
             return [get_node(nid) for nid in path] if path else None
 
+        def subgraph(
+            center_ids: Union[str, List[str]],
+            hops: int = 1,
+            relations: Optional[List[str]] = None,
+            node_types: Optional[List[str]] = None,
+        ) -> Dict[str, list]:
+            """Get the nodes and edges within ``hops`` edges of the center nodes."""
+            from mcp_server.models.schemas import EdgeRelation
+
+            view = graph.subgraph(
+                [center_ids] if isinstance(center_ids, str) else center_ids,
+                hops=hops,
+                relations=[EdgeRelation(r) for r in relations] if relations else None,
+                node_types=[NodeType(t) for t in node_types] if node_types else None,
+            )
+            return {
+                "nodes": [{"id": nid, **data} for nid, data in view.nodes(data=True)],
+                "edges": [
+                    {"source": u, "target": v, **data} for u, v, data in view.edges(data=True)
+                ],
+            }
+
         # Add helpers to context
         context["graph"] = {
             "get_node": get_node,
             "get_neighbors": get_neighbors,
             "get_nodes_by_type": get_nodes_by_type,
             "find_path": find_path,
+            "subgraph": subgraph,
             "stats": graph.get_statistics(),
         }
 
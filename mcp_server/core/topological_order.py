@@ -0,0 +1,179 @@
+"""Incrementally maintained topological order of a directed acyclic graph."""
+
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class DynamicTopologicalOrder:
+    """Topological order kept up to date under edge insertions (Pearce-Kelly).
+
+    Every tracked node has an integer position, and each edge ``u -> v`` has
+    ``position(u) < position(v)``. Inserting an edge that agrees with the
+    order costs O(1). Otherwise only the nodes whose positions lie between
+    the two endpoints and that are reachable from them are searched and
+    reassigned. An edge that would close a cycle is rejected before anything
+    changes. Edge and node removals never invalidate the order.
+
+    Nodes are tracked only while they have at least one edge.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty order."""
+        self._succ: Dict[Hashable, Dict[Hashable, None]] = {}
+        self._pred: Dict[Hashable, Dict[Hashable, None]] = {}
+        self._position: Dict[Hashable, int] = {}
+        self._next_position = 0
+
+    def __len__(self) -> int:
+        """Number of tracked nodes."""
+        return len(self._position)
+
+    def __contains__(self, node: Hashable) -> bool:
+        """Whether a node is tracked."""
+        return node in self._position
+
+    def position(self, node: Hashable) -> int:
+        """Position of a tracked node; smaller positions come first."""
+        return self._position[node]
+
+    def has_edge(self, source: Hashable, target: Hashable) -> bool:
+        """Whether an edge is tracked."""
+        return target in self._succ.get(source, ())
+
+    def _track(self, node: Hashable) -> None:
+        """Start tracking a node at the end of the order."""
+        if node not in self._position:
+            self._position[node] = self._next_position
+            self._next_position += 1
+            self._succ[node] = {}
+            self._pred[node] = {}
+
+    def _untrack_if_isolated(self, node: Hashable) -> None:
+        """Stop tracking a node once it has no edges left."""
+        if not self._succ[node] and not self._pred[node]:
+            del self._succ[node], self._pred[node], self._position[node]
+
+    def add_edge(self, source: Hashable, target: Hashable) -> bool:
+        """Insert an edge, reordering the affected region if needed.
+
+        Returns:
+            True if the edge was inserted, False if it was already tracked
+
+        Raises:
+            ValueError: If the edge would create a cycle (the order is unchanged)
+        """
+        if source == target:
+            raise ValueError(f"Edge {source} --> {target} would create a cycle")
+        if self.has_edge(source, target):
+            return False
+
+        self._track(source)
+        self._track(target)
+        lower, upper = self._position[target], self._position[source]
+        if lower < upper:
+            forward = self._search(target, self._succ, lambda p: p < upper, stop=source)
+            if forward is None:
+                self._untrack_if_isolated(source)
+                self._untrack_if_isolated(target)
+                raise ValueError(f"Edge {source} --> {target} would create a cycle")
+            backward = self._search(source, self._pred, lambda p: p > lower)
+            self._reorder(backward or [], forward)
+
+        self._succ[source][target] = None
+        self._pred[target][source] = None
+        return True
+
+    def _search(
+        self,
+        start: Hashable,
+        adjacency: Dict[Hashable, Dict[Hashable, None]],
+        in_region: Callable[[int], bool],
+        stop: Optional[Hashable] = None,
+    ) -> Optional[List[Hashable]]:
+        """Collect the nodes reachable from ``start`` whose positions are in the region.
+
+        Returns:
+            The nodes found, or None if ``stop`` is reachable
+        """
+        found: List[Hashable] = [start]
+        seen: Set[Hashable] = {start}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor in adjacency[node]:
+                if neighbor == stop:
+                    return None
+                if neighbor not in seen and in_region(self._position[neighbor]):
+                    seen.add(neighbor)
+                    found.append(neighbor)
+                    stack.append(neighbor)
+        return found
+
+    def _reorder(self, backward: List[Hashable], forward: List[Hashable]) -> None:
+        """Move the backward set before the forward set, reusing their positions."""
+        position = self._position
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        slots = sorted(position[node] for node in (*backward, *forward))
+        for node, slot in zip((*backward, *forward), slots):
+            position[node] = slot
+
+    def remove_edge(self, source: Hashable, target: Hashable) -> None:
+        """Remove an edge (no-op if it is not tracked)."""
+        if not self.has_edge(source, target):
+            return
+        del self._succ[source][target]
+        del self._pred[target][source]
+        self._untrack_if_isolated(source)
+        self._untrack_if_isolated(target)
+
+    def remove_node(self, node: Hashable) -> None:
+        """Remove a node and its edges (no-op if it is not tracked)."""
+        if node not in self._position:
+            return
+        targets, sources = list(self._succ[node]), list(self._pred[node])
+        for target in targets:
+            self.remove_edge(node, target)
+        for source in sources:
+            self.remove_edge(source, node)
+
+    def clear(self) -> None:
+        """Remove all nodes and edges."""
+        self._succ.clear()
+        self._pred.clear()
+        self._position.clear()
+        self._next_position = 0
+
+    def sort(self, nodes: Sequence[Hashable]) -> List[Hashable]:
+        """Reorder nodes to respect the order, in O(k log k) for k nodes.
+
+        Tracked nodes are sorted by position into the slots that tracked nodes
+        occupy in ``nodes``; untracked nodes keep their places.
+        """
+        position = self._position
+        slots = [i for i, node in enumerate(nodes) if node in position]
+        result = list(nodes)
+        ordered = sorted((result[i] for i in slots), key=position.__getitem__)
+        for i, node in zip(slots, ordered):
+            result[i] = node
+        return result
+
+    def copy(self) -> "DynamicTopologicalOrder":
+        """Get an independent copy of the order."""
+        order = DynamicTopologicalOrder()
+        order._succ = {node: dict(nbrs) for node, nbrs in self._succ.items()}
+        order._pred = {node: dict(nbrs) for node, nbrs in self._pred.items()}
+        order._position = dict(self._position)
+        order._next_position = self._next_position
+        return order
+
+    @classmethod
+    def build(cls, edges: Iterable[Tuple[Hashable, Hashable]]) -> "DynamicTopologicalOrder":
+        """Build an order from an edge list.
+
+        Raises:
+            ValueError: If the edges contain a cycle
+        """
+        order = cls()
+        for source, target in edges:
+            order.add_edge(source, target)
+        return order
@@ -14,6 +14,8 @@ from mcp_server.tools import (
     create_document,
     extract_entities,
     generate_procedure,
+    generate_procedures_batch,
+    generate_procedures_bulk,
     query_graph,
     search_documents,
     transform_document,
@@ -186,6 +188,81 @@ TOOLS = [
             "required": ["graph_file", "start_node"],
         },
     ),
+    Tool(
+        name="generate_procedures_batch",
+        description="Generate procedures for many filter contexts at once, traversing each distinct context only once",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "graph_file": {
+                    "type": "string",
+                    "description": "Path to graph JSON file (e.g., 'mortgage_underwriting.json')",
+                },
+                "start_node": {
+                    "type": "string",
+                    "description": "Starting node ID for traversal",
+                },
+                "contexts": {
+                    "type": "array",
+                    "items": {"type": "object", "additionalProperties": True},
+                    "description": "Context filters, one per procedure (e.g., [{'location': 'Texas'}, {'location': 'Ohio'}])",
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "default": 10,
+                    "description": "Maximum traversal depth",
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["list", "markdown", "json"],
+                    "default": "list",
+                    "description": "Output format",
+                },
+            },
+            "required": ["graph_file", "start_node", "contexts"],
+        },
+    ),
+    Tool(
+        name="generate_procedures_bulk",
+        description="Generate procedures for many start nodes and contexts on a process pool using every core",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "graph_file": {
+                    "type": "string",
+                    "description": "Path to graph file (e.g., 'mortgage_underwriting.dgraph')",
+                },
+                "jobs": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "start_node": {"type": "string"},
+                            "filters": {"type": "object", "additionalProperties": True},
+                        },
+                        "required": ["start_node"],
+                    },
+                    "description": "Procedure jobs, each a start node with optional context filters",
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "default": 10,
+                    "description": "Maximum traversal depth",
+                },
+                "output_format": {
+                    "type": "string",
+                    "enum": ["list", "markdown", "json"],
+                    "default": "list",
+                    "description": "Output format",
+                },
+                "max_workers": {
+                    "type": "integer",
+                    "description": "Number of worker processes (default: CPU count)",
+                },
+            },
+            "required": ["graph_file", "jobs"],
+        },
+    ),
     Tool(
         name="query_graph",
         description="Query a knowledge graph for nodes, relationships, and paths",
@@ -203,31 +280,77 @@ TOOLS = [
                         "get_neighbors",
                         "get_nodes_by_type",
                         "find_path",
+                        "is_reachable",
+                        "get_subgraph",
+                        "match",
+                        "search_nodes",
                         "get_statistics",
                     ],
                     "description": "Query operation to perform",
                 },
                 "node_id": {
                     "type": "string",
-                    "description": "Node ID (for get_node, get_neighbors)",
+                    "description": "Node ID (for get_node, get_neighbors, get_subgraph)",
+                },
+                "node_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Center node IDs (for get_subgraph)",
+                },
+                "hops": {
+                    "type": "integer",
+                    "default": 1,
+                    "description": "Neighborhood radius in edges (for get_subgraph)",
+                },
+                "pattern": {
+                    "type": "string",
+                    "description": (
+                        "Pattern query (for match), e.g. "
+                        "'MATCH (p:process)-[:requires]->(s:system) "
+                        "WHERE p.label CONTAINS \"Rule\" RETURN p, s'"
+                    ),
+                },
+                "text": {
+                    "type": "string",
+                    "description": "Node label or ID to look up (for search_nodes)",
+                },
+                "search_mode": {
+                    "type": "string",
+                    "enum": ["auto", "exact", "case_insensitive", "prefix", "fuzzy"],
+                    "default": "auto",
+                    "description": "Matching mode (for search_nodes)",
+                },
+                "limit": {
+                    "type": "integer",
+                    "default": 10,
+                    "description": "Maximum number of matches (for search_nodes)",
                 },
                 "node_type": {
                     "type": "string",
                     "enum": ["process", "system", "role", "regulation", "context", "document", "entity", "concept"],
-                    "description": "Node type (for get_nodes_by_type)",
+                    "description": "Node type (for get_nodes_by_type, get_subgraph)",
                 },
                 "relation": {
                     "type": "string",
                     "enum": ["requires", "performed_by", "applies_to", "conditional_on", "precedes", "references", "related_to", "contains"],
-                    "description": "Edge relation filter (for get_neighbors)",
+                    "description": "Edge relation filter (for get_neighbors, find_path, get_subgraph)",
                 },
                 "start_node": {
                     "type": "string",
-                    "description": "Start node (for find_path)",
+                    "description": "Start node (for find_path, is_reachable)",
                 },
                 "end_node": {
                     "type": "string",
-                    "description": "End node (for find_path)",
+                    "description": "End node (for find_path, is_reachable)",
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "default": 10,
+                    "description": "Maximum path length in edges (for find_path)",
+                },
+                "k": {
+                    "type": "integer",
+                    "description": "Return the k shortest paths instead of one (for find_path)",
                 },
             },
             "required": ["graph_file", "operation"],
@@ -245,7 +368,7 @@ TOOLS = [
                 },
                 "operation": {
                     "type": "string",
-                    "enum": ["add_node", "remove_node", "add_edge", "remove_edge"],
+                    "enum": ["add_node", "remove_node", "add_edge", "remove_edge", "add_nodes", "add_edges"],
                     "description": "Update operation to perform",
                 },
                 "node": {
@@ -280,6 +403,16 @@ TOOLS = [
                     "type": "string",
                     "description": "Target node for remove_edge",
                 },
+                "nodes": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "List of node data dicts for add_nodes",
+                },
+                "edges": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "List of edge data dicts for add_edges",
+                },
             },
             "required": ["graph_file", "operation"],
         },
@@ -335,6 +468,10 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             result = await search_documents(**arguments)
         elif name == "generate_procedure":
             result = await generate_procedure(**arguments)
+        elif name == "generate_procedures_batch":
+            result = await generate_procedures_batch(**arguments)
+        elif name == "generate_procedures_bulk":
+            result = await generate_procedures_bulk(**arguments)
         elif name == "query_graph":
             result = await query_graph(**arguments)
         elif name == "update_graph":
@@ -5,7 +5,11 @@ from mcp_server.tools.create import create_document
 from mcp_server.tools.extract import extract_entities
 from mcp_server.tools.graph_query import query_graph
 from mcp_server.tools.graph_update import update_graph
-from mcp_server.tools.procedure import generate_procedure
+from mcp_server.tools.procedure import (
+    generate_procedure,
+    generate_procedures_batch,
+    generate_procedures_bulk,
+)
 from mcp_server.tools.search import search_documents
 from mcp_server.tools.transform import transform_document
 
@@ -15,6 +19,8 @@ __all__ = [
     "catalogue_document",
     "search_documents",
     "generate_procedure",
+    "generate_procedures_batch",
+    "generate_procedures_bulk",
     "query_graph",
     "update_graph",
     "extract_entities",
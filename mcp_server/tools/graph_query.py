@@ -6,6 +6,8 @@ from loguru import logger
 
 from mcp_server.config import settings
 from mcp_server.core.graph_engine import GraphEngine
+from mcp_server.core.graph_store import shared_store
+from mcp_server.core.pattern_query import parse_pattern_query
 from mcp_server.models.schemas import EdgeRelation, NodeType
 
 
@@ -17,6 +19,14 @@ async def query_graph(
     relation: Optional[str] = None,
     start_node: Optional[str] = None,
     end_node: Optional[str] = None,
+    max_depth: int = 10,
+    k: Optional[int] = None,
+    node_ids: Optional[List[str]] = None,
+    hops: int = 1,
+    pattern: Optional[str] = None,
+    text: Optional[str] = None,
+    search_mode: str = "auto",
+    limit: int = 10,
 ) -> Dict[str, Any]:
     """Query a knowledge graph for nodes, relationships, and paths.
 
@@ -24,7 +34,15 @@ async def query_graph(
     - get_node: Get node by ID
     - get_neighbors: Get neighboring nodes (requires node_id, optional relation)
     - get_nodes_by_type: Get all nodes of type (requires node_type)
-    - find_path: Find path between nodes (requires start_node, end_node)
+    - find_path: Find path between nodes (requires start_node, end_node, optional
+      relation, max_depth and k for the k shortest paths)
+    - is_reachable: Check whether end_node can be reached from start_node
+    - get_subgraph: Get the k-hop neighborhood of node_ids (or node_id), with
+      optional relation and node_type filters
+    - match: Run a declarative pattern query (requires pattern), e.g.
+      ``MATCH (p:process)-[:requires]->(s:system) WHERE p.label = "X" RETURN s``
+    - search_nodes: Find nodes by label or ID (requires text; search_mode is
+      exact, case_insensitive, prefix, fuzzy or auto)
     - get_statistics: Get graph statistics
 
     Args:
@@ -35,6 +53,14 @@ async def query_graph(
         relation: Edge relation filter (requires, performed_by, applies_to, etc.)
         start_node: Start node for path finding
         end_node: End node for path finding
+        max_depth: Maximum path length in edges for path finding
+        k: Number of shortest paths to return for path finding
+        node_ids: Center node IDs for get_subgraph
+        hops: Neighborhood radius in edges for get_subgraph
+        pattern: Pattern query text for match
+        text: Name to look up for search_nodes
+        search_mode: Matching mode for search_nodes
+        limit: Maximum number of matches for search_nodes
 
     Returns:
         Dict with query results
@@ -59,7 +85,7 @@ async def query_graph(
         ```
     """
     try:
-        # Load graph
+        # Load graph (shared between calls while the file is unchanged)
         graph_path = settings.graphs_dir / graph_file
         if not graph_path.exists():
             return {
@@ -67,125 +93,243 @@ async def query_graph(
                 "error": f"Graph file not found: {graph_file}",
             }
 
-        graph = GraphEngine()
-        graph.load_from_file(graph_path)
+        with shared_store(graph_path).read() as graph:
+            # Execute operation
+            if operation == "get_node":
+                if not node_id:
+                    return {"success": False, "error": "node_id required for get_node"}
 
-        # Execute operation
-        if operation == "get_node":
-            if not node_id:
-                return {"success": False, "error": "node_id required for get_node"}
+                node = graph.get_node(node_id)
+                if not node:
+                    return {"success": False, "error": f"Node not found: {node_id}"}
 
-            node = graph.get_node(node_id)
-            if not node:
-                return {"success": False, "error": f"Node not found: {node_id}"}
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "node": {
+                        "id": node.id,
+                        "label": node.label,
+                        "type": node.type.value,
+                        "properties": node.properties,
+                    },
+                }
 
-            return {
-                "success": True,
-                "operation": operation,
-                "node": {
-                    "id": node.id,
-                    "label": node.label,
-                    "type": node.type.value,
-                    "properties": node.properties,
-                },
-            }
+            elif operation == "get_neighbors":
+                if not node_id:
+                    return {"success": False, "error": "node_id required for get_neighbors"}
 
-        elif operation == "get_neighbors":
-            if not node_id:
-                return {"success": False, "error": "node_id required for get_neighbors"}
+                rel = EdgeRelation(relation) if relation else None
+                neighbors = graph.get_neighbors(node_id, relation=rel, direction="out")
 
-            rel = EdgeRelation(relation) if relation else None
-            neighbors = graph.get_neighbors(node_id, relation=rel, direction="out")
+                neighbor_data = []
+                for nid in neighbors:
+                    node = graph.get_node(nid)
+                    if node:
+                        neighbor_data.append({
+                            "id": node.id,
+                            "label": node.label,
+                            "type": node.type.value,
+                        })
 
-            neighbor_data = []
-            for nid in neighbors:
-                node = graph.get_node(nid)
-                if node:
-                    neighbor_data.append({
-                        "id": node.id,
-                        "label": node.label,
-                        "type": node.type.value,
-                    })
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "node_id": node_id,
+                    "relation_filter": relation,
+                    "num_neighbors": len(neighbors),
+                    "neighbors": neighbor_data,
+                }
 
-            return {
-                "success": True,
-                "operation": operation,
-                "node_id": node_id,
-                "relation_filter": relation,
-                "num_neighbors": len(neighbors),
-                "neighbors": neighbor_data,
-            }
+            elif operation == "get_nodes_by_type":
+                if not node_type:
+                    return {"success": False, "error": "node_type required for get_nodes_by_type"}
 
-        elif operation == "get_nodes_by_type":
-            if not node_type:
-                return {"success": False, "error": "node_type required for get_nodes_by_type"}
+                ntype = NodeType(node_type)
+                nodes = graph.get_nodes_by_type(ntype)
 
-            ntype = NodeType(node_type)
-            nodes = graph.get_nodes_by_type(ntype)
+                nodes_data = [
+                    {"id": n.id, "label": n.label, "type": n.type.value, "properties": n.properties}
+                    for n in nodes
+                ]
 
-            nodes_data = [
-                {"id": n.id, "label": n.label, "type": n.type.value, "properties": n.properties}
-                for n in nodes
-            ]
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "node_type": node_type,
+                    "num_nodes": len(nodes),
+                    "nodes": nodes_data,
+                }
 
-            return {
-                "success": True,
-                "operation": operation,
-                "node_type": node_type,
-                "num_nodes": len(nodes),
-                "nodes": nodes_data,
-            }
+            elif operation == "find_path":
+                if not start_node or not end_node:
+                    return {
+                        "success": False,
+                        "error": "start_node and end_node required for find_path",
+                    }
+
+                rel = EdgeRelation(relation) if relation else None
 
-        elif operation == "find_path":
-            if not start_node or not end_node:
-                return {"success": False, "error": "start_node and end_node required for find_path"}
+                if k is not None:
+                    paths = graph.find_paths(
+                        start_node, end_node, k=k, max_depth=max_depth, relation=rel
+                    )
+                    if not paths:
+                        return {
+                            "success": False,
+                            "error": f"No path found between {start_node} and {end_node}",
+                        }
+
+                    return {
+                        "success": True,
+                        "operation": operation,
+                        "start_node": start_node,
+                        "end_node": end_node,
+                        "relation_filter": relation,
+                        "num_paths": len(paths),
+                        "paths": [_path_data(graph, path) for path in paths],
+                    }
+
+                path = graph.find_path(start_node, end_node, max_depth=max_depth, relation=rel)
+                if not path:
+                    return {
+                        "success": False,
+                        "error": f"No path found between {start_node} and {end_node}",
+                    }
 
-            path = graph.find_path(start_node, end_node)
-            if not path:
                 return {
-                    "success": False,
-                    "error": f"No path found between {start_node} and {end_node}",
+                    "success": True,
+                    "operation": operation,
+                    "start_node": start_node,
+                    "end_node": end_node,
+                    "path_length": len(path),
+                    "path": _path_data(graph, path),
                 }
 
-            path_data = []
-            for nid in path:
-                node = graph.get_node(nid)
-                if node:
-                    path_data.append({
-                        "id": node.id,
-                        "label": node.label,
-                        "type": node.type.value,
-                    })
+            elif operation == "is_reachable":
+                if not start_node or not end_node:
+                    return {
+                        "success": False,
+                        "error": "start_node and end_node required for is_reachable",
+                    }
 
-            return {
-                "success": True,
-                "operation": operation,
-                "start_node": start_node,
-                "end_node": end_node,
-                "path_length": len(path),
-                "path": path_data,
-            }
+                for nid in (start_node, end_node):
+                    if nid not in graph.graph:
+                        return {"success": False, "error": f"Node not found: {nid}"}
 
-        elif operation == "get_statistics":
-            stats = graph.get_statistics()
-            return {
-                "success": True,
-                "operation": operation,
-                "statistics": stats,
-            }
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "start_node": start_node,
+                    "end_node": end_node,
+                    "reachable": graph.is_reachable(start_node, end_node),
+                }
 
-        else:
-            return {
-                "success": False,
-                "error": f"Unknown operation: {operation}",
-                "valid_operations": [
-                    "get_node",
-                    "get_neighbors",
-                    "get_nodes_by_type",
-                    "find_path",
-                    "get_statistics",
-                ],
-            }
+            elif operation == "get_subgraph":
+                centers = node_ids or ([node_id] if node_id else [])
+                if not centers:
+                    return {
+                        "success": False,
+                        "error": "node_ids or node_id required for get_subgraph",
+                    }
+
+                for nid in centers:
+                    if nid not in graph.graph:
+                        return {"success": False, "error": f"Node not found: {nid}"}
+
+                view = graph.subgraph(
+                    centers,
+                    hops=hops,
+                    relations=[EdgeRelation(relation)] if relation else None,
+                    node_types=[NodeType(node_type)] if node_type else None,
+                )
+
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "node_ids": centers,
+                    "hops": hops,
+                    "relation_filter": relation,
+                    "node_type_filter": node_type,
+                    "num_nodes": view.number_of_nodes(),
+                    "num_edges": view.number_of_edges(),
+                    "nodes": [
+                        {"id": nid, "label": data.get("label", nid), "type": data.get("type")}
+                        for nid, data in view.nodes(data=True)
+                    ],
+                    "edges": [
+                        {"source": u, "target": v, "relation": data.get("relation")}
+                        for u, v, data in view.edges(data=True)
+                    ],
+                }
+
+            elif operation == "match":
+                if not pattern:
+                    return {"success": False, "error": "pattern required for match"}
+
+                matcher = graph.pattern_matcher()
+                query = parse_pattern_query(pattern)
+                matches = matcher.match(query)
+
+                summaries: Dict[str, Dict[str, Any]] = {}
+                for row in matches:
+                    for nid in row.values():
+                        if nid not in summaries:
+                            data = graph.graph.nodes[nid]
+                            summaries[nid] = {
+                                "id": nid,
+                                "label": data.get("label", nid),
+                                "type": data.get("type"),
+                            }
+
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "pattern": pattern,
+                    "plan": matcher.explain(query),
+                    "num_matches": len(matches),
+                    "matches": [
+                        {var: summaries[nid] for var, nid in row.items()} for row in matches
+                    ],
+                }
+
+            elif operation == "search_nodes":
+                if not text:
+                    return {"success": False, "error": "text required for search_nodes"}
+
+                matches = graph.search_nodes(text, mode=search_mode, limit=limit)
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "text": text,
+                    "search_mode": search_mode,
+                    "num_matches": len(matches),
+                    "matches": matches,
+                }
+
+            elif operation == "get_statistics":
+                stats = graph.get_statistics()
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "statistics": stats,
+                }
+
+            else:
+                return {
+                    "success": False,
+                    "error": f"Unknown operation: {operation}",
+                    "valid_operations": [
+                        "get_node",
+                        "get_neighbors",
+                        "get_nodes_by_type",
+                        "find_path",
+                        "is_reachable",
+                        "get_subgraph",
+                        "match",
+                        "search_nodes",
+                        "get_statistics",
+                    ],
+                }
 
     except Exception as e:
         logger.error(f"Failed to query graph: {e}")
@@ -195,3 +339,17 @@ async def query_graph(
             "graph_file": graph_file,
             "operation": operation,
         }
+
+
+def _path_data(graph: GraphEngine, path: List[str]) -> List[Dict[str, Any]]:
+    """Summarize the nodes along a path."""
+    path_data = []
+    for nid in path:
+        node = graph.get_node(nid)
+        if node:
+            path_data.append({
+                "id": node.id,
+                "label": node.label,
+                "type": node.type.value,
+            })
+    return path_data
@@ -5,7 +5,8 @@ from typing import Any, Dict, List, Optional
 from loguru import logger
 
 from mcp_server.config import settings
-from mcp_server.core.graph_engine import GraphEngine
+from mcp_server.core.graph_store import shared_write
+from mcp_server.core.mutation_log import MutationLog
 from mcp_server.models.schemas import EdgeRelation, GraphEdge, GraphNode, NodeType
 
 
@@ -17,6 +18,8 @@ async def update_graph(
     node_id: Optional[str] = None,
     source: Optional[str] = None,
     target: Optional[str] = None,
+    nodes: Optional[List[Dict[str, Any]]] = None,
+    edges: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """Update a knowledge graph by adding, removing, or modifying nodes and edges.
 
@@ -25,6 +28,9 @@ async def update_graph(
     - remove_node: Remove a node (requires node_id)
     - add_edge: Add a new edge (requires edge dict with source, target, relation)
     - remove_edge: Remove an edge (requires source, target)
+    - add_nodes: Add many nodes in one bulk insert (requires nodes list)
+    - add_edges: Add many edges in one bulk insert (requires edges list; all
+      endpoints must exist)
 
     Args:
         graph_file: Path to graph JSON file
@@ -34,6 +40,12 @@ async def update_graph(
         node_id: Node ID for removal
         source: Source node ID for edge removal
         target: Target node ID for edge removal
+        nodes: List of node data dicts for add_nodes
+        edges: List of edge data dicts for add_edges
+
+    Changes are appended to the graph's mutation log rather than rewriting the
+    whole file; the log is folded into the graph file once it grows past
+    ``settings.graph_log_compaction_bytes``.
 
     Returns:
         Dict with operation result
@@ -73,115 +85,196 @@ async def update_graph(
                 "error": f"Graph file not found: {graph_file}",
             }
 
-        graph = GraphEngine()
-        graph.load_from_file(graph_path)
+        log = MutationLog(graph_path, settings.graph_log_compaction_bytes)
 
-        # Execute operation
-        if operation == "add_node":
-            if not node:
-                return {"success": False, "error": "node required for add_node"}
+        # Mutate a draft of the shared graph; readers keep their version until it is logged
+        with shared_write(graph_path) as graph:
+            # Execute operation
+            if operation == "add_node":
+                if not node:
+                    return {"success": False, "error": "node required for add_node"}
 
-            # Validate node data
-            if "id" not in node or "label" not in node or "type" not in node:
-                return {
-                    "success": False,
-                    "error": "node must have id, label, and type fields",
-                }
+                # Validate node data
+                if "id" not in node or "label" not in node or "type" not in node:
+                    return {
+                        "success": False,
+                        "error": "node must have id, label, and type fields",
+                    }
 
-            graph_node = GraphNode(
-                id=node["id"],
-                label=node["label"],
-                type=NodeType(node["type"]),
-                properties=node.get("properties", {}),
-            )
+                graph_node = GraphNode(
+                    id=node["id"],
+                    label=node["label"],
+                    type=NodeType(node["type"]),
+                    properties=node.get("properties", {}),
+                )
 
-            graph.add_node(graph_node)
-            graph.save_to_file(graph_path)
+                graph.add_node(graph_node)
+                log.append(graph, {"op": operation, "node": graph_node.model_dump(mode="json")})
 
-            return {
-                "success": True,
-                "operation": operation,
-                "node_id": node["id"],
-                "message": f"Added node: {node['id']}",
-            }
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "node_id": node["id"],
+                    "message": f"Added node: {node['id']}",
+                }
 
-        elif operation == "remove_node":
-            if not node_id:
-                return {"success": False, "error": "node_id required for remove_node"}
+            elif operation == "remove_node":
+                if not node_id:
+                    return {"success": False, "error": "node_id required for remove_node"}
 
-            if node_id not in graph.graph.nodes:
-                return {"success": False, "error": f"Node not found: {node_id}"}
+                if node_id not in graph.graph.nodes:
+                    return {"success": False, "error": f"Node not found: {node_id}"}
 
-            graph.remove_node(node_id)
-            graph.save_to_file(graph_path)
+                graph.remove_node(node_id)
+                log.append(graph, {"op": operation, "node_id": node_id})
 
-            return {
-                "success": True,
-                "operation": operation,
-                "node_id": node_id,
-                "message": f"Removed node: {node_id}",
-            }
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "node_id": node_id,
+                    "message": f"Removed node: {node_id}",
+                }
 
-        elif operation == "add_edge":
-            if not edge:
-                return {"success": False, "error": "edge required for add_edge"}
+            elif operation == "add_edge":
+                if not edge:
+                    return {"success": False, "error": "edge required for add_edge"}
+
+                # Validate edge data
+                if "source" not in edge or "target" not in edge or "relation" not in edge:
+                    return {
+                        "success": False,
+                        "error": "edge must have source, target, and relation fields",
+                    }
+
+                # Validate nodes exist
+                if edge["source"] not in graph.graph.nodes:
+                    return {"success": False, "error": f"Source node not found: {edge['source']}"}
+                if edge["target"] not in graph.graph.nodes:
+                    return {"success": False, "error": f"Target node not found: {edge['target']}"}
+
+                graph_edge = GraphEdge(
+                    source=edge["source"],
+                    target=edge["target"],
+                    relation=EdgeRelation(edge["relation"]),
+                    properties=edge.get("properties", {}),
+                )
+
+                graph.add_edge(graph_edge)
+                log.append(graph, {"op": operation, "edge": graph_edge.model_dump(mode="json")})
 
-            # Validate edge data
-            if "source" not in edge or "target" not in edge or "relation" not in edge:
                 return {
-                    "success": False,
-                    "error": "edge must have source, target, and relation fields",
+                    "success": True,
+                    "operation": operation,
+                    "edge": f"{edge['source']} --[{edge['relation']}]--> {edge['target']}",
+                    "message": "Added edge",
                 }
 
-            # Validate nodes exist
-            if edge["source"] not in graph.graph.nodes:
-                return {"success": False, "error": f"Source node not found: {edge['source']}"}
-            if edge["target"] not in graph.graph.nodes:
-                return {"success": False, "error": f"Target node not found: {edge['target']}"}
+            elif operation == "remove_edge":
+                if not source or not target:
+                    return {"success": False, "error": "source and target required for remove_edge"}
 
-            graph_edge = GraphEdge(
-                source=edge["source"],
-                target=edge["target"],
-                relation=EdgeRelation(edge["relation"]),
-                properties=edge.get("properties", {}),
-            )
+                if not graph.graph.has_edge(source, target):
+                    return {
+                        "success": False,
+                        "error": f"Edge not found: {source} --> {target}",
+                    }
 
-            graph.add_edge(graph_edge)
-            graph.save_to_file(graph_path)
+                graph.remove_edge(source, target)
+                log.append(graph, {"op": operation, "source": source, "target": target})
 
-            return {
-                "success": True,
-                "operation": operation,
-                "edge": f"{edge['source']} --[{edge['relation']}]--> {edge['target']}",
-                "message": "Added edge",
-            }
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "edge": f"{source} --> {target}",
+                    "message": "Removed edge",
+                }
 
-        elif operation == "remove_edge":
-            if not source or not target:
-                return {"success": False, "error": "source and target required for remove_edge"}
+            elif operation == "add_nodes":
+                if not nodes:
+                    return {"success": False, "error": "nodes required for add_nodes"}
+
+                if any("id" not in n or "label" not in n or "type" not in n for n in nodes):
+                    return {
+                        "success": False,
+                        "error": "every node must have id, label, and type fields",
+                    }
+
+                graph_nodes = [
+                    GraphNode(
+                        id=n["id"],
+                        label=n["label"],
+                        type=NodeType(n["type"]),
+                        properties=n.get("properties", {}),
+                    )
+                    for n in nodes
+                ]
+                count = graph.add_nodes(graph_nodes)
+                log.append(
+                    graph,
+                    {"op": operation, "nodes": [n.model_dump(mode="json") for n in graph_nodes]},
+                )
 
-            if not graph.graph.has_edge(source, target):
                 return {
-                    "success": False,
-                    "error": f"Edge not found: {source} --> {target}",
+                    "success": True,
+                    "operation": operation,
+                    "num_nodes": count,
+                    "message": f"Added {count} nodes",
                 }
 
-            graph.remove_edge(source, target)
-            graph.save_to_file(graph_path)
+            elif operation == "add_edges":
+                if not edges:
+                    return {"success": False, "error": "edges required for add_edges"}
+
+                if any(
+                    "source" not in item or "target" not in item or "relation" not in item
+                    for item in edges
+                ):
+                    return {
+                        "success": False,
+                        "error": "every edge must have source, target, and relation fields",
+                    }
+
+                graph_edges = [
+                    GraphEdge(
+                        source=item["source"],
+                        target=item["target"],
+                        relation=EdgeRelation(item["relation"]),
+                        properties=item.get("properties", {}),
+                    )
+                    for item in edges
+                ]
+                try:
+                    count = graph.add_edges(graph_edges)
+                except ValueError as e:
+                    return {"success": False, "error": str(e)}
+                log.append(
+                    graph,
+                    {
+                        "op": operation,
+                        "edges": [item.model_dump(mode="json") for item in graph_edges],
+                    },
+                )
 
-            return {
-                "success": True,
-                "operation": operation,
-                "edge": f"{source} --> {target}",
-                "message": "Removed edge",
-            }
+                return {
+                    "success": True,
+                    "operation": operation,
+                    "num_edges": count,
+                    "message": f"Added {count} edges",
+                }
 
-        else:
-            return {
-                "success": False,
-                "error": f"Unknown operation: {operation}",
-                "valid_operations": ["add_node", "remove_node", "add_edge", "remove_edge"],
-            }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Unknown operation: {operation}",
+                    "valid_operations": [
+                        "add_node",
+                        "remove_node",
+                        "add_edge",
+                        "remove_edge",
+                        "add_nodes",
+                        "add_edges",
+                    ],
+                }
 
     except Exception as e:
         logger.error(f"Failed to update graph: {e}")
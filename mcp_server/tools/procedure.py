@@ -1,13 +1,18 @@
 """Generate procedure tool - context-aware procedure generation from graphs."""
 
+import asyncio
+import json
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from loguru import logger
 
 from mcp_server.config import settings
+from mcp_server.core.filters import filter_signature
 from mcp_server.core.graph_engine import GraphEngine
-from mcp_server.models.schemas import KnowledgeGraph, NodeType
+from mcp_server.core.graph_store import shared_store
+from mcp_server.core.procedure_pool import ProcedurePool
+from mcp_server.models.schemas import KnowledgeGraph
 
 
 async def generate_procedure(
@@ -42,7 +47,7 @@ async def generate_procedure(
     try:
         filters = filters or {}
 
-        # Load graph
+        # Load graph (shared between calls while the file is unchanged)
         graph_path = settings.graphs_dir / graph_file
         if not graph_path.exists():
             return {
@@ -50,92 +55,260 @@ async def generate_procedure(
                 "error": f"Graph file not found: {graph_file}",
             }
 
-        graph = GraphEngine()
-        graph.load_from_file(graph_path)
+        with shared_store(graph_path).read() as graph:
+            # Validate start node
+            if start_node not in graph.graph.nodes:
+                return {
+                    "success": False,
+                    "error": f"Start node not found: {start_node}",
+                    "available_nodes": _suggest_nodes(graph, start_node),
+                }
 
-        # Validate start node
-        if start_node not in graph.graph.nodes:
+            # Traverse graph
+            visited = graph.traverse_bfs(start_node, filters=filters, max_depth=max_depth)
+
+            # Process nodes with role and system hints
+            steps_with_metadata = graph.procedure_steps(visited)
+            content = _format_procedure(steps_with_metadata, filters, start_node, output_format)
+
+            logger.info(
+                f"Generated procedure with {len(steps_with_metadata)} steps from {start_node}"
+            )
+
+            return {
+                "success": True,
+                "num_steps": len(steps_with_metadata),
+                "steps": steps_with_metadata,
+                "content": content,
+                "format": output_format,
+                "filters_applied": filters,
+                "start_node": start_node,
+                "graph_stats": graph.get_statistics(),
+            }
+
+    except Exception as e:
+        logger.error(f"Failed to generate procedure: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "graph_file": graph_file,
+        }
+
+
+async def generate_procedures_batch(
+    graph_file: str,
+    start_node: str,
+    contexts: List[Dict[str, Any]],
+    max_depth: int = 10,
+    output_format: str = "list",
+) -> Dict[str, Any]:
+    """Generate context-aware procedures for many filter contexts at once.
+
+    The graph is loaded once and contexts are deduplicated by normalized filter
+    signature, so each distinct context is traversed a single time.
+
+    Args:
+        graph_file: Path to graph JSON file (relative to graphs directory)
+        start_node: Starting node ID for traversal
+        contexts: List of context filters, e.g. one per borrower
+        max_depth: Maximum traversal depth
+        output_format: Output format (list, markdown, json)
+
+    Returns:
+        Dict with one procedure per context, in input order
+
+    Example:
+        ```python
+        result = await generate_procedures_batch(
+            graph_file="mortgage_underwriting.json",
+            start_node="Loan Application",
+            contexts=[
+                {"location": "Texas", "property_type": "rural"},
+                {"location": "New Mexico", "property_type": "urban"},
+            ],
+        )
+        ```
+    """
+    try:
+        graph_path = settings.graphs_dir / graph_file
+        if not graph_path.exists():
             return {
                 "success": False,
-                "error": f"Start node not found: {start_node}",
-                "available_nodes": list(graph.graph.nodes)[:10],
+                "error": f"Graph file not found: {graph_file}",
             }
 
-        # Traverse graph
-        visited = graph.traverse_bfs(start_node, filters=filters, max_depth=max_depth)
-
-        # Filter to process nodes only
-        procedure_steps = [
-            node_id for node_id in visited
-            if graph.graph.nodes[node_id].get("type") == NodeType.PROCESS.value
-        ]
-
-        # Get metadata for each step
-        steps_with_metadata = []
-        for step in procedure_steps:
-            node_data = graph.graph.nodes[step]
-            metadata = {
-                "id": step,
-                "label": node_data.get("label", step),
-                "type": node_data.get("type"),
+        with shared_store(graph_path).read() as graph:
+            if start_node not in graph.graph.nodes:
+                return {
+                    "success": False,
+                    "error": f"Start node not found: {start_node}",
+                    "available_nodes": _suggest_nodes(graph, start_node),
+                }
+
+            contexts = [filters or {} for filters in contexts]
+            procedures = graph.generate_procedures(start_node, contexts, max_depth=max_depth)
+
+            results = [
+                {
+                    "filters_applied": filters,
+                    "num_steps": len(steps),
+                    "steps": steps,
+                    "content": _format_procedure(steps, filters, start_node, output_format),
+                }
+                for filters, steps in zip(contexts, procedures)
+            ]
+            num_distinct = len({filter_signature(filters) for filters in contexts})
+
+            logger.info(
+                f"Generated {len(results)} procedures ({num_distinct} distinct contexts) "
+                f"from {start_node}"
+            )
+
+            return {
+                "success": True,
+                "num_contexts": len(results),
+                "num_distinct_contexts": num_distinct,
+                "procedures": results,
+                "format": output_format,
+                "start_node": start_node,
             }
 
-            # Get role and system
-            for neighbor in graph.graph.successors(step):
-                relation = graph.graph[step][neighbor].get("relation")
-                neighbor_type = graph.graph.nodes[neighbor].get("type")
-
-                if relation == "performed_by":
-                    metadata["role"] = neighbor
-                if relation == "requires" and neighbor_type == "system":
-                    metadata["system"] = neighbor
-
-            steps_with_metadata.append(metadata)
-
-        # Format output
-        if output_format == "markdown":
-            lines = ["# Generated Procedure\n"]
-            lines.append(f"**Context:** {', '.join(f'{k}={v}' for k, v in filters.items())}\n")
-            lines.append("## Steps\n")
-            for idx, step in enumerate(steps_with_metadata, 1):
-                line = f"{idx}. **{step['label']}**"
-                hints = []
-                if step.get("role"):
-                    hints.append(f"Role: {step['role']}")
-                if step.get("system"):
-                    hints.append(f"System: {step['system']}")
-                if hints:
-                    line += f" — {', '.join(hints)}"
-                lines.append(line)
-            content = "\n".join(lines)
-        elif output_format == "json":
-            import json
-            content = json.dumps({
-                "procedure": steps_with_metadata,
-                "filters": filters,
+    except Exception as e:
+        logger.error(f"Failed to generate procedures: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "graph_file": graph_file,
+        }
+
+
+async def generate_procedures_bulk(
+    graph_file: str,
+    jobs: List[Dict[str, Any]],
+    max_depth: int = 10,
+    output_format: str = "list",
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Generate procedures for many start nodes and contexts on a process pool.
+
+    Each worker process loads the graph once, and jobs are streamed to the
+    workers in chunks. The pool runs in a background thread, so the event
+    loop stays responsive while all cores work.
+
+    Args:
+        graph_file: Path to graph file (relative to graphs directory)
+        jobs: List of jobs, each with a start_node and optional filters
+        max_depth: Maximum traversal depth
+        output_format: Output format (list, markdown, json)
+        max_workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        Dict with one procedure (or error) per job, in input order
+
+    Example:
+        ```python
+        result = await generate_procedures_bulk(
+            graph_file="mortgage_underwriting.dgraph",
+            jobs=[
+                {"start_node": "Loan Application", "filters": {"location": "Texas"}},
+                {"start_node": "Appraisal", "filters": {"location": "Ohio"}},
+            ],
+        )
+        ```
+    """
+    try:
+        graph_path = settings.graphs_dir / graph_file
+        if not graph_path.exists():
+            return {
+                "success": False,
+                "error": f"Graph file not found: {graph_file}",
+            }
+
+        if any("start_node" not in job for job in jobs):
+            return {"success": False, "error": "every job must have a start_node"}
+
+        work = [(job["start_node"], job.get("filters") or {}) for job in jobs]
+
+        def run() -> List[Optional[List[Dict[str, Any]]]]:
+            steps: List[Optional[List[Dict[str, Any]]]] = [None] * len(work)
+            with ProcedurePool(graph_path, max_workers=max_workers) as pool:
+                for index, job_steps in pool.generate(work, max_depth=max_depth):
+                    steps[index] = job_steps
+            return steps
+
+        all_steps = await asyncio.to_thread(run)
+
+        results = []
+        for (start_node, filters), steps in zip(work, all_steps):
+            if steps is None:
+                results.append({
+                    "start_node": start_node,
+                    "filters_applied": filters,
+                    "error": f"Start node not found: {start_node}",
+                })
+                continue
+            results.append({
                 "start_node": start_node,
-                "num_steps": len(procedure_steps),
-            }, indent=2)
-        else:  # list
-            content = "\n".join(f"{idx}. {step['label']}" for idx, step in enumerate(steps_with_metadata, 1))
+                "filters_applied": filters,
+                "num_steps": len(steps),
+                "steps": steps,
+                "content": _format_procedure(steps, filters, start_node, output_format),
+            })
 
-        logger.info(f"Generated procedure with {len(procedure_steps)} steps from {start_node}")
+        logger.info(f"Generated {len(results)} procedures on a process pool")
 
         return {
             "success": True,
-            "num_steps": len(procedure_steps),
-            "steps": steps_with_metadata,
-            "content": content,
+            "num_jobs": len(results),
+            "procedures": results,
             "format": output_format,
-            "filters_applied": filters,
-            "start_node": start_node,
-            "graph_stats": graph.get_statistics(),
         }
 
     except Exception as e:
-        logger.error(f"Failed to generate procedure: {e}")
+        logger.error(f"Failed to generate procedures: {e}")
         return {
             "success": False,
             "error": str(e),
             "graph_file": graph_file,
         }
+
+
+def _suggest_nodes(graph: GraphEngine, start_node: str) -> List[str]:
+    """Suggest node IDs for an unknown start node, closest names first."""
+    matches = graph.search_nodes(start_node, limit=10)
+    return [match["id"] for match in matches] or list(graph.graph.nodes)[:10]
+
+
+def _format_procedure(
+    steps: List[Dict[str, Any]],
+    filters: Dict[str, Any],
+    start_node: str,
+    output_format: str,
+) -> str:
+    """Render procedure steps in the requested output format."""
+    if output_format == "markdown":
+        lines = ["# Generated Procedure\n"]
+        lines.append(f"**Context:** {', '.join(f'{k}={v}' for k, v in filters.items())}\n")
+        lines.append("## Steps\n")
+        for idx, step in enumerate(steps, 1):
+            line = f"{idx}. **{step['label']}**"
+            hints = []
+            if step.get("role"):
+                hints.append(f"Role: {step['role']}")
+            if step.get("system"):
+                hints.append(f"System: {step['system']}")
+            if hints:
+                line += f" — {', '.join(hints)}"
+            lines.append(line)
+        return "\n".join(lines)
+
+    if output_format == "json":
+        return json.dumps({
+            "procedure": steps,
+            "filters": filters,
+            "start_node": start_node,
+            "num_steps": len(steps),
+        }, indent=2)
+
+    # list
+    return "\n".join(f"{idx}. {step['label']}" for idx, step in enumerate(steps, 1))
@@ -0,0 +1,74 @@
+"""Benchmark validated vs trusted JSON graph I/O.
+
+Usage:
+    python scripts/benchmark_graph_io.py [num_nodes]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+from mcp_server.core.graph_engine import GraphEngine
+from mcp_server.models.schemas import EdgeRelation, GraphEdge, GraphNode, NodeType
+
+
+def build_graph(num_nodes: int, **options: Any) -> GraphEngine:
+    """Build a synthetic graph with two outgoing edges per node.
+
+    ``options`` are passed to ``GraphEngine``.
+    """
+    graph = GraphEngine(**options)
+    graph.add_nodes(
+        GraphNode(
+            id=f"node-{i}",
+            label=f"Node {i}",
+            type=NodeType.PROCESS,
+            properties={"index": i, "tags": ["synthetic"]},
+        )
+        for i in range(num_nodes)
+    )
+    graph.add_edges(
+        GraphEdge(
+            source=f"node-{i}",
+            target=f"node-{(i * k + 1) % num_nodes}",
+            relation=EdgeRelation.RELATED_TO,
+        )
+        for i in range(num_nodes)
+        for k in (3, 7)
+    )
+    return graph
+
+
+def timed(fn: Callable[[], None], repeat: int = 3) -> float:
+    """Run a callable ``repeat`` times and return the best wall time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(num_nodes: int) -> None:
+    """Compare save/load times and file sizes of both modes."""
+    logger.remove()
+    graph = build_graph(num_nodes)
+    print(f"{num_nodes} nodes, {graph.graph.number_of_edges()} edges")
+    print(f"{'mode':<10}{'save (s)':>10}{'load (s)':>10}{'size (MB)':>12}")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for trusted in (False, True):
+            path = Path(tmpdir) / f"graph-{trusted}.json"
+            save = timed(lambda: graph.save_to_file(path, trusted=trusted))
+            load = timed(lambda: GraphEngine().load_from_file(path, trusted=trusted))
+            size = path.stat().st_size / 1e6
+            mode = "trusted" if trusted else "validated"
+            print(f"{mode:<10}{save:>10.2f}{load:>10.2f}{size:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
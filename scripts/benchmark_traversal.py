@@ -0,0 +1,33 @@
+"""Benchmark BFS traversal on the NetworkX graph vs the compiled CSR snapshot.
+
+Usage:
+    python scripts/benchmark_traversal.py [num_nodes]
+"""
+
+import sys
+
+from benchmark_graph_io import build_graph, timed
+from loguru import logger
+
+
+def main(num_nodes: int) -> None:
+    """Compare uncached traversal times at increasing depths."""
+    logger.remove()
+    networkx = build_graph(num_nodes, cache_size=0)
+    compiled = build_graph(num_nodes, compiled=True, cache_size=0)
+    compiled.compile()
+    print(f"{num_nodes} nodes, {compiled.graph.number_of_edges()} edges")
+    print(f"{'depth':<8}{'visited':>10}{'networkx (s)':>14}{'compiled (s)':>14}{'speedup':>10}")
+
+    for depth in (3, 6, 10, 20, 40):
+        visited = len(compiled.traverse_bfs("node-0", max_depth=depth))
+        assert networkx.traverse_bfs("node-0", max_depth=depth) == compiled.traverse_bfs(
+            "node-0", max_depth=depth
+        )
+        plain = timed(lambda: networkx.traverse_bfs("node-0", max_depth=depth))
+        fast = timed(lambda: compiled.traverse_bfs("node-0", max_depth=depth))
+        print(f"{depth:<8}{visited:>10}{plain:>14.4f}{fast:>14.4f}{plain / fast:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
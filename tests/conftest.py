@@ -33,10 +33,16 @@ def test_settings(temp_dir):
     return settings
 
 
-@pytest.fixture
-def sample_graph():
-    """Create a sample knowledge graph for testing."""
-    graph = GraphEngine()
+@pytest.fixture(params=["networkx", "sqlite"])
+def sample_graph(request):
+    """Create a sample knowledge graph for testing, in memory and in a SQLite database."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = Path(tmpdir) / "sample.sqlite" if request.param == "sqlite" else None
+        yield _build_sample_graph(GraphEngine(database=database))
+
+
+def _build_sample_graph(graph):
+    """Add the sample nodes and edges to an empty graph."""
 
     # Add nodes
     nodes = [
@@ -1,8 +1,11 @@
 """Tests for graph engine."""
 
+import json
+
 import pytest
 
 from mcp_server.core.graph_engine import GraphEngine
+from mcp_server.core.pattern_query import parse_pattern_query
 from mcp_server.models.schemas import EdgeRelation, GraphEdge, GraphNode, NodeType
 
 
@@ -95,3 +98,1001 @@ def test_statistics(sample_graph):
     assert stats["num_nodes"] == 6
     assert stats["num_edges"] == 5
     assert stats["is_directed"] is True
+    assert stats["is_connected"] is True
+
+
+def test_compiled_traversal_matches_networkx(sample_graph):
+    """Test compiled snapshot returns the same results as the NetworkX path."""
+    compiled = GraphEngine(compiled=True)
+    compiled.load_from_model(sample_graph.export_to_model())
+
+    for filters in [None, {"location": "Context"}, {"location": "Texas"}]:
+        assert compiled.traverse_bfs("Start", filters=filters) == sample_graph.traverse_bfs(
+            "Start", filters=filters
+        )
+    assert compiled.get_neighbors("Step1") == sample_graph.get_neighbors("Step1")
+    assert compiled.get_neighbors("Step1", relation=EdgeRelation.REQUIRES) == ["System1"]
+    assert compiled.get_neighbors("Step2", direction="in") == ["Step1"]
+    assert compiled.find_path("Start", "Step2") == ["Start", "Step1", "Step2"]
+    assert compiled.find_path("Start", "Step2", max_depth=1) is None
+
+
+def test_compiled_snapshot_rebuilt_after_mutation(sample_graph):
+    """Test the compiled snapshot is invalidated by mutations."""
+    sample_graph.compiled = True
+    snapshot = sample_graph.compile()
+    assert sample_graph.compile() is snapshot
+
+    sample_graph.add_node(GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS))
+    sample_graph.add_edge(GraphEdge(source="Step2", target="Step3", relation=EdgeRelation.PRECEDES))
+
+    assert sample_graph.compile() is not snapshot
+    assert "Step3" in sample_graph.traverse_bfs("Start")
+
+
+def test_relation_index_maintained(sample_graph):
+    """Test relation-partitioned indexes follow add/remove operations."""
+    assert sample_graph.get_neighbors("Step1", relation=EdgeRelation.PERFORMED_BY) == ["Role1"]
+    assert sample_graph.get_neighbors(
+        "System1", relation=EdgeRelation.REQUIRES, direction="in"
+    ) == ["Step1"]
+
+    # Re-adding an edge with a different relation moves it between partitions
+    sample_graph.add_edge(
+        GraphEdge(source="Step1", target="System1", relation=EdgeRelation.REFERENCES)
+    )
+    assert sample_graph.get_neighbors("Step1", relation=EdgeRelation.REQUIRES) == []
+    assert sample_graph.get_neighbors("Step1", relation=EdgeRelation.REFERENCES) == ["System1"]
+
+    sample_graph.remove_edge("Step1", "Role1")
+    assert sample_graph.get_neighbors("Step1", relation=EdgeRelation.PERFORMED_BY) == []
+
+    sample_graph.remove_node("Step1")
+    assert sample_graph.get_neighbors(
+        "Step2", relation=EdgeRelation.PRECEDES, direction="in"
+    ) == []
+    assert sample_graph.get_neighbors(
+        "Start", relation=EdgeRelation.REQUIRES, direction="both"
+    ) == []
+
+
+def test_compiled_filter_plans(sample_graph):
+    """Test filters compile once per signature and match case-insensitively."""
+    plan = sample_graph.compile_filters({"location": "Texas", "property_type": None})
+    assert sample_graph.compile_filters({"state": "texas"}) is plan
+    assert plan.matches("Texas Rural Appraisal")
+    assert plan.matches("NorthTexas")
+    assert not plan.matches("New Mexico")
+
+    assert not sample_graph.compile_filters({}).active
+    assert sample_graph.compile_filters({"location": None}).active
+
+    # Step2 only applies to Context1, so a non-matching context prunes it
+    assert "Step2" in sample_graph.traverse_bfs("Start", filters={"location": "context"})
+    assert "Step2" not in sample_graph.traverse_bfs("Start", filters={"location": "Texas"})
+
+
+def test_traversal_cache(sample_graph):
+    """Test traversal results are cached per graph version."""
+    first = sample_graph.traverse_bfs("Start", filters={"location": "Context"})
+    second = sample_graph.traverse_bfs("Start", filters={"region": "context"})
+    assert first == second
+
+    cache = sample_graph.get_statistics()["traversal_cache"]
+    assert cache["hits"] == 1
+    assert cache["misses"] == 1
+
+    # Mutations bump the version so stale results are never served
+    version = sample_graph.version
+    sample_graph.add_node(GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS))
+    sample_graph.add_edge(GraphEdge(source="Step1", target="Step3", relation=EdgeRelation.PRECEDES))
+    assert sample_graph.version > version
+    assert "Step3" in sample_graph.traverse_bfs("Start", filters={"location": "Context"})
+    assert sample_graph.get_statistics()["traversal_cache"]["misses"] == 2
+
+
+def test_statistics_maintained_incrementally(sample_graph):
+    """Test node type counts and connectivity track mutations."""
+    stats = sample_graph.get_statistics()
+    assert stats["node_types"]["process"] == 3
+    assert stats["node_types"]["system"] == 1
+    assert stats["is_connected"] is True
+
+    sample_graph.add_node(GraphNode(id="Orphan", label="Orphan", type=NodeType.SYSTEM))
+    stats = sample_graph.get_statistics()
+    assert stats["node_types"]["system"] == 2
+    assert stats["is_connected"] is False
+
+    sample_graph.add_edge(GraphEdge(source="Step2", target="Orphan", relation=EdgeRelation.REQUIRES))
+    assert sample_graph.get_statistics()["is_connected"] is True
+
+    # Deletions fall back to a lazy rebuild
+    sample_graph.remove_edge("Start", "Step1")
+    assert sample_graph.get_statistics()["is_connected"] is False
+
+    # Re-adding a node with a different type moves it between counters
+    sample_graph.add_node(GraphNode(id="Orphan", label="Orphan", type=NodeType.ROLE))
+    stats = sample_graph.get_statistics()
+    assert stats["node_types"]["system"] == 1
+    assert stats["node_types"]["role"] == 2
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_find_path_depth_bounded(compiled):
+    """Test bidirectional path search honours max_depth and relation filters."""
+    graph = GraphEngine(compiled=compiled)
+    for node_id in ["A", "B", "C", "D", "E"]:
+        graph.add_node(GraphNode(id=node_id, label=node_id, type=NodeType.PROCESS))
+    for source, target, relation in [
+        ("A", "B", EdgeRelation.PRECEDES),
+        ("B", "C", EdgeRelation.PRECEDES),
+        ("C", "D", EdgeRelation.PRECEDES),
+        ("A", "E", EdgeRelation.REQUIRES),
+        ("E", "D", EdgeRelation.REQUIRES),
+    ]:
+        graph.add_edge(GraphEdge(source=source, target=target, relation=relation))
+
+    assert graph.find_path("A", "D") == ["A", "E", "D"]
+    assert graph.find_path("A", "D", max_depth=1) is None
+    assert graph.find_path("A", "D", relation=EdgeRelation.PRECEDES) == ["A", "B", "C", "D"]
+    assert graph.find_path("A", "D", max_depth=2, relation=EdgeRelation.PRECEDES) is None
+    assert graph.find_path("D", "A") is None
+    assert graph.find_path("A", "A") == ["A"]
+
+    assert graph.find_paths("A", "D", k=3) == [["A", "E", "D"], ["A", "B", "C", "D"]]
+    assert graph.find_paths("A", "D", k=3, max_depth=2) == [["A", "E", "D"]]
+    assert graph.find_paths("A", "Missing") == []
+
+
+def test_reachability_index(sample_graph):
+    """Test reachability queries and index invalidation."""
+    assert sample_graph.is_reachable("Start", "Context1")
+    assert sample_graph.is_reachable("Step1", "Role1")
+    assert not sample_graph.is_reachable("Context1", "Start")
+    assert not sample_graph.is_reachable("System1", "Role1")
+    assert not sample_graph.is_reachable("Start", "Missing")
+
+    # An edge implied by existing reachability keeps the index
+    index = sample_graph.reachability_index()
+    sample_graph.add_edge(GraphEdge(source="Start", target="Step2", relation=EdgeRelation.PRECEDES))
+    assert sample_graph.reachability_index() is index
+
+    # A cycle collapses into one component
+    sample_graph.add_edge(GraphEdge(source="Context1", target="Start", relation=EdgeRelation.RELATED_TO))
+    assert sample_graph.reachability_index() is not index
+    assert sample_graph.is_reachable("Context1", "Role1")
+
+    sample_graph.remove_edge("Step1", "Role1")
+    assert not sample_graph.is_reachable("Start", "Role1")
+
+
+def test_bulk_add_nodes_and_edges():
+    """Test bulk inserts maintain indexes and validate endpoints."""
+    graph = GraphEngine()
+    assert graph.add_nodes(
+        GraphNode(id=f"N{i}", label=f"Node {i}", type=NodeType.PROCESS) for i in range(4)
+    ) == 4
+    assert graph.add_edges(
+        [
+            GraphEdge(source="N0", target="N1", relation=EdgeRelation.PRECEDES),
+            GraphEdge(source="N1", target="N2", relation=EdgeRelation.REQUIRES),
+            GraphEdge(source="N1", target="N2", relation=EdgeRelation.PRECEDES),
+        ]
+    ) == 3
+
+    assert graph.graph.number_of_edges() == 2
+    assert graph.get_neighbors("N1", relation=EdgeRelation.PRECEDES) == ["N2"]
+    assert graph.get_neighbors("N1", relation=EdgeRelation.REQUIRES) == []
+    assert graph.count_nodes_by_type(NodeType.PROCESS) == 4
+    assert graph.is_weakly_connected() is False
+
+    with pytest.raises(ValueError, match="unknown nodes"):
+        graph.add_edges([GraphEdge(source="N3", target="Missing", relation=EdgeRelation.REQUIRES)])
+    assert "Missing" not in graph.graph
+
+
+def test_binary_snapshot_round_trip(sample_graph, temp_dir):
+    """Test saving and loading the binary snapshot format."""
+    sample_graph.add_node(
+        GraphNode(
+            id="Appraisal",
+            label="Appraisal — rural",
+            type=NodeType.DOCUMENT,
+            properties={"pages": 3, "tags": ["rural", "tx"]},
+        )
+    )
+    sample_graph.add_edge(
+        GraphEdge(
+            source="Step2",
+            target="Appraisal",
+            relation=EdgeRelation.REFERENCES,
+            properties={"weight": 0.5},
+        )
+    )
+    sample_graph.metadata = {"name": "sample"}
+
+    file_path = temp_dir / "graph.dgraph"
+    sample_graph.save_to_file(file_path)
+    assert file_path.read_bytes()[:8] == b"DACGRAPH"
+
+    loaded = GraphEngine()
+    loaded.load_from_file(file_path)
+
+    assert loaded.export_to_model() == sample_graph.export_to_model()
+    assert loaded.get_neighbors("Step1", relation=EdgeRelation.REQUIRES) == ["System1"]
+    assert loaded.traverse_bfs("Start") == sample_graph.traverse_bfs("Start")
+
+
+def test_binary_snapshot_rejects_other_files(temp_dir):
+    """Test loading a non-snapshot file with the binary extension fails cleanly."""
+    file_path = temp_dir / "graph.dgraph"
+    file_path.write_text('{"nodes": []}')
+    with pytest.raises(ValueError, match="Not a binary graph snapshot"):
+        GraphEngine().load_from_file(file_path)
+
+    empty = GraphEngine()
+    empty.save_to_file(file_path)
+    empty.load_from_file(file_path)
+    assert empty.graph.number_of_nodes() == 0
+
+
+def test_open_mapped_matches_engine(sample_graph, temp_dir):
+    """Test memory-mapped snapshots answer queries like the source engine."""
+    sample_graph.add_node(
+        GraphNode(id="Ärztin", label="Ärztin", type=NodeType.ROLE, properties={"level": 2})
+    )
+    sample_graph.add_edge(
+        GraphEdge(source="Step2", target="Ärztin", relation=EdgeRelation.PERFORMED_BY)
+    )
+    file_path = temp_dir / "graph.dgraph"
+    sample_graph.save_to_file(file_path)
+
+    mapped = GraphEngine.open_mapped(file_path)
+
+    assert mapped.num_nodes == 7
+    assert "Ärztin" in mapped and "Missing" not in mapped
+    assert mapped.get_node("Ärztin") == sample_graph.get_node("Ärztin")
+    assert mapped.get_node("Missing") is None
+    for node_id in sample_graph.graph.nodes:
+        assert mapped.get_neighbors(node_id, direction="in") == sample_graph.get_neighbors(
+            node_id, direction="in"
+        )
+    for filters in (None, {"context": "Context 1"}, {"context": "Other"}):
+        assert mapped.traverse_bfs("Start", filters) == sample_graph.traverse_bfs("Start", filters)
+    assert mapped.find_path("Start", "Ärztin") == sample_graph.find_path("Start", "Ärztin")
+    assert mapped.to_engine().export_to_model() == sample_graph.export_to_model()
+
+
+def test_open_mapped_vocabulary_mismatch(sample_graph, temp_dir, monkeypatch):
+    """Test snapshots using node types unknown to this release are rejected."""
+    from mcp_server.core import graph_mmap
+    from mcp_server.core.graph_snapshot import NODE_TYPES
+
+    file_path = temp_dir / "graph.dgraph"
+    sample_graph.save_to_file(file_path)
+
+    # Values the snapshot does not use may be missing from the vocabulary
+    monkeypatch.setattr(graph_mmap, "NODE_TYPES", [t for t in NODE_TYPES if t != "regulation"])
+    mapped = GraphEngine.open_mapped(file_path)
+    assert mapped.get_node("Role1") == sample_graph.get_node("Role1")
+
+    monkeypatch.setattr(graph_mmap, "NODE_TYPES", [t for t in NODE_TYPES if t != "role"])
+    with pytest.raises(ValueError, match="unknown node type values: \\['role'\\]"):
+        GraphEngine.open_mapped(file_path)
+
+
+def test_mutation_log_replay_and_compaction(sample_graph, temp_dir):
+    """Test logged mutations are replayed on load and folded in by compaction."""
+    from mcp_server.core.mutation_log import MutationLog
+
+    file_path = temp_dir / "graph.json"
+    sample_graph.save_to_file(file_path)
+    log = MutationLog(file_path, compaction_threshold=10_000)
+
+    node = GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS)
+    sample_graph.add_node(node)
+    log.append(sample_graph, {"op": "add_node", "node": node.model_dump(mode="json")})
+    sample_graph.remove_edge("Start", "Step1")
+    log.append(sample_graph, {"op": "remove_edge", "source": "Start", "target": "Step1"})
+    assert log.path.exists()
+
+    loaded = GraphEngine()
+    loaded.load_from_file(file_path)
+    assert loaded.export_to_model() == sample_graph.export_to_model()
+
+    log.compact(loaded)
+    assert not log.path.exists()
+    reloaded = GraphEngine()
+    reloaded.load_from_file(file_path)
+    assert reloaded.export_to_model() == sample_graph.export_to_model()
+    assert reloaded.metadata["log_sequence"] == 2
+
+
+def test_mutation_log_crash_recovery(sample_graph, temp_dir):
+    """Test torn appends and interrupted compactions recover without data loss."""
+    from mcp_server.core.mutation_log import MutationLog
+
+    file_path = temp_dir / "graph.dgraph"
+    sample_graph.save_to_file(file_path)
+    log = MutationLog(file_path)
+
+    sample_graph.remove_node("Role1")
+    log.append(sample_graph, {"op": "remove_node", "node_id": "Role1"})
+
+    # Crash after the compacted snapshot was written but before the log was removed
+    sample_graph.save_to_file(file_path)
+    with open(log.path, "ab") as f:
+        f.write(b'{"seq":2,"op":"add_no')  # crash mid-append
+
+    loaded = GraphEngine()
+    loaded.load_from_file(file_path)
+    assert "Role1" not in loaded.graph
+    assert loaded.export_to_model() == sample_graph.export_to_model()
+
+    node = GraphNode(id="Role2", label="Role 2", type=NodeType.ROLE)
+    loaded.add_node(node)
+    log.append(loaded, {"op": "add_node", "node": node.model_dump(mode="json")})
+    assert [record["seq"] for record in log.read()] == [1, 2]
+
+    recovered = GraphEngine()
+    recovered.load_from_file(file_path)
+    assert recovered.get_node("Role2") == node
+
+    log.path.write_bytes(b'garbage\n{"seq":1,"op":"remove_node","node_id":"Step1"}\n')
+    with pytest.raises(ValueError, match="Corrupt mutation log record 1"):
+        GraphEngine().load_from_file(file_path)
+
+
+def test_mutation_log_concurrent_writers(sample_graph, temp_dir):
+    """Test writers with stale engines never reuse a sequence number."""
+    import threading
+
+    from mcp_server.core.mutation_log import MutationLog
+
+    file_path = temp_dir / "graph.json"
+    sample_graph.save_to_file(file_path)
+    log = MutationLog(file_path, compaction_threshold=1 << 30)
+
+    def write(worker):
+        engine = GraphEngine()
+        engine.load_from_file(file_path, replay_log=False)
+        for index in range(10):
+            node = GraphNode(id=f"W{worker}-{index}", label="Worker", type=NodeType.CONCEPT)
+            engine.add_node(node)
+            log.append(engine, {"op": "add_node", "node": node.model_dump(mode="json")})
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert [record["seq"] for record in log.read()] == list(range(1, 41))
+    assert log.last_sequence() == 40
+    loaded = GraphEngine()
+    loaded.load_from_file(file_path)
+    assert loaded.graph.number_of_nodes() == sample_graph.graph.number_of_nodes() + 40
+
+    with open(log.path, "ab") as f:
+        f.write(b'{"seq":40,"op":"remove_node","node_id":"W0-0"}\n')
+    with pytest.raises(ValueError, match="has sequence 40 after 40"):
+        GraphEngine().load_from_file(file_path)
+
+
+def test_json_streaming_save_and_load(sample_graph, temp_dir, monkeypatch):
+    """Test the streaming JSON writer and batched streaming loader."""
+    import io
+    import json
+
+    from mcp_server.core import graph_engine
+    from mcp_server.core.graph_json import iter_graph_json
+
+    sample_graph.metadata = {"name": "sample", "tags": ["a", 1.5, None]}
+    file_path = temp_dir / "graph.json"
+    sample_graph.save_to_file(file_path)
+
+    kg = sample_graph.export_to_model()
+    expected = {
+        "nodes": [n.model_dump() for n in kg.nodes],
+        "edges": [e.model_dump() for e in kg.edges],
+        "metadata": {**kg.metadata, "fingerprint": sample_graph.fingerprint},
+    }
+    assert file_path.read_text(encoding="utf-8") == json.dumps(expected, indent=2)
+
+    # Tiny chunks split values (including numbers) across refills
+    text = '{"metadata": {"n": 12345}, "edges": [], "nodes": [{"id": "Ä", "x": -1.5e3}]}'
+    assert list(iter_graph_json(io.StringIO(text), chunk_size=3)) == [
+        ("metadata", {"n": 12345}),
+        ("nodes", {"id": "Ä", "x": -1.5e3}),
+    ]
+    with pytest.raises(ValueError, match="Malformed graph JSON"):
+        list(iter_graph_json(io.StringIO('["nodes"]')))
+
+    monkeypatch.setattr(graph_engine, "LOAD_BATCH_SIZE", 2)
+    loaded = GraphEngine()
+    loaded.load_from_file(file_path)
+    assert loaded.export_to_model() == kg
+
+    # Edges listed before nodes are buffered until the nodes are loaded
+    reordered = temp_dir / "reordered.json"
+    reordered.write_text(
+        json.dumps({"edges": expected["edges"], "nodes": expected["nodes"]}), encoding="utf-8"
+    )
+    loaded.load_from_file(reordered)
+    assert loaded.export_to_model().edges == kg.edges
+
+
+def test_trusted_json_round_trip(sample_graph, temp_dir):
+    """Test trusted graph I/O writes compact JSON and still checks enum values."""
+    import json
+
+    sample_graph.metadata = {"name": "sample"}
+    file_path = temp_dir / "graph.json"
+    sample_graph.save_to_file(file_path, trusted=True)
+    assert "\n" not in file_path.read_text(encoding="utf-8")
+
+    for trusted in (True, False):
+        loaded = GraphEngine()
+        loaded.load_from_file(file_path, trusted=trusted)
+        assert loaded.export_to_model() == sample_graph.export_to_model()
+
+    data = json.loads(file_path.read_text(encoding="utf-8"))
+    data["edges"][0]["relation"] = "bogus"
+    file_path.write_text(json.dumps(data), encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid relation for Start --> Step1: bogus"):
+        GraphEngine().load_from_file(file_path, trusted=True)
+
+
+def test_compact_storage_matches_dict_storage(sample_graph, temp_dir):
+    """Test compact attribute records behave like the dicts they replace."""
+    file_path = temp_dir / "graph.json"
+    sample_graph.graph.nodes["Step1"]["owner"] = "ops"
+    sample_graph.save_to_file(file_path)
+
+    compact = GraphEngine(compact=True)
+    compact.load_from_file(file_path)
+
+    assert compact.export_to_model() == sample_graph.export_to_model()
+    assert compact.traverse_bfs("Start") == sample_graph.traverse_bfs("Start")
+    assert compact.get_neighbors("Step1", relation=EdgeRelation.REQUIRES) == ["System1"]
+
+    attrs = compact.graph.nodes["Step1"]
+    assert attrs == {"label": "Step 1", "type": "process", "owner": "ops"}
+    assert list(attrs) == ["label", "type", "owner"]
+    attrs["type"] = "custom"  # values outside the vocabulary are kept as-is
+    assert attrs["type"] == "custom" and len(attrs) == 3
+    del attrs["owner"]
+    assert attrs.copy() == {"label": "Step 1", "type": "custom"}
+
+    edge = compact.graph["Start"]["Step1"]
+    assert edge.get("relation") == "requires" and edge.get("weight") is None
+    assert compact.graph.copy().edges["Start", "Step1"] == {"relation": "requires"}
+
+    binary_path = temp_dir / "graph.dgraph"
+    compact.remove_node("Step1")
+    compact.save_to_file(binary_path)
+    assert GraphEngine.open_mapped(binary_path).get_neighbors("Start") == []
+
+
+def test_compact_storage_memory():
+    """Test compact attribute records use measurably less memory than dicts."""
+    import gc
+    import tracemalloc
+
+    import networkx as nx
+
+    from mcp_server.core.compact_graph import CompactDiGraph, _InternedAttributes
+
+    with pytest.raises(TypeError):
+        _InternedAttributes()
+
+    types, relations = list(NodeType), list(EdgeRelation)
+    nodes = [
+        (f"n{i}", {"label": f"Node {i}", "type": types[i % len(types)].value})
+        for i in range(2000)
+    ]
+    edges = [
+        (f"n{i // 2}", f"n{(i * 7 + 1) % 2000}", {"relation": relations[i % len(relations)].value})
+        for i in range(4000)
+    ]
+
+    def traced_size(graph_class):
+        gc.collect()
+        tracemalloc.start()
+        graph = graph_class()
+        graph.add_nodes_from(nodes)
+        graph.add_edges_from(edges)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert graph.number_of_edges() == len(edges)
+        return size
+
+    # Records are a third of the dicts' size; adjacency dicts are unchanged
+    assert traced_size(CompactDiGraph) < 0.8 * traced_size(nx.DiGraph)
+
+
+def test_partition_and_parallel_traversal(sample_graph):
+    """Test sharded multi-process traversal matches the single-process BFS."""
+    sample_graph.add_nodes(
+        [
+            GraphNode(id="Texas", label="Texas", type=NodeType.CONTEXT),
+            GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS),
+            GraphNode(id="Reg1", label="Reg Texas", type=NodeType.REGULATION),
+            GraphNode(id="Island", label="Island", type=NodeType.CONCEPT),
+        ]
+    )
+    sample_graph.add_edges(
+        [
+            GraphEdge(source="Step2", target="Step3", relation=EdgeRelation.PRECEDES),
+            GraphEdge(source="Step3", target="Texas", relation=EdgeRelation.APPLIES_TO),
+            GraphEdge(source="Step3", target="Reg1", relation=EdgeRelation.CONDITIONAL_ON),
+            GraphEdge(source="Reg1", target="Start", relation=EdgeRelation.REFERENCES),
+        ]
+    )
+
+    partition = sample_graph.partition(3)
+    assert sorted(n for shard in partition.shards for n in shard) == sorted(sample_graph.graph)
+    assert set(partition.cut_edges) == {
+        (u, v) for u, v in sample_graph.graph.edges
+        if partition.shard_of[u] != partition.shard_of[v]
+    }
+    assert partition.shard_of["Context1"] != partition.shard_of["Texas"]
+
+    with sample_graph.parallel_traverser(num_shards=3) as traverser:
+        for filters in (None, {"state": "Texas"}, {"context": "Context 1"}, {"x": "Reg"}):
+            for max_depth in (0, 1, 2, 10):
+                assert traverser.traverse_bfs("Start", filters, max_depth) == (
+                    sample_graph.traverse_bfs("Start", filters, max_depth)
+                )
+        assert traverser.traverse_bfs("Island") == ["Island"]
+        assert traverser.traverse_bfs("Missing") == []
+
+
+def test_graph_store_snapshots(sample_graph):
+    """Test readers keep a consistent pinned version while writers publish new ones."""
+    import threading
+
+    from mcp_server.core.graph_store import GraphStore
+
+    store = GraphStore(sample_graph)
+    with pytest.raises(RuntimeError, match="frozen"):
+        sample_graph.add_node(GraphNode(id="X", label="X", type=NodeType.CONCEPT))
+
+    with store.read() as pinned:
+        version = pinned.version
+        with store.write() as draft:
+            draft.add_node(GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS))
+            draft.add_edge(
+                GraphEdge(source="Step2", target="Step3", relation=EdgeRelation.PRECEDES)
+            )
+        assert "Step3" not in pinned.graph
+        assert "Step3" not in pinned.traverse_bfs("Start")
+        assert store.retained_versions() == [version]
+        # A pinned version is not recycled as the next draft
+        with store.write() as draft:
+            draft.remove_node("Step3")
+        assert "Step3" not in pinned.graph
+        assert pinned.version == version
+        with store.write() as draft:
+            draft.add_node(GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS))
+            draft.add_edge(
+                GraphEdge(source="Step2", target="Step3", relation=EdgeRelation.PRECEDES)
+            )
+    assert store.retained_versions() == []
+    assert store.current().traverse_bfs("Start")[-1] == "Step3"
+
+    with pytest.raises(ValueError, match="unknown nodes"):
+        with store.write() as draft:
+            draft.remove_node("Step1")
+            draft.add_edges([GraphEdge(source="A", target="B", relation=EdgeRelation.REQUIRES)])
+    assert "Step1" in store.current().graph
+
+    errors = []
+
+    def reader() -> None:
+        for _ in range(200):
+            with store.read() as graph:
+                # Writers add nodes and their edge together: never observe one alone
+                for node_id in graph.graph:
+                    if node_id.startswith("W") and not graph.graph.has_edge("Start", node_id):
+                        errors.append(node_id)
+                graph.traverse_bfs("Start", max_depth=2)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(50):
+        with store.write() as draft:
+            draft.add_node(GraphNode(id=f"W{i}", label=f"W {i}", type=NodeType.CONCEPT))
+            draft.add_edge(
+                GraphEdge(source="Start", target=f"W{i}", relation=EdgeRelation.REFERENCES)
+            )
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert store.retained_versions() == []
+    assert store.current().count_nodes_by_type(NodeType.CONCEPT) == 50
+
+
+def test_graph_store_write_cost(sample_graph, monkeypatch):
+    """Test writes recycle the previous version instead of copying the whole graph."""
+    import time
+
+    from mcp_server.core.graph_store import GraphStore
+
+    copies = []
+    copy = GraphEngine.copy
+    monkeypatch.setattr(GraphEngine, "copy", lambda self: copies.append(1) or copy(self))
+
+    def write_time(num_nodes: int) -> float:
+        engine = GraphEngine()
+        engine.add_nodes(
+            GraphNode(id=f"N{i}", label=f"N {i}", type=NodeType.CONCEPT) for i in range(num_nodes)
+        )
+        engine.add_edges(
+            GraphEdge(source=f"N{i}", target=f"N{i + 1}", relation=EdgeRelation.RELATED_TO)
+            for i in range(num_nodes - 1)
+        )
+        store = GraphStore(engine)
+        timings = []
+        for i in range(10):
+            start = time.perf_counter()
+            with store.write() as draft:
+                draft.add_node(GraphNode(id=f"W{i}", label=f"W {i}", type=NodeType.ROLE))
+                draft.add_edge(
+                    GraphEdge(source="N0", target=f"W{i}", relation=EdgeRelation.PERFORMED_BY)
+                )
+            timings.append(time.perf_counter() - start)
+        assert store.current().count_nodes_by_type(NodeType.ROLE) == 10
+        assert store.current().get_neighbors("N0")[-1] == "W9"
+        # Only the first write copies; later ones recycle the superseded version
+        return min(timings[1:])
+
+    small = write_time(100)
+    assert len(copies) == 1
+    large = write_time(20_000)
+    assert len(copies) == 2
+    assert large < small * 20
+
+    # Recycled drafts end up with the same graph as applying the writes in place,
+    # for database-backed stores too
+    expected = sample_graph.copy()
+    store = GraphStore(sample_graph)
+
+    def mutate(engine: GraphEngine, i: int) -> None:
+        engine.add_nodes(
+            GraphNode(id=f"R{i}{j}", label=f"R {i}", type=NodeType.ROLE) for j in range(2)
+        )
+        if i == 1:
+            engine.remove_node("Context1")
+
+    for i in range(4):
+        mutate(expected, i)
+        with store.write() as draft:
+            mutate(draft, i)
+    assert len(copies) == 4
+    assert store.current().export_to_model() == expected.export_to_model()
+    assert store.current().fingerprint == expected.fingerprint
+
+
+def test_subgraph(sample_graph):
+    """Test k-hop neighborhood extraction returns a filtered view of the graph."""
+    view = sample_graph.subgraph(["Step2"], hops=1)
+    assert set(view) == {"Step2", "Step1", "Context1"}
+    if sample_graph.database is None:
+        assert view.nodes["Step1"] is sample_graph.graph.nodes["Step1"]
+    assert view.nodes["Step1"] == sample_graph.graph.nodes["Step1"]
+
+    view = sample_graph.subgraph(["Step2"], hops=2)
+    assert set(view) == {"Step2", "Step1", "Context1", "Start", "System1", "Role1"}
+    assert set(view.edges) == set(sample_graph.graph.edges)
+
+    view = sample_graph.subgraph(["Start"], hops=3, direction="out")
+    assert set(view) == set(sample_graph.graph)
+    assert set(sample_graph.subgraph(["Step2"], hops=3, direction="in")) == {
+        "Step2", "Step1", "Start"
+    }
+
+    view = sample_graph.subgraph(["Start"], hops=5, relations=[EdgeRelation.REQUIRES])
+    assert set(view) == {"Start", "Step1", "System1"}
+    assert set(view.edges) == {("Start", "Step1"), ("Step1", "System1")}
+
+    view = sample_graph.subgraph(["Step1"], hops=5, node_types=[NodeType.PROCESS])
+    assert set(view) == {"Start", "Step1", "Step2"}
+
+    assert set(sample_graph.subgraph(["Step1", "Missing"], hops=0)) == {"Step1"}
+    with pytest.raises(ValueError):
+        sample_graph.subgraph(["Step1"], hops=-1)
+    with pytest.raises(ValueError):
+        sample_graph.subgraph(["Step1"], direction="sideways")
+
+
+def test_precedes_order():
+    """Test procedure steps follow precedes edges and precedes cycles are rejected."""
+    graph = GraphEngine()
+    graph.add_nodes(GraphNode(id=n, label=n, type=NodeType.PROCESS) for n in "SABC")
+    graph.add_edges(
+        [
+            GraphEdge(source="S", target="C", relation=EdgeRelation.REQUIRES),
+            GraphEdge(source="S", target="B", relation=EdgeRelation.REQUIRES),
+            GraphEdge(source="S", target="A", relation=EdgeRelation.REQUIRES),
+            GraphEdge(source="B", target="C", relation=EdgeRelation.PRECEDES),
+        ]
+    )
+    graph.add_edge(GraphEdge(source="A", target="B", relation=EdgeRelation.PRECEDES))
+
+    assert graph.traverse_bfs("S") == ["S", "C", "B", "A"]
+    steps = graph.generate_procedures("S", [None])[0]
+    assert [step["id"] for step in steps] == ["S", "A", "B", "C"]
+
+    version = graph.version
+    with pytest.raises(ValueError, match="cycle"):
+        graph.add_edge(GraphEdge(source="C", target="A", relation=EdgeRelation.PRECEDES))
+    with pytest.raises(ValueError, match="cycle"):
+        graph.add_edges(
+            [
+                GraphEdge(source="S", target="A", relation=EdgeRelation.PRECEDES),
+                GraphEdge(source="C", target="S", relation=EdgeRelation.PRECEDES),
+            ]
+        )
+    assert graph.version == version
+    assert graph.graph["S"]["A"]["relation"] == EdgeRelation.REQUIRES.value
+
+    # Relabeling an edge away from precedes frees the order
+    graph.add_edge(GraphEdge(source="B", target="C", relation=EdgeRelation.REQUIRES))
+    graph.add_edge(GraphEdge(source="C", target="A", relation=EdgeRelation.PRECEDES))
+    steps = graph.generate_procedures("S", [None])[0]
+    assert [step["id"] for step in steps] == ["S", "C", "A", "B"]
+
+    graph.remove_node("A")
+    graph.add_edge(GraphEdge(source="B", target="C", relation=EdgeRelation.PRECEDES))
+    assert graph.copy()._precedes_order.position("B") < graph._precedes_order.position("C")
+
+
+def test_pattern_match(sample_graph):
+    """Test pattern queries and the planner's choice of starting index."""
+    sample_graph.add_node(
+        GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS, properties={"rank": 3})
+    )
+    sample_graph.add_edge(
+        GraphEdge(source="Step3", target="System1", relation=EdgeRelation.REQUIRES)
+    )
+
+    rows = sample_graph.match(
+        'MATCH (p:process)-[:requires]->(s:system)<-[:requires]-(r:process {label: "Step 3"}) '
+        "RETURN p, s"
+    )
+    assert rows == [{"p": "Step1", "s": "System1"}, {"p": "Step3", "s": "System1"}]
+
+    rows = sample_graph.match(
+        "MATCH (a:process)-->(b)-[:applies_to]->(c:context) WHERE a.id <> 'Step2' RETURN a, c"
+    )
+    assert rows == [{"a": "Step1", "c": "Context1"}]
+    assert sample_graph.match("MATCH (a)<-[:precedes]-(b) RETURN b") == [{"b": "Step1"}]
+    assert sample_graph.match("MATCH (r:role)--(p) RETURN p") == [{"p": "Step1"}]
+    assert sample_graph.match("MATCH (p:process) WHERE p.rank >= 3 RETURN p") == [{"p": "Step3"}]
+    assert len(sample_graph.match("MATCH (p:process), (s:system) RETURN p LIMIT 2")) == 2
+    assert sample_graph.match("MATCH (p:process)-->(s:system) RETURN DISTINCT s") == [
+        {"s": "System1"}
+    ]
+
+    matcher = sample_graph.pattern_matcher()
+    query = parse_pattern_query(
+        "MATCH (p:process)-[:requires]->(s)-[:requires]->(x {label: 'System 1'}) RETURN p"
+    )
+    plan = matcher.explain(query)
+    assert plan[0] == "scan x via label = 'System 1'"
+    assert [line.split()[1] for line in plan[1:]] == ["s", "p"]
+    assert matcher.match(query) == [{"p": "Start"}]
+
+    for bad in ("MATCH (a:unknown)", "MATCH (a)<-->(b)", "MATCH (a) RETURN b", "MATCH (a) WHERE"):
+        with pytest.raises(ValueError):
+            sample_graph.match(bad)
+
+    # Only IN compares with a list
+    with pytest.raises(ValueError, match=r"a\.id = takes a scalar literal"):
+        sample_graph.match("MATCH (a) WHERE a.id = ['Step1'] RETURN a")
+    with pytest.raises(ValueError, match=r"\{label: \.\.\.\} of \(a\)"):
+        sample_graph.match("MATCH (a {label: ['Step 1']}) RETURN a")
+    assert sample_graph.match("MATCH (a) WHERE a.id IN ['Step1'] RETURN a") == [{"a": "Step1"}]
+
+
+def test_search_nodes(sample_graph):
+    """Test exact, case-insensitive, prefix and fuzzy node lookup."""
+    sample_graph.add_node(
+        GraphNode(id="proc-42", label="Verify Credit Score", type=NodeType.PROCESS)
+    )
+
+    def ids(text, mode="auto", limit=10):
+        return [m["id"] for m in sample_graph.search_nodes(text, mode=mode, limit=limit)]
+
+    assert ids("Step1") == ["Step1"]
+    assert sample_graph.search_nodes("Step 1", mode="exact")[0]["match"] == "exact"
+    assert ids("step 2", mode="case_insensitive") == ["Step2"]
+    assert ids("PROC-42", mode="case_insensitive") == ["proc-42"]
+    assert ids("step", mode="prefix") == ["Step1", "Step2"]
+    assert ids("step", mode="prefix", limit=1) == ["Step1"]
+    assert ids("Verfy Credt Scor", mode="fuzzy") == ["proc-42"]
+    assert ids("zzzz", mode="fuzzy") == []
+
+    matches = sample_graph.search_nodes("syst")
+    assert matches[0]["id"] == "System1"
+    assert matches[0]["match"] == "prefix"
+    assert matches[0]["type"] == "system"
+
+    # The index is rebuilt after node changes
+    sample_graph.remove_node("proc-42")
+    assert ids("Verify Credit Score") == []
+
+    with pytest.raises(ValueError):
+        sample_graph.search_nodes("Step", mode="regex")
+
+
+def test_diff_and_apply_delta(sample_graph, temp_dir):
+    """Test computing a delta between graphs and applying it through JSON."""
+    target = sample_graph.copy()
+    sample_graph.add_node(
+        GraphNode(id="Step1", label="Step 1", type=NodeType.PROCESS, properties={"owner": "ops"})
+    )
+    target.remove_node("Context1")
+    target.remove_edge("Step1", "Role1")
+    target.add_node(GraphNode(id="Step1", label="Step One", type=NodeType.PROCESS))
+    target.add_node(GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS))
+    target.add_edge(GraphEdge(source="Step2", target="Step3", relation=EdgeRelation.PRECEDES))
+    target.add_edge(
+        GraphEdge(
+            source="Start", target="Step1", relation=EdgeRelation.REQUIRES, properties={"weight": 2}
+        )
+    )
+    target.metadata["title"] = "v2"
+
+    assert sample_graph.diff(sample_graph.copy())["nodes_changed"] == []
+    delta = sample_graph.diff(target)
+    assert [n["id"] for n in delta["nodes_added"]] == ["Step3"]
+    assert [n["id"] for n in delta["nodes_changed"]] == ["Step1"]
+    assert delta["nodes_removed"] == ["Context1"]
+    assert [(e["source"], e["target"]) for e in delta["edges_added"]] == [("Step2", "Step3")]
+    assert [(e["source"], e["target"]) for e in delta["edges_changed"]] == [("Start", "Step1")]
+    assert sorted(delta["edges_removed"]) == [["Step1", "Role1"], ["Step2", "Context1"]]
+
+    delta_path = temp_dir / "graph.delta.json"
+    delta_path.write_text(json.dumps(delta))
+    sample_graph.metadata["log_sequence"] = 3
+    counts = sample_graph.apply_delta(json.loads(delta_path.read_text()))
+    assert counts["nodes_added"] == 1
+    assert "owner" not in sample_graph.graph.nodes["Step1"]
+    assert sample_graph.get_node("Step1").label == "Step One"
+    assert sample_graph.metadata == {"title": "v2", "log_sequence": 3}
+    assert sample_graph.procedure_steps(["Step3", "Step2"])[0]["id"] == "Step2"
+    assert sample_graph.diff(target)["base_digest"] == delta["target_digest"]
+
+    # A delta only applies to the graph it was computed against
+    with pytest.raises(ValueError):
+        sample_graph.apply_delta(delta)
+    with pytest.raises(ValueError):
+        sample_graph.apply_delta({**delta, "format": "other"})
+
+
+def test_fingerprint(sample_graph, temp_dir):
+    """Test the content fingerprint across mutations, copies and graph files."""
+    # Reported by the statistics once known, without hashing the graph for them
+    assert sample_graph.get_statistics()["fingerprint"] is None
+    fingerprint = sample_graph.fingerprint
+    assert len(fingerprint) == 32
+    assert sample_graph.get_statistics()["fingerprint"] == fingerprint
+
+    # Independent of insertion order
+    reordered = GraphEngine()
+    reordered.add_nodes(reversed(list(sample_graph.iter_node_models())))
+    reordered.add_edges(reversed(list(sample_graph.iter_edge_models())))
+    assert reordered.fingerprint == fingerprint
+
+    # Updated by mutations, and restored when they are undone
+    sample_graph.add_node(
+        GraphNode(id="Step2", label="Step 2", type=NodeType.PROCESS, properties={"sla": 3})
+    )
+    changed = sample_graph.fingerprint
+    assert changed != fingerprint
+    sample_graph.add_edge(
+        GraphEdge(source="Step2", target="Start", relation=EdgeRelation.RELATED_TO)
+    )
+    sample_graph.remove_edge("Step2", "Start")
+    assert sample_graph.fingerprint == changed
+    copy = sample_graph.copy()
+    copy.remove_node("Context1")
+    assert copy.get_statistics()["fingerprint"] == copy.fingerprint != changed
+    assert sample_graph.get_statistics()["fingerprint"] == changed
+
+    # Saved with the graph and adopted on load
+    for name in ("graph.json", "graph.dgraph", "graph.sqlite"):
+        sample_graph.save_to_file(temp_dir / name)
+        loaded = GraphEngine()
+        loaded.load_from_file(temp_dir / name)
+        # An untrusted JSON file's fingerprint is recomputed
+        adopted = None if name == "graph.json" else changed
+        assert loaded.get_statistics()["fingerprint"] == adopted
+        assert loaded.fingerprint == changed
+        assert "fingerprint" not in loaded.metadata
+    assert json.loads((temp_dir / "graph.json").read_text())["metadata"]["fingerprint"] == changed
+
+    # A hand-edited JSON file's stale fingerprint is only adopted when trusted
+    file_path = temp_dir / "graph.json"
+    file_path.write_text(file_path.read_text().replace('"Step 1"', '"Step One"'))
+    edited = GraphEngine()
+    edited.load_from_file(file_path)
+    assert edited.fingerprint != changed
+    rebuilt = GraphEngine()
+    rebuilt.load_from_model(edited.export_to_model())
+    assert edited.fingerprint == rebuilt.fingerprint
+    edited.load_from_file(file_path, trusted=True)
+    assert edited.fingerprint == changed
+
+    # A database keeps the fingerprint up to date across mutations, and drops
+    # it when its rows are changed without the engine
+    database = GraphEngine(database=temp_dir / "graph.sqlite")
+    database.remove_node("Context1")
+    assert GraphEngine(database=temp_dir / "graph.sqlite").get_statistics()[
+        "fingerprint"
+    ] == copy.fingerprint
+    database.graph.nodes["Step1"]["sla"] = 1
+    reopened = GraphEngine(database=temp_dir / "graph.sqlite")
+    assert reopened.get_statistics()["fingerprint"] is None
+    assert reopened.fingerprint != copy.fingerprint
+
+
+def test_sqlite_database_storage(sample_graph, temp_dir):
+    """Test graphs stored in a SQLite database match in-memory graphs and persist mutations."""
+    from mcp_server.core.mutation_log import MutationLog
+
+    sample_graph.metadata = {"name": "sample"}
+    file_path = temp_dir / "graph.sqlite"
+    sample_graph.save_to_file(file_path)
+
+    opened = GraphEngine()
+    opened.load_from_file(file_path)
+    assert opened.database == file_path
+    assert opened.export_to_model() == sample_graph.export_to_model()
+    assert opened.fingerprint == sample_graph.fingerprint
+    for start in ("Start", "Step1"):
+        for filters in (None, {"context": "Context 1"}, {"context": "Other"}):
+            assert opened.traverse_bfs(start, filters) == sample_graph.traverse_bfs(
+                start, filters
+            )
+    assert opened.find_path("Start", "Context1") == ["Start", "Step1", "Step2", "Context1"]
+    assert opened.find_path("Start", "Context1", relation=EdgeRelation.REQUIRES) is None
+    assert opened.get_neighbors("Step1", relation=EdgeRelation.REQUIRES) == ["System1"]
+    assert opened.count_nodes_by_type(NodeType.PROCESS) == 3
+    with pytest.raises(ValueError):
+        opened.add_edge(GraphEdge(source="Step2", target="Step1", relation=EdgeRelation.PRECEDES))
+
+    # Mutations are written through, so the log stays empty and saving is a no-op
+    node = GraphNode(id="Step3", label="Step 3", type=NodeType.PROCESS, properties={"sla": 2})
+    opened.add_node(node)
+    opened.remove_edge("Start", "Step1")
+    log = MutationLog(file_path)
+    log.append(opened, {"op": "add_node", "node": node.model_dump(mode="json")})
+    assert not log.path.exists()
+    opened.save_to_file(file_path)
+
+    # Copies live in a private database
+    copy = opened.copy()
+    copy.remove_node("Step3")
+    assert copy.database is None and "Step3" in opened.graph
+
+    reopened = GraphEngine(database=file_path)
+    assert reopened.get_node("Step3") == node
+    assert not reopened.graph.has_edge("Start", "Step1")
+    assert dict(reopened.metadata) == {"name": "sample"}
+    assert reopened.export_to_model() == opened.export_to_model()
+
+    with pytest.raises(FileNotFoundError):
+        GraphEngine().load_from_file(temp_dir / "missing.sqlite")
+
+    # Attribute records are written back by their table's subclass
+    from mcp_server.core.sqlite_graph import _StoredAttributes
+
+    with pytest.raises(TypeError):
+        _StoredAttributes(reopened.graph, ("Step3",), {})
+    reopened.graph.nodes["Step3"]["owner"] = "ops"
+    assert GraphEngine(database=file_path).graph.nodes["Step3"]["owner"] == "ops"
@@ -27,3 +27,339 @@ async def test_transform_document_invalid_format():
         await transform_document(
             content="test", source_format="invalid", target_format="html"
         )
+
+
+@pytest.mark.asyncio
+async def test_query_graph_find_paths(sample_graph, test_settings, monkeypatch):
+    """Test query_graph find_path with k shortest paths."""
+    from mcp_server.tools import graph_query, query_graph
+
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    sample_graph.save_to_file(test_settings.graphs_dir / "sample.json")
+
+    result = await query_graph(
+        graph_file="sample.json",
+        operation="find_path",
+        start_node="Start",
+        end_node="Step2",
+        k=2,
+    )
+    assert result["success"] is True
+    assert result["num_paths"] == 1
+    assert [n["id"] for n in result["paths"][0]] == ["Start", "Step1", "Step2"]
+
+    result = await query_graph(
+        graph_file="sample.json",
+        operation="find_path",
+        start_node="Start",
+        end_node="Step2",
+        max_depth=1,
+    )
+    assert result["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_generate_procedures_batch(sample_graph, test_settings, monkeypatch):
+    """Test batch procedure generation deduplicates contexts."""
+    from mcp_server.tools import generate_procedure, generate_procedures_batch, procedure
+
+    monkeypatch.setattr(procedure.settings, "graphs_dir", test_settings.graphs_dir)
+    sample_graph.save_to_file(test_settings.graphs_dir / "sample.json")
+
+    contexts = [{"location": "Context"}, {"state": "context"}, {"location": "Texas"}]
+    result = await generate_procedures_batch(
+        graph_file="sample.json", start_node="Start", contexts=contexts
+    )
+    assert result["success"] is True
+    assert result["num_contexts"] == 3
+    assert result["num_distinct_contexts"] == 2
+
+    for filters, batch in zip(contexts, result["procedures"]):
+        single = await generate_procedure(
+            graph_file="sample.json", start_node="Start", filters=filters
+        )
+        assert batch["steps"] == single["steps"]
+        assert batch["content"] == single["content"]
+
+
+@pytest.mark.asyncio
+async def test_generate_procedure_reuses_loaded_graph(sample_graph, test_settings, monkeypatch):
+    """Test tool calls share the loaded graph and its traversal cache until the file changes."""
+    from mcp_server.tools import generate_procedure, procedure
+
+    monkeypatch.setattr(procedure.settings, "graphs_dir", test_settings.graphs_dir)
+    graph_path = test_settings.graphs_dir / "sample.json"
+    sample_graph.save_to_file(graph_path)
+
+    first = await generate_procedure(graph_file="sample.json", start_node="Start")
+    second = await generate_procedure(graph_file="sample.json", start_node="Start")
+    assert second["steps"] == first["steps"]
+    assert first["graph_stats"]["traversal_cache"]["hits"] == 0
+    assert second["graph_stats"]["traversal_cache"]["hits"] == 1
+
+    sample_graph.save_to_file(graph_path, trusted=True)
+    third = await generate_procedure(graph_file="sample.json", start_node="Start")
+    assert third["steps"] == first["steps"]
+    assert third["graph_stats"]["traversal_cache"]["hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_update_graph_appends_to_log(sample_graph, test_settings, monkeypatch):
+    """Test update_graph logs mutations and compacts past the size threshold."""
+    from mcp_server.core.mutation_log import log_path_for
+    from mcp_server.tools import graph_query, graph_update, query_graph, update_graph
+
+    monkeypatch.setattr(graph_update.settings, "graphs_dir", test_settings.graphs_dir)
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    graph_path = test_settings.graphs_dir / "sample.json"
+    sample_graph.save_to_file(graph_path)
+    snapshot = graph_path.read_bytes()
+
+    result = await update_graph(
+        graph_file="sample.json",
+        operation="add_edge",
+        edge={"source": "Step2", "target": "Role1", "relation": "performed_by"},
+    )
+    assert result["success"] is True
+    assert graph_path.read_bytes() == snapshot
+    assert log_path_for(graph_path).exists()
+
+    result = await query_graph(graph_file="sample.json", operation="get_neighbors", node_id="Step2")
+    assert "Role1" in [n["id"] for n in result["neighbors"]]
+
+    monkeypatch.setattr(graph_update.settings, "graph_log_compaction_bytes", 0)
+    result = await update_graph(graph_file="sample.json", operation="remove_node", node_id="Role1")
+    assert result["success"] is True
+    assert not log_path_for(graph_path).exists()
+    assert graph_path.read_bytes() != snapshot
+
+
+
+@pytest.mark.asyncio
+async def test_update_graph_publishes_to_shared_store(sample_graph, test_settings, monkeypatch):
+    """Test update_graph publishes a new version of the shared graph to later readers only."""
+    from mcp_server.core.graph_store import shared_store
+    from mcp_server.tools import graph_update, update_graph
+
+    monkeypatch.setattr(graph_update.settings, "graphs_dir", test_settings.graphs_dir)
+    graph_path = test_settings.graphs_dir / "sample.json"
+    sample_graph.save_to_file(graph_path)
+
+    store = shared_store(graph_path)
+    with store.read() as before:
+        result = await update_graph(
+            graph_file="sample.json",
+            operation="add_edge",
+            edge={"source": "Step2", "target": "Role1", "relation": "performed_by"},
+        )
+        assert result["success"] is True
+        assert not before.graph.has_edge("Step2", "Role1")
+
+    assert shared_store(graph_path) is store
+    assert store.current().graph.has_edge("Step2", "Role1")
+    assert store.current().version > before.version
+
+
+@pytest.mark.asyncio
+async def test_query_graph_reuses_reachability_index(sample_graph, test_settings, monkeypatch):
+    """Test is_reachable builds the reachability index once for the shared graph."""
+    from mcp_server.core.graph_store import shared_store
+    from mcp_server.tools import graph_query, graph_update, query_graph, update_graph
+
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    monkeypatch.setattr(graph_update.settings, "graphs_dir", test_settings.graphs_dir)
+    graph_path = test_settings.graphs_dir / "sample.json"
+    sample_graph.save_to_file(graph_path)
+
+    async def reachable(start, end):
+        result = await query_graph(
+            graph_file="sample.json", operation="is_reachable", start_node=start, end_node=end
+        )
+        assert result["success"] is True
+        return result["reachable"]
+
+    assert await reachable("Start", "Context1")
+    index = shared_store(graph_path).current().reachability_index()
+    assert not await reachable("Context1", "Start")
+    assert shared_store(graph_path).current().reachability_index() is index
+
+    # An edge between nodes that already reach each other keeps the index
+    result = await update_graph(
+        graph_file="sample.json",
+        operation="add_edge",
+        edge={"source": "Start", "target": "Step2", "relation": "related_to"},
+    )
+    assert result["success"] is True
+    assert await reachable("Start", "Step2")
+    assert shared_store(graph_path).current().reachability_index() is index
+
+
+@pytest.mark.asyncio
+async def test_query_graph_subgraph(sample_graph, test_settings, monkeypatch):
+    """Test fetching a k-hop neighborhood through query_graph."""
+    from mcp_server.tools import graph_query, query_graph
+
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    sample_graph.save_to_file(test_settings.graphs_dir / "sample.json")
+
+    result = await query_graph(
+        graph_file="sample.json", operation="get_subgraph", node_id="Step2", hops=2
+    )
+    assert result["success"] is True
+    assert result["num_nodes"] == 6
+    assert result["num_edges"] == 5
+
+    result = await query_graph(
+        graph_file="sample.json",
+        operation="get_subgraph",
+        node_ids=["Start"],
+        hops=5,
+        relation="requires",
+    )
+    assert {n["id"] for n in result["nodes"]} == {"Start", "Step1", "System1"}
+    assert all(e["relation"] == "requires" for e in result["edges"])
+
+    result = await query_graph(graph_file="sample.json", operation="get_subgraph")
+    assert result["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_query_graph_match(sample_graph, test_settings, monkeypatch):
+    """Test running a pattern query through query_graph."""
+    from mcp_server.tools import graph_query, query_graph
+
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    sample_graph.save_to_file(test_settings.graphs_dir / "sample.json")
+
+    result = await query_graph(
+        graph_file="sample.json",
+        operation="match",
+        pattern="MATCH (p:process)-[:performed_by]->(r:role) RETURN p, r",
+    )
+    assert result["success"] is True
+    assert result["num_matches"] == 1
+    assert result["matches"][0]["p"]["label"] == "Step 1"
+    assert result["matches"][0]["r"]["type"] == "role"
+    assert result["plan"][0].startswith("scan")
+
+    result = await query_graph(graph_file="sample.json", operation="match", pattern="MATCH (")
+    assert result["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_query_graph_search_nodes(sample_graph, test_settings, monkeypatch):
+    """Test node lookup through query_graph and suggestions for unknown start nodes."""
+    from mcp_server.tools import generate_procedure, graph_query, procedure, query_graph
+
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    monkeypatch.setattr(procedure.settings, "graphs_dir", test_settings.graphs_dir)
+    sample_graph.save_to_file(test_settings.graphs_dir / "sample.json")
+
+    result = await query_graph(graph_file="sample.json", operation="search_nodes", text="role")
+    assert result["success"] is True
+    assert result["matches"][0]["id"] == "Role1"
+
+    result = await query_graph(
+        graph_file="sample.json", operation="search_nodes", text="Contxt 1", search_mode="fuzzy"
+    )
+    assert [m["id"] for m in result["matches"]] == ["Context1"]
+
+    result = await generate_procedure(graph_file="sample.json", start_node="step")
+    assert result["success"] is False
+    assert result["available_nodes"][:2] == ["Step1", "Step2"]
+
+@pytest.mark.asyncio
+async def test_query_graph_reuses_label_index(sample_graph, test_settings, monkeypatch):
+    """Test search_nodes builds the label index once until nodes change."""
+    from mcp_server.core.graph_store import shared_store
+    from mcp_server.tools import graph_query, graph_update, query_graph, update_graph
+
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    monkeypatch.setattr(graph_update.settings, "graphs_dir", test_settings.graphs_dir)
+    graph_path = test_settings.graphs_dir / "sample.json"
+    sample_graph.save_to_file(graph_path)
+
+    async def search(text):
+        result = await query_graph(graph_file="sample.json", operation="search_nodes", text=text)
+        assert result["success"] is True
+        return [match["id"] for match in result["matches"]]
+
+    assert "Step1" in await search("step 1")
+    index = shared_store(graph_path).current().label_index()
+    assert "System1" in await search("sytem")
+    assert shared_store(graph_path).current().label_index() is index
+
+    # Edges between existing nodes keep the index (rebound to the new version's
+    # graph, sharing what was built); new nodes rebuild it
+    await update_graph(
+        graph_file="sample.json",
+        operation="add_edge",
+        edge={"source": "Step2", "target": "Role1", "relation": "performed_by"},
+    )
+    kept = shared_store(graph_path).current().label_index()
+    assert kept.labels is index.labels
+    assert kept.folded() is index.folded()
+    assert kept.postings() is index.postings()
+    await update_graph(
+        graph_file="sample.json",
+        operation="add_node",
+        node={"id": "Step3", "label": "Step 3", "type": "process"},
+    )
+    assert "Step3" in await search("step 3")
+    assert shared_store(graph_path).current().label_index().labels is not index.labels
+
+
+@pytest.mark.asyncio
+async def test_generate_procedures_bulk(sample_graph, test_settings, monkeypatch):
+    """Test process-pool procedure generation matches single procedures."""
+    from mcp_server.tools import generate_procedure, generate_procedures_bulk, procedure
+
+    monkeypatch.setattr(procedure.settings, "graphs_dir", test_settings.graphs_dir)
+    sample_graph.save_to_file(test_settings.graphs_dir / "sample.dgraph")
+
+    jobs = [
+        {"start_node": "Start", "filters": {"location": "Context"}},
+        {"start_node": "Step1"},
+        {"start_node": "Missing"},
+        {"start_node": "Start", "filters": {"location": "Texas"}},
+    ] * 3
+    result = await generate_procedures_bulk(
+        graph_file="sample.dgraph", jobs=jobs, max_workers=2
+    )
+    assert result["success"] is True
+    assert result["num_jobs"] == len(jobs)
+
+    for job, bulk in zip(jobs, result["procedures"]):
+        single = await generate_procedure(
+            graph_file="sample.dgraph", start_node=job["start_node"], filters=job.get("filters")
+        )
+        if single["success"]:
+            assert bulk["steps"] == single["steps"]
+            assert bulk["content"] == single["content"]
+        else:
+            assert bulk["error"] == "Start node not found: Missing"
+
+
+@pytest.mark.asyncio
+async def test_update_graph_sqlite_database(sample_graph, test_settings, monkeypatch):
+    """Test update_graph writes mutations of a graph database straight to the database."""
+    from mcp_server.core.mutation_log import log_path_for
+    from mcp_server.tools import graph_query, graph_update, query_graph, update_graph
+
+    monkeypatch.setattr(graph_update.settings, "graphs_dir", test_settings.graphs_dir)
+    monkeypatch.setattr(graph_query.settings, "graphs_dir", test_settings.graphs_dir)
+    graph_path = test_settings.graphs_dir / "sample.sqlite"
+    sample_graph.save_to_file(graph_path)
+
+    result = await update_graph(
+        graph_file="sample.sqlite",
+        operation="add_edge",
+        edge={"source": "Step2", "target": "Role1", "relation": "performed_by"},
+    )
+    assert result["success"] is True
+    assert not log_path_for(graph_path).exists()
+
+    result = await query_graph(
+        graph_file="sample.sqlite", operation="get_neighbors", node_id="Step2"
+    )
+    assert "Role1" in [n["id"] for n in result["neighbors"]]